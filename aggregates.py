@@ -0,0 +1,101 @@
+import threading
+
+import pandas as pd
+
+from data_loader import load_kk_rw_data_gsheet, load_penduduk_jenis_kelamin_gsheet
+
+# Kolom jumlah di tingkat RT (dari worksheet 'Penduduk Menurut Jenis Kelamin')
+SUM_COLUMNS = ['Jumlah_KK', 'LAKI_LAKI', 'PEREMPUAN', 'Jumlah_Penduduk']
+
+# Cube disimpan per versi loader kedua worksheet; versi lama dibuang saat data berubah
+_cube_cache = {}
+_cube_lock = threading.Lock()
+
+
+def rw_key(values: pd.Series) -> pd.Series:
+    """Menyeragamkan penulisan RW ('1', 1.0, 'RW 01') menjadi angka agar kedua worksheet bisa digabung."""
+    digits = values.astype(str).str.extract(r'(\d+)', expand=False)
+    return pd.to_numeric(digits, errors='coerce').astype('Int64')
+
+
+def _add_ratios(df: pd.DataFrame, kk_column: str) -> pd.DataFrame:
+    """Menambahkan rasio jenis kelamin (L per 100 P) dan rata-rata anggota keluarga per KK."""
+    df['Rasio_JK'] = (df['LAKI_LAKI'] / df['PEREMPUAN'].where(df['PEREMPUAN'] > 0) * 100).round(2)
+    df['Rata_Anggota_KK'] = (df['Jumlah_Penduduk'] / df[kk_column].where(df[kk_column] > 0)).round(2)
+    return df
+
+
+def build_rw_cube(df_jk: pd.DataFrame, df_kk_rw: pd.DataFrame) -> dict:
+    """
+    Membuat agregat bertingkat kelurahan -> RW -> RT sekali untuk satu versi data.
+
+    Hasil (dict):
+        'rt'        : DataFrame ber-index (RW, RT) berisi jumlah KK, laki-laki, perempuan, penduduk, dan rasio
+        'rw'        : DataFrame ber-index RW; 'KK_RW' diambil dari worksheet 'Jumlah KK Menurut RW'
+        'kelurahan' : dict total seluruh kelurahan
+    """
+    if not df_jk.empty and set(SUM_COLUMNS + ['RW', 'RT']).issubset(df_jk.columns):
+        rt = df_jk.assign(RW=rw_key(df_jk['RW']), RT=rw_key(df_jk['RT']))
+        rt = rt.groupby(['RW', 'RT'])[SUM_COLUMNS].sum().sort_index()
+    else:
+        rt = pd.DataFrame(columns=SUM_COLUMNS, index=pd.MultiIndex.from_arrays([[], []], names=['RW', 'RT']))
+    rw = rt.groupby(level='RW').sum() if len(rt) else pd.DataFrame(columns=SUM_COLUMNS)
+    rt = _add_ratios(rt.astype(float), 'Jumlah_KK')
+
+    if not df_kk_rw.empty and {'RW', 'JUMLAH KK'}.issubset(df_kk_rw.columns):
+        # dropna=False: RW yang tidak berupa angka tetap ikut dalam total
+        kk = df_kk_rw.assign(RW=rw_key(df_kk_rw['RW'])).groupby('RW', dropna=False)['JUMLAH KK'].sum().rename('KK_RW')
+        rw = rw.join(kk, how='outer')
+    else:
+        rw['KK_RW'] = pd.Series(dtype=float)
+    rw = rw.astype(float).sort_index()
+    rw.index.name = 'RW'
+    rw = _add_ratios(rw, 'Jumlah_KK')
+
+    totals = rw[SUM_COLUMNS + ['KK_RW']].sum(min_count=1)
+    kelurahan = {col: (None if pd.isna(value) else float(value)) for col, value in totals.items()}
+    kelurahan['Jumlah_RW'] = int(rw.index.notna().sum())
+    kelurahan['Jumlah_RT'] = int(len(rt))
+    laki, perempuan = kelurahan['LAKI_LAKI'], kelurahan['PEREMPUAN']
+    kelurahan['Rasio_JK'] = round(laki / perempuan * 100, 2) if laki is not None and perempuan else None
+    penduduk, jumlah_kk = kelurahan['Jumlah_Penduduk'], kelurahan['Jumlah_KK']
+    kelurahan['Rata_Anggota_KK'] = round(penduduk / jumlah_kk, 2) if penduduk is not None and jumlah_kk else None
+
+    return {'rt': rt, 'rw': rw, 'kelurahan': kelurahan}
+
+
+def get_rw_cube() -> dict:
+    """
+    Cube agregat untuk data saat ini. Dibuat ulang hanya jika isi salah satu worksheet sumber berubah;
+    pemanggilan berikutnya (di setiap rerun halaman) cukup mengambil dari cache.
+    """
+    df_jk = load_penduduk_jenis_kelamin_gsheet()
+    df_kk_rw = load_kk_rw_data_gsheet()
+    # Versi dari loader (tanpa meng-hash isi data); None jika data sedang dimuat ulang bersamaan
+    key = (load_penduduk_jenis_kelamin_gsheet.version(), load_kk_rw_data_gsheet.version())
+    if None in key:
+        return build_rw_cube(df_jk, df_kk_rw)
+    with _cube_lock:
+        cube = _cube_cache.get(key)
+    if cube is None:
+        cube = build_rw_cube(df_jk, df_kk_rw)
+        with _cube_lock:
+            _cube_cache.clear()
+            _cube_cache[key] = cube
+    return cube
+
+
+def rw_summary(cube: dict, rw) -> dict:
+    """Agregat satu RW (dict kosong jika RW tidak ada di data)."""
+    key = rw_key(pd.Series([rw])).iloc[0]
+    if pd.isna(key) or key not in cube['rw'].index:
+        return {}
+    return cube['rw'].loc[key].to_dict()
+
+
+def rt_breakdown(cube: dict, rw) -> pd.DataFrame:
+    """Rincian per RT untuk satu RW."""
+    key = rw_key(pd.Series([rw])).iloc[0]
+    if pd.isna(key) or key not in cube['rt'].index.get_level_values('RW'):
+        return cube['rt'].iloc[0:0].reset_index()
+    return cube['rt'].xs(key, level='RW').reset_index()
@@ -0,0 +1,194 @@
+"""
+Benchmark skala: mengukur setiap dataset dengan data sintetis (lihat synthetic_data.py) pada beberapa
+ukuran worksheet, tanpa mengakses Google Sheets.
+
+Tahap yang diukur per dataset dan ukuran:
+    load     loader + pembersihan (datasets.load_dataset) dengan cache kosong
+    chart    membangun grafik Altair dan spesifikasi Vega-Lite-nya (seperti laporan PDF)
+    payload  ukuran JSON spesifikasi grafik yang dikirim ke browser (byte, bukan waktu)
+    xlsx     page.to_excel
+    pdf      page.df_to_pdf
+
+Hasil disimpan sebagai JSON (satu file per commit) agar regresi terlihat antar-commit:
+    python benchmark.py --scales 100,1000,10000 --output benchmark_hasil
+    python benchmark.py --scales 1000000 --datasets jenis_kelamin --stages load,chart,payload
+
+Jika satu tahap sudah melewati --budget detik, tahap itu dilewati untuk ukuran yang lebih besar
+(dicatat dengan "skipped": true) agar benchmark tetap selesai dalam waktu wajar.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+STAGES = ("load", "chart", "payload", "xlsx", "pdf")
+DEFAULT_SCALES = (100, 1_000, 10_000, 100_000) # 10^6 baris dijalankan hanya jika diminta lewat --scales
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(fn, repeat: int):
+    """Menjalankan fn sebanyak `repeat` kali; mengembalikan (waktu tercepat, hasil terakhir)."""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(scales, datasets, stages, repeat: int = 1, budget: float = 60.0, seed: int = 0) -> list:
+    """Menjalankan benchmark; mengembalikan daftar hasil {dataset, rows, stage, seconds, bytes, ...}."""
+    from datasets import load_dataset
+    from report import REPORT_SECTIONS, chart_spec
+    from synthetic_data import generate_all, install_fake_source
+
+    sections = {section["dataset"]: section for section in REPORT_SECTIONS}
+    over_budget = set() # (dataset, tahap) yang sudah melewati budget pada ukuran lebih kecil
+    results = []
+
+    for rows in sorted(scales):
+        install_fake_source(generate_all(rows, seed))
+        for dataset in datasets:
+            slug, page = dataset["slug"], dataset["page"]
+
+            def load():
+                dataset["loader"].clear()
+                return load_dataset(dataset)
+
+            seconds, df = _timed(load, repeat)
+            base = {"dataset": slug, "rows": rows, "clean_rows": len(df)}
+            if "load" in stages:
+                results.append({**base, "stage": "load", "seconds": round(seconds, 6)})
+            if df.empty:
+                print(f"[kosong] {slug} @ {rows:,} baris", file=sys.stderr)
+                continue
+
+            spec = None
+            exports = {"chart": lambda: chart_spec(sections[slug]["chart"](df)),
+                       "xlsx": lambda: page.to_excel(df), "pdf": lambda: page.df_to_pdf(df)}
+            for stage in ("chart", "xlsx", "pdf"):
+                if stage not in stages and not (stage == "chart" and "payload" in stages):
+                    continue
+                if (slug, stage) in over_budget:
+                    results.append({**base, "stage": stage, "skipped": True})
+                    continue
+                try:
+                    seconds, output = _timed(exports[stage], repeat)
+                except Exception as e:
+                    results.append({**base, "stage": stage, "error": f"{type(e).__name__}: {e}"})
+                    over_budget.add((slug, stage)) # Ukuran lebih besar hampir pasti gagal juga
+                    continue
+                if seconds > budget:
+                    over_budget.add((slug, stage))
+                if stage == "chart":
+                    spec = output
+                    if "chart" not in stages:
+                        continue
+                    output = None
+                results.append({**base, "stage": stage, "seconds": round(seconds, 6),
+                                **({"bytes": len(output)} if output is not None else {})})
+            if "payload" in stages and spec is not None:
+                payload = json.dumps(spec, default=str).encode("utf-8")
+                results.append({**base, "stage": "payload", "bytes": len(payload)})
+
+            print(f"[selesai] {slug} @ {rows:,} baris", file=sys.stderr)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard kelurahan dengan data sintetis.")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="jumlah baris per worksheet dipisah koma (default: 100,1000,10000,100000)")
+    parser.add_argument("--datasets", default=None, help="slug dataset dipisah koma (default: semua)")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"tahap dipisah koma, pilihan: {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="ulangi setiap tahap; waktu tercepat yang dicatat")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="lewati tahap untuk ukuran lebih besar jika sudah melewati batas ini (detik)")
+    parser.add_argument("--seed", type=int, default=0, help="seed data sintetis")
+    parser.add_argument("--output", default="benchmark_hasil", help="folder laporan JSON (default: benchmark_hasil)")
+    args = parser.parse_args(argv)
+
+    try:
+        args.scales = [int(scale.replace("_", "")) for scale in args.scales.split(",") if scale.strip()]
+    except ValueError:
+        parser.error("--scales harus berupa bilangan bulat dipisah koma")
+    if not args.scales or min(args.scales) < 1:
+        parser.error("--scales minimal 1 baris")
+    args.stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"tahap tidak dikenal: {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat minimal 1")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Snapshot versi data sintetis tidak boleh bercampur dengan snapshot data asli
+    snapshot_dir = tempfile.mkdtemp(prefix="benchmark_snapshots_")
+    os.environ["SNAPSHOT_DIR"] = snapshot_dir
+
+    from datasets import DATASETS, get_dataset
+
+    # Streamlit dipakai dalam mode 'bare' (tanpa server): sembunyikan peringatan ScriptRunContext.
+    # Diatur setelah impor agar logger yang dibuat saat impor modul Streamlit ikut terpengaruh.
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    if args.datasets:
+        slugs = [slug.strip() for slug in args.datasets.split(",") if slug.strip()]
+        unknown = [slug for slug in slugs if get_dataset(slug) is None]
+        if unknown:
+            print(f"Dataset tidak dikenal: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        datasets = [get_dataset(slug) for slug in slugs]
+    else:
+        datasets = DATASETS
+
+    started = datetime.datetime.now()
+    try:
+        results = run_benchmark(args.scales, datasets, args.stages, args.repeat, args.budget, args.seed)
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    commit = _git_commit()
+    report = {
+        "generated_at": started.isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": sorted(args.scales),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{started:%Y%m%d-%H%M%S}_{commit or 'tanpa-git'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = [r for r in results if "error" in r]
+    for r in failed:
+        print(f"[gagal] {r['dataset']} {r['stage']} @ {r['rows']:,} baris: {r['error']}", file=sys.stderr)
+    print(f"Laporan benchmark: {path} ({len(results)} hasil, {len(failed)} gagal)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
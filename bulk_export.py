@@ -0,0 +1,70 @@
+import functools
+import hashlib
+import io
+import zipfile
+
+from datasets import DATASETS, load_dataset
+from exports import dataset_version, get_export_bytes, get_export_bytes_many
+from xlsx_export import write_xlsx
+
+MIME_ZIP = "application/zip"
+
+
+def load_all_datasets(datasets=DATASETS):
+    """
+    Memuat semua dataset (lewat cache load_*()) dan menghitung versinya.
+    Mengembalikan list berisi (dataset, df, versi); dataset kosong dilewati.
+    """
+    frames = []
+    for dataset in datasets:
+        df = load_dataset(dataset)
+        if not df.empty:
+            frames.append((dataset, df, dataset_version(df)))
+    return frames
+
+
+def bundle_version(frames) -> str:
+    """Versi gabungan: berubah jika salah satu dataset berubah."""
+    digest = hashlib.sha1()
+    for dataset, _, version in frames:
+        digest.update(f"{dataset['slug']}={version};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _excel_sheets(frames):
+    sheets = []
+    for dataset, df, _ in frames:
+        frame = dataset["excel_frame"](df) if dataset["excel_frame"] is not None else df
+        sheets.append((dataset["worksheet"], frame))
+    return sheets
+
+
+def _workbook_bytes(sheets) -> bytes:
+    output = io.BytesIO()
+    write_xlsx(sheets, output)
+    return output.getvalue()
+
+
+def _pdf_zip_bytes(frames, owner=None) -> bytes:
+    # PDF yang belum ada di cache dibuat paralel di proses pembuat file (cache sama dengan tombol unduh per halaman)
+    pdfs = get_export_bytes_many(
+        [(dataset["file_stem"], "pdf", dataset["page"].df_to_pdf, df, version) for dataset, df, version in frames],
+        owner=owner)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for (dataset, _, _), pdf_bytes in zip(frames, pdfs):
+            zf.writestr(f"{dataset['file_stem']}.pdf", pdf_bytes)
+    return output.getvalue()
+
+
+def build_workbook(frames, owner=None) -> bytes:
+    """Satu file XLSX dengan satu sheet per worksheet Google Sheet."""
+    return get_export_bytes("semua_data", "xlsx", _workbook_bytes, _excel_sheets(frames), bundle_version(frames),
+                            owner=owner)
+
+
+def build_pdf_zip(frames, owner=None) -> bytes:
+    """File ZIP berisi PDF setiap dataset; PDF yang sudah pernah dibuat diambil dari cache."""
+    # Penggabungan ke ZIP ringan, jadi dijalankan langsung; pembuatan PDF-nya yang dikirim ke proses lain
+    return get_export_bytes("semua_data", "zip", functools.partial(_pdf_zip_bytes, owner=owner), frames,
+                            bundle_version(frames), offload=False)
@@ -0,0 +1,181 @@
+"""
+Pembuatan file ekspor tanpa membuka dashboard (untuk dijalankan terjadwal, mis. lewat cron).
+
+Contoh (jalankan dari folder proyek agar .streamlit/secrets.toml terbaca):
+    python cli.py --output hasil_ekspor --formats xlsx,pdf,parquet --workers 4 --incremental
+    python cli.py --datasets umkm,kk_rw --formats pdf --report
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+FORMATS = ("xlsx", "pdf", "parquet")
+MANIFEST_FILE = "manifest.json"
+
+
+def _render(dataset_slug: str, fmt: str, df, path: str):
+    """Membuat satu file ekspor (dijalankan di proses pekerja)."""
+    from datasets import arrow_safe_frame, get_dataset
+
+    dataset = get_dataset(dataset_slug)
+    # Ditulis ke file sementara dulu agar file lama tetap utuh jika pembuatan gagal
+    tmp_path = f"{path}.tmp"
+    if fmt == "parquet":
+        arrow_safe_frame(df).to_parquet(tmp_path, index=False)
+    else:
+        export_fn = dataset["page"].to_excel if fmt == "xlsx" else dataset["page"].df_to_pdf
+        with open(tmp_path, "wb") as f:
+            f.write(export_fn(df))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _try_render(job):
+    try:
+        _render(*job[:4])
+        return None
+    except Exception as e:
+        return e
+
+
+def _future_error(future):
+    try:
+        future.result()
+        return None
+    except Exception as e:
+        return e
+
+
+def _load_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(output_dir: str, manifest: dict):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Membuat file XLSX/PDF/Parquet semua dataset dashboard kelurahan.")
+    parser.add_argument("--output", default="hasil_ekspor", help="folder tujuan (default: hasil_ekspor)")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help=f"daftar format dipisah koma, pilihan: {', '.join(FORMATS)}")
+    parser.add_argument("--datasets", default=None, help="slug dataset dipisah koma (default: semua)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="jumlah proses pembuat file (1 = tanpa proses tambahan)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="lewati dataset yang isinya tidak berubah sejak pembuatan sebelumnya")
+    parser.add_argument("--report", action="store_true", help="buat juga laporan PDF lengkap dengan grafik")
+    args = parser.parse_args(argv)
+
+    args.formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in args.formats if fmt not in FORMATS]
+    if unknown:
+        parser.error(f"format tidak dikenal: {', '.join(unknown)}")
+    if args.workers < 1:
+        parser.error("--workers minimal 1")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Streamlit dipakai dalam mode 'bare' (tanpa server): sembunyikan peringatan ScriptRunContext
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    from datasets import DATASETS, get_dataset, load_dataset
+    from exports import dataset_version
+
+    if args.datasets:
+        slugs = [slug.strip() for slug in args.datasets.split(",") if slug.strip()]
+        unknown = [slug for slug in slugs if get_dataset(slug) is None]
+        if unknown:
+            print(f"Dataset tidak dikenal: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        datasets = [get_dataset(slug) for slug in slugs]
+    else:
+        datasets = DATASETS
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = _load_manifest(args.output)
+    started = time.perf_counter()
+
+    jobs = []
+    created = failed = 0
+    for dataset in datasets:
+        df = load_dataset(dataset)
+        if df.empty:
+            # load_dataset mengembalikan DataFrame kosong jika pemuatan gagal; file lama tidak ditimpa
+            failed += 1
+            print(f"[gagal]  {dataset['slug']}: data kosong atau gagal dimuat", file=sys.stderr)
+            continue
+        version = dataset_version(df)
+        for fmt in args.formats:
+            path = os.path.join(args.output, f"{dataset['file_stem']}.{fmt}")
+            entry = manifest.get(dataset["slug"], {}).get(fmt)
+            if args.incremental and entry == version and os.path.exists(path):
+                print(f"[tetap]  {os.path.basename(path)}")
+                continue
+            jobs.append((dataset["slug"], fmt, df, path, version))
+
+    if args.workers == 1:
+        results = [(job, _try_render(job)) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [(job, pool.submit(_render, *job[:4])) for job in jobs]
+            results = [(job, _future_error(future)) for job, future in futures]
+
+    for (slug, fmt, _, path, version), error in results:
+        if error is None:
+            manifest.setdefault(slug, {})[fmt] = version
+            created += 1
+            print(f"[dibuat] {os.path.basename(path)}")
+        else:
+            failed += 1
+            print(f"[gagal]  {os.path.basename(path)}: {error}", file=sys.stderr)
+
+    if args.report:
+        status = _build_report(args.output, manifest, args.incremental)
+        created += status == "dibuat"
+        failed += status == "gagal"
+
+    _save_manifest(args.output, manifest)
+    print(f"Selesai dalam {time.perf_counter() - started:.1f} detik "
+          f"({created} file dibuat, {failed} gagal).")
+    return 1 if failed else 0
+
+
+def _build_report(output_dir: str, manifest: dict, incremental: bool) -> str:
+    """Membuat laporan PDF lengkap; mengembalikan status "dibuat", "tetap", atau "gagal"."""
+    from report import build_sections, render_report, report_version
+
+    path = os.path.join(output_dir, "laporan_kelurahan_marapalam.pdf")
+    sections = build_sections()
+    version = report_version(sections)
+    if incremental and manifest.get("_laporan") == version and os.path.exists(path):
+        print(f"[tetap]  {os.path.basename(path)}")
+        return "tetap"
+    try:
+        data = render_report(sections)
+    except Exception as e:
+        print(f"[gagal]  {os.path.basename(path)}: {e}", file=sys.stderr)
+        return "gagal"
+    with open(path, "wb") as f:
+        f.write(data)
+    manifest["_laporan"] = version
+    print(f"[dibuat] {os.path.basename(path)}")
+    return "dibuat"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+API HTTP baca-saja untuk dataset kelurahan (JSON, CSV, dan Arrow IPC).
+
+Data diambil dari fungsi load_*() (yang sudah di-cache), sehingga aplikasi lain
+tidak perlu membaca Google Sheet lagi.
+
+Menjalankan sebagai proses terpisah (dari folder proyek):
+    python data_api.py --port 8600
+
+Atau bersama dashboard: set variabel lingkungan DATA_API_PORT sebelum `streamlit run main.py`.
+
+API tidak memakai autentikasi dan berisi data tingkat rumah tangga, jadi secara default hanya
+mendengarkan di 127.0.0.1. Untuk membukanya ke jaringan, pilih alamat secara sadar
+(--host 0.0.0.0 atau DATA_API_HOST), sebaiknya di belakang reverse proxy yang membatasi akses.
+
+Endpoint:
+    GET /datasets                     daftar dataset
+    GET /datasets/<slug>              isi dataset (default JSON)
+    GET /datasets/<slug>.csv|.json|.arrow
+
+Parameter query untuk isi dataset:
+    format=json|csv|arrow   alternatif untuk ekstensi di URL
+    columns=Kolom A,Kolom B kolom yang diambil
+    limit=100, offset=0     potongan baris
+    <nama kolom>=<nilai>    filter baris (nilai sama persis; boleh diulang untuk beberapa nilai)
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import logging
+import secrets
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from datasets import DATASETS, arrow_safe_frame, get_dataset, load_dataset
+from exports import dataset_version
+from memory_accounting import register_cache
+
+CONTENT_TYPES = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+RESERVED_PARAMS = {"format", "columns", "limit", "offset"}
+GZIP_MIN_BYTES = 1024 # Respons kecil tidak dikompresi
+CACHE_MAX_AGE = 60 # Sama dengan ttl cache load_*()
+DEFAULT_HOST = "127.0.0.1"
+# Versi loader dihitung ulang dari 1 setiap proses dimulai; token ini membuat ETag lama tidak berlaku setelah restart
+_PROCESS_TOKEN = secrets.token_hex(4)
+
+# Cache respons terpisah dari cache tombol unduh agar lalu lintas API tidak menggeser file XLSX/PDF
+RESPONSE_CACHE_MAX_ENTRIES = 128
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+register_cache("respons API", _response_cache, _response_cache_lock)
+
+_logger = logging.getLogger(__name__)
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_query(query: str) -> dict:
+    params = parse_qs(query, keep_blank_values=True)
+    options = {
+        "columns": [col for col in params.get("columns", [""])[0].split(",") if col] or None,
+        "filters": {key: values for key, values in params.items() if key not in RESERVED_PARAMS},
+    }
+    for name in ("limit", "offset"):
+        value = params.get(name, [None])[0]
+        try:
+            options[name] = int(value) if value not in (None, "") else None
+        except ValueError:
+            raise ApiError(400, f"Parameter '{name}' harus berupa angka.")
+        if options[name] is not None and options[name] < 0:
+            raise ApiError(400, f"Parameter '{name}' tidak boleh negatif.")
+    return options
+
+
+def _matches(series: pd.Series, values: list) -> pd.Series:
+    """
+    Baris yang nilainya ada di values (teks dari query string). Nilai diubah dulu ke tipe kolom,
+    sehingga ?RW=5 cocok dengan 5.0 di kolom angka; nilai yang tidak bisa diubah tidak cocok dengan baris mana pun.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        flags = {"true": True, "1": True, "false": False, "0": False}
+        return series.isin([flags[v.lower()] for v in values if v.lower() in flags])
+    if pd.api.types.is_numeric_dtype(series):
+        return series.isin(pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").dropna())
+    if pd.api.types.is_datetime64_any_dtype(series):
+        targets = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").dropna()
+        if series.dt.tz is not None and not targets.empty and targets.dt.tz is None:
+            targets = targets.dt.tz_localize(series.dt.tz)
+        return series.isin(targets)
+    # Kolom teks/campuran: dibandingkan sebagai teks, dan sel berisi angka juga dibandingkan sebagai angka
+    mask = series.astype(str).isin(values)
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").dropna()
+    if not numbers.empty:
+        mask |= pd.to_numeric(series, errors="coerce").isin(numbers)
+    return mask
+
+
+def select_rows(df: pd.DataFrame, columns=None, filters=None, limit=None, offset=None) -> pd.DataFrame:
+    """Menerapkan filter baris, pilihan kolom, dan potongan limit/offset."""
+    filters = filters or {}
+    unknown = [col for col in list(filters) + (columns or []) if col not in df.columns]
+    if unknown:
+        raise ApiError(400, f"Kolom tidak dikenal: {', '.join(unknown)}")
+
+    if filters:
+        mask = pd.Series(True, index=df.index)
+        for col, values in filters.items():
+            mask &= _matches(df[col], values)
+        df = df[mask]
+    if columns:
+        df = df[columns]
+    start = offset or 0
+    end = start + limit if limit is not None else None
+    return df.iloc[start:end]
+
+
+def serialize(df: pd.DataFrame, fmt: str) -> bytes:
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(arrow_safe_frame(df), preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient="records", date_format="iso", force_ascii=False).encode("utf-8")
+
+
+def data_version(dataset: dict, df: pd.DataFrame) -> str:
+    """
+    Versi isi dataset untuk ETag dan kunci cache: diambil dari loader (murah, tanpa meng-hash baris).
+    Jika loader sedang dimuat ulang bersamaan (versi tidak diketahui), isi df di-hash.
+    """
+    version = dataset["loader"].version()
+    return f"{dataset['slug']}:{_PROCESS_TOKEN}:{version}" if version is not None else dataset_version(df)
+
+
+def dataset_index() -> list:
+    index = []
+    for dataset in DATASETS:
+        df = load_dataset(dataset)
+        index.append({
+            "slug": dataset["slug"],
+            "title": dataset["title"],
+            "worksheet": dataset["worksheet"],
+            "rows": len(df),
+            "columns": [str(col) for col in df.columns],
+            "version": data_version(dataset, df),
+            "url": f"/datasets/{dataset['slug']}",
+        })
+    return index
+
+
+def _cached_body(key, build):
+    with _response_cache_lock:
+        if key in _response_cache:
+            _response_cache.move_to_end(key)
+            return _response_cache[key]
+    body = build()
+    with _response_cache_lock:
+        _response_cache[key] = body
+        while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+    return body
+
+
+class DataApiHandler(BaseHTTPRequestHandler):
+    server_version = "SigemaDataAPI/1.0"
+
+    def do_GET(self):
+        try:
+            self._handle_get()
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"Terjadi error: {e}"})
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def _handle_get(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        if parts == ["datasets"] or not parts:
+            index = dataset_index()
+            etag = hashlib.sha1("".join(item["version"] for item in index).encode("utf-8")).hexdigest()[:16]
+            if not self._not_modified(etag):
+                self._send_body(200, json.dumps(index, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES["json"], etag=etag)
+            return
+        if len(parts) != 2 or parts[0] != "datasets":
+            raise ApiError(404, "Endpoint tidak ditemukan. Gunakan /datasets atau /datasets/<slug>.")
+
+        slug, _, extension = parts[1].partition(".")
+        fmt = extension or parse_qs(url.query).get("format", ["json"])[0]
+        if fmt not in CONTENT_TYPES:
+            raise ApiError(400, f"Format '{fmt}' tidak didukung. Pilihan: {', '.join(CONTENT_TYPES)}.")
+
+        dataset = get_dataset(slug)
+        if dataset is None:
+            raise ApiError(404, f"Dataset '{slug}' tidak ditemukan.")
+        options = _parse_query(url.query)
+        df = load_dataset(dataset)
+        version = data_version(dataset, df)
+        normalized = json.dumps(options, sort_keys=True)
+        etag = hashlib.sha1(f"{version}:{fmt}:{normalized}".encode("utf-8")).hexdigest()[:16]
+        if self._not_modified(etag):
+            return
+        body = _cached_body((slug, version, fmt, normalized), lambda: serialize(select_rows(df, **options), fmt))
+        self._send_body(200, body, CONTENT_TYPES[fmt], etag=etag)
+
+    def _send_json(self, status: int, payload):
+        self._send_body(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES["json"])
+
+    def _not_modified(self, etag: str) -> bool:
+        """Mengirim 304 jika klien sudah memiliki versi yang sama (If-None-Match)."""
+        quoted = f'"{etag}"'
+        if_none_match = self.headers.get("If-None-Match", "")
+        if quoted not in [tag.strip() for tag in if_none_match.split(",")] and if_none_match.strip() != "*":
+            return False
+        self.send_response(304)
+        self.send_header("ETag", quoted)
+        self.end_headers()
+        return True
+
+    def _send_body(self, status: int, body: bytes, content_type: str, etag: str = None):
+        use_gzip = len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = gzip.compress(body, compresslevel=6)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", f"public, max-age={CACHE_MAX_AGE}")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag is not None:
+            self.send_header("ETag", f'"{etag}"')
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Log akses tidak dicetak agar terminal Streamlit tetap bersih
+        pass
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = 8600) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), DataApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(host: str = DEFAULT_HOST, port: int = 8600):
+    """
+    Menjalankan API di thread latar, sekali per proses (aman dipanggil di setiap rerun main.py).
+    Jika port sudah dipakai, galat dicatat ke log dan dashboard tetap berjalan.
+    """
+    global _server, _server_started
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = create_server(host, port)
+            except OSError as e:
+                _logger.error("API data tidak dapat dijalankan di port %s: %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="data-api", daemon=True).start()
+        return _server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API baca-saja untuk dataset dashboard kelurahan.")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"alamat yang didengarkan (default: {DEFAULT_HOST}; API tanpa autentikasi)")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port)
+    print(f"API data berjalan di http://{args.host}:{args.port}/datasets")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
+import time
+
 import streamlit as st
 import pandas as pd
 from streamlit_gsheets import GSheetsConnection
+from snapshots import keep_snapshot
+from tracing import span, traced
+from metrics import cache_metrics, refresh_metrics, observe_fetch
+from sheets_quota import ThrottledConnection
 
 # --- Konfigurasi Google Sheets ---
 # ID Spreadsheet Anda (bisa ditemukan di URL Google Sheet Anda)
@@ -28,7 +34,8 @@ def get_gsheets_connection():
     """Establishes and returns a Streamlit GSheetsConnection."""
     try:
         conn = st.connection("gsheets", type=GSheetsConnection)
-        return conn
+        # Setiap read/write melewati pembatas kuota per menit Google Sheets (lihat sheets_quota.py)
+        return ThrottledConnection(conn)
     except Exception as e:
         st.error(f"Error establishing GSheetsConnection: {e}. "
                  "Pastikan Anda telah menginstal 'streamlit-gsheets' dan mengatur secrets dengan benar.")
@@ -43,17 +50,22 @@ def load_data_from_gsheets(worksheet_name, usecols=None):
     if conn is None:
         return pd.DataFrame()
 
+    started = time.perf_counter()
     try:
         # ttl for read operation is applied per read call
-        df = conn.read(
-            spreadsheet=GOOGLE_SHEET_URL,
-            worksheet=worksheet_name,
-            usecols=usecols,
-            ttl=5 # TTL for the read operation itself
-        ) 
-        df = df.dropna(how="all") # Drop rows that are entirely empty
+        with span("fetch", dataset=worksheet_name) as fetch_span:
+            df = conn.read(
+                spreadsheet=GOOGLE_SHEET_URL,
+                worksheet=worksheet_name,
+                usecols=usecols,
+                ttl=5 # TTL for the read operation itself
+            ) 
+            df = df.dropna(how="all") # Drop rows that are entirely empty
+            fetch_span.set(rows=len(df), columns=len(df.columns))
+        observe_fetch(worksheet_name, time.perf_counter() - started, df)
         return df
     except Exception as e:
+        observe_fetch(worksheet_name, time.perf_counter() - started, error=True)
         st.error(f"Terjadi error saat membaca data dari Google Sheet '{worksheet_name}': {e}")
         return pd.DataFrame()
 
@@ -76,7 +88,11 @@ def write_data_to_gsheets(df_to_write, worksheet_name):
         return False
 
 # --- FUNGSI: Memuat Data Jumlah Penduduk dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_PENDUDUK)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_PENDUDUK)
+@refresh_metrics(WORKSHEET_NAME_PENDUDUK)
+@traced("clean", dataset=WORKSHEET_NAME_PENDUDUK)
 def load_penduduk_2020_from_gsheet():
     """
     Memuat dan memproses data jumlah penduduk dari Google Sheet.
@@ -111,7 +127,11 @@ def load_penduduk_2020_from_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Pendidikan dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_PENDIDIKAN)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_PENDIDIKAN)
+@refresh_metrics(WORKSHEET_NAME_PENDIDIKAN)
+@traced("clean", dataset=WORKSHEET_NAME_PENDIDIKAN)
 def load_pendidikan_data_from_gsheet():
     """
     Memuat dan memproses data jumlah penduduk (pendidikan) dari Google Sheet.
@@ -152,7 +172,11 @@ def load_pendidikan_data_from_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Jenis Pekerjaan Dominan dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_PEKERJAAN_DOMINAN)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_PEKERJAAN_DOMINAN)
+@refresh_metrics(WORKSHEET_NAME_PEKERJAAN_DOMINAN)
+@traced("clean", dataset=WORKSHEET_NAME_PEKERJAAN_DOMINAN)
 def load_jenis_pekerjaan_dominan_gsheet():
     """
     Memuat dan memproses data jenis pekerjaan dominan dari Google Sheet.
@@ -187,7 +211,11 @@ def load_jenis_pekerjaan_dominan_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Jenis Tanah dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_JENIS_TANAH)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_JENIS_TANAH)
+@refresh_metrics(WORKSHEET_NAME_JENIS_TANAH)
+@traced("clean", dataset=WORKSHEET_NAME_JENIS_TANAH)
 def load_jenis_tanah_gsheet():
     """
     Memuat dan memproses data jenis tanah dari Google Sheet.
@@ -238,7 +266,11 @@ def load_jenis_tanah_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Jumlah Industri UMKM dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_INDUSTRI_UMKM)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_INDUSTRI_UMKM)
+@refresh_metrics(WORKSHEET_NAME_INDUSTRI_UMKM)
+@traced("clean", dataset=WORKSHEET_NAME_INDUSTRI_UMKM)
 def load_umkm_data_gsheet():
     """
     Memuat dan memproses data Jumlah Industri UMKM dari Google Sheet.
@@ -269,7 +301,11 @@ def load_umkm_data_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Jumlah KK Menurut RW dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_KK_RW)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_KK_RW)
+@refresh_metrics(WORKSHEET_NAME_KK_RW)
+@traced("clean", dataset=WORKSHEET_NAME_KK_RW)
 def load_kk_rw_data_gsheet():
     """
     Memuat dan memproses data Jumlah KK Menurut RW dari Google Sheet.
@@ -308,7 +344,11 @@ def load_kk_rw_data_gsheet():
     return df
 
 # --- FUNGSI Memuat Data Jumlah Penduduk (Status Pekerja) dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_STATUS_PEKERJA)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_STATUS_PEKERJA)
+@refresh_metrics(WORKSHEET_NAME_STATUS_PEKERJA)
+@traced("clean", dataset=WORKSHEET_NAME_STATUS_PEKERJA)
 def load_status_pekerja_data_gsheet():
     """
     Memuat dan memproses data Jumlah Penduduk (Status Pekerja) dari Google Sheet.
@@ -344,7 +384,11 @@ def load_status_pekerja_data_gsheet():
     return df
 
 # --- FUNGSI BARU: Memuat Data Penduduk Disabilitas dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_DISABILITAS)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_DISABILITAS)
+@refresh_metrics(WORKSHEET_NAME_DISABILITAS)
+@traced("clean", dataset=WORKSHEET_NAME_DISABILITAS)
 def load_disabilitas_data_gsheet():
     """
     Memuat dan memproses data Penduduk Disabilitas dari Google Sheet.
@@ -387,7 +431,11 @@ def load_disabilitas_data_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Penduduk Menurut Jenis Kelamin dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_JENIS_KELAMIN)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_JENIS_KELAMIN)
+@refresh_metrics(WORKSHEET_NAME_JENIS_KELAMIN)
+@traced("clean", dataset=WORKSHEET_NAME_JENIS_KELAMIN)
 def load_penduduk_jenis_kelamin_gsheet(): # Nama fungsi disesuaikan agar konsisten dengan konvensi load_..._gsheet()
     """
     Memuat dan memproses data penduduk menurut jenis kelamin dari Google Sheet.
@@ -446,7 +494,11 @@ def load_penduduk_jenis_kelamin_gsheet(): # Nama fungsi disesuaikan agar konsist
     return df_processed
 
 # --- FUNGSI: Memuat Data Sarana dan Prasarana dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_SARANA_PRASARANA)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_SARANA_PRASARANA)
+@refresh_metrics(WORKSHEET_NAME_SARANA_PRASARANA)
+@traced("clean", dataset=WORKSHEET_NAME_SARANA_PRASARANA)
 def load_sarana_prasarana_from_gsheet():
     """
     Memuat dan memproses data sarana dan prasarana dari Google Sheet.
@@ -488,7 +540,11 @@ def load_sarana_prasarana_from_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Sarana Kebersihan dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_SARANA_KEBERSIHAN)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_SARANA_KEBERSIHAN)
+@refresh_metrics(WORKSHEET_NAME_SARANA_KEBERSIHAN)
+@traced("clean", dataset=WORKSHEET_NAME_SARANA_KEBERSIHAN)
 def load_sarana_kebersihan_from_gsheet():
     """
     Memuat dan memproses data sarana kebersihan dari Google Sheet.
@@ -529,7 +585,11 @@ def load_sarana_kebersihan_from_gsheet():
     return df
 
 # --- FUNGSI: Memuat Data Tenaga Kerja dari Google Sheet ---
+@cache_metrics(WORKSHEET_NAME_TENAGA_KERJA)
 @st.cache_data(ttl=60)
+@keep_snapshot(WORKSHEET_NAME_TENAGA_KERJA)
+@refresh_metrics(WORKSHEET_NAME_TENAGA_KERJA)
+@traced("clean", dataset=WORKSHEET_NAME_TENAGA_KERJA)
 def load_tenaga_kerja_from_gsheet():
     """
     Memuat dan memproses data tenaga kerja dari Google Sheet.
@@ -0,0 +1,95 @@
+import pandas as pd
+
+from data_loader import (
+    WORKSHEET_NAME_PENDUDUK, WORKSHEET_NAME_PENDIDIKAN, WORKSHEET_NAME_PEKERJAAN_DOMINAN,
+    WORKSHEET_NAME_JENIS_TANAH, WORKSHEET_NAME_INDUSTRI_UMKM, WORKSHEET_NAME_KK_RW,
+    WORKSHEET_NAME_STATUS_PEKERJA, WORKSHEET_NAME_DISABILITAS, WORKSHEET_NAME_JENIS_KELAMIN,
+    WORKSHEET_NAME_SARANA_PRASARANA, WORKSHEET_NAME_SARANA_KEBERSIHAN, WORKSHEET_NAME_TENAGA_KERJA,
+    load_penduduk_2020_from_gsheet, load_pendidikan_data_from_gsheet, load_jenis_pekerjaan_dominan_gsheet,
+    load_jenis_tanah_gsheet, load_umkm_data_gsheet, load_kk_rw_data_gsheet,
+    load_status_pekerja_data_gsheet, load_disabilitas_data_gsheet, load_penduduk_jenis_kelamin_gsheet,
+    load_sarana_prasarana_from_gsheet, load_sarana_kebersihan_from_gsheet, load_tenaga_kerja_from_gsheet
+)
+from pages import (
+    jumlah_penduduk, jumlah_penduduk_pendidikan, jenis_pekerjaan_dominan, jenis_tanah,
+    jumlah_industri_umkm, jumlah_kk_menurut_rw, jumlah_penduduk_status_pekerja, penduduk_disabilitas,
+    penduduk_menurut_jenis_kelamin, sarana_dan_prasarana, sarana_kebersihan, tenaga_kerja
+)
+
+# Daftar seluruh dataset dashboard: satu entri per worksheet di Google Sheet.
+#   slug        : nama pendek untuk file/URL
+#   title       : nama menu di sidebar
+#   worksheet   : nama worksheet (WORKSHEET_NAME_*)
+#   loader      : fungsi load_*() dari data_loader
+#   prepare     : pembersihan tambahan di halaman sebelum ditampilkan/diekspor (opsional)
+#   page        : modul halaman yang memiliki to_excel() dan df_to_pdf()
+#   excel_frame : kolom yang diekspor ke Excel (opsional, default seluruh kolom)
+#   file_stem   : nama file unduhan (tanpa ekstensi), sama dengan tombol di halaman
+DATASETS = [
+    {"slug": "jumlah_penduduk", "title": "Jumlah Penduduk", "worksheet": WORKSHEET_NAME_PENDUDUK,
+     "loader": load_penduduk_2020_from_gsheet, "prepare": None, "page": jumlah_penduduk,
+     "excel_frame": None, "file_stem": "data_penduduk"},
+    {"slug": "pendidikan", "title": "Jumlah Penduduk (Pendidikan)", "worksheet": WORKSHEET_NAME_PENDIDIKAN,
+     "loader": load_pendidikan_data_from_gsheet, "prepare": None, "page": jumlah_penduduk_pendidikan,
+     "excel_frame": None, "file_stem": "data_pendidikan"},
+    {"slug": "jenis_pekerjaan", "title": "Jenis Pekerjaan Dominan", "worksheet": WORKSHEET_NAME_PEKERJAAN_DOMINAN,
+     "loader": load_jenis_pekerjaan_dominan_gsheet, "prepare": None, "page": jenis_pekerjaan_dominan,
+     "excel_frame": jenis_pekerjaan_dominan.excel_frame, "file_stem": "data_jenis_pekerjaan"},
+    {"slug": "jenis_tanah", "title": "Jenis Tanah", "worksheet": WORKSHEET_NAME_JENIS_TANAH,
+     "loader": load_jenis_tanah_gsheet, "prepare": None, "page": jenis_tanah,
+     "excel_frame": jenis_tanah.excel_frame, "file_stem": "data_jenis_tanah"},
+    {"slug": "umkm", "title": "Jumlah Industri UMKM", "worksheet": WORKSHEET_NAME_INDUSTRI_UMKM,
+     "loader": load_umkm_data_gsheet, "prepare": jumlah_industri_umkm.clean_umkm_data, "page": jumlah_industri_umkm,
+     "excel_frame": jumlah_industri_umkm.excel_frame, "file_stem": "data_umkm"},
+    {"slug": "kk_rw", "title": "Jumlah KK Menurut RW", "worksheet": WORKSHEET_NAME_KK_RW,
+     "loader": load_kk_rw_data_gsheet, "prepare": None, "page": jumlah_kk_menurut_rw,
+     "excel_frame": jumlah_kk_menurut_rw.excel_frame, "file_stem": "data_kk_rw"},
+    {"slug": "status_pekerja", "title": "Jumlah Penduduk (Status Pekerja)", "worksheet": WORKSHEET_NAME_STATUS_PEKERJA,
+     "loader": load_status_pekerja_data_gsheet, "prepare": None, "page": jumlah_penduduk_status_pekerja,
+     "excel_frame": jumlah_penduduk_status_pekerja.excel_frame, "file_stem": "data_status_pekerja"},
+    {"slug": "disabilitas", "title": "Penduduk Disabilitas", "worksheet": WORKSHEET_NAME_DISABILITAS,
+     "loader": load_disabilitas_data_gsheet, "prepare": None, "page": penduduk_disabilitas,
+     "excel_frame": penduduk_disabilitas.excel_frame, "file_stem": "data_disabilitas"},
+    {"slug": "jenis_kelamin", "title": "Penduduk Menurut Jenis Kelamin", "worksheet": WORKSHEET_NAME_JENIS_KELAMIN,
+     "loader": load_penduduk_jenis_kelamin_gsheet, "prepare": None, "page": penduduk_menurut_jenis_kelamin,
+     "excel_frame": None, "file_stem": "data_penduduk_jenis_kelamin"},
+    {"slug": "sarana_prasarana", "title": "Sarana dan Prasarana", "worksheet": WORKSHEET_NAME_SARANA_PRASARANA,
+     "loader": load_sarana_prasarana_from_gsheet, "prepare": None, "page": sarana_dan_prasarana,
+     "excel_frame": None, "file_stem": "data_sarana_dan_prasarana"},
+    {"slug": "sarana_kebersihan", "title": "Sarana Kebersihan", "worksheet": WORKSHEET_NAME_SARANA_KEBERSIHAN,
+     "loader": load_sarana_kebersihan_from_gsheet, "prepare": None, "page": sarana_kebersihan,
+     "excel_frame": None, "file_stem": "data_sarana_kebersihan"},
+    {"slug": "tenaga_kerja", "title": "Tenaga Kerja", "worksheet": WORKSHEET_NAME_TENAGA_KERJA,
+     "loader": load_tenaga_kerja_from_gsheet, "prepare": None, "page": tenaga_kerja,
+     "excel_frame": None, "file_stem": "data_tenaga_kerja"},
+]
+
+
+def get_dataset(slug: str):
+    """Mencari entri dataset berdasarkan slug; mengembalikan None jika tidak ada."""
+    for dataset in DATASETS:
+        if dataset["slug"] == slug:
+            return dataset
+    return None
+
+
+def load_dataset(dataset: dict):
+    """Memuat data satu dataset lengkap dengan pembersihan tambahan dari halamannya."""
+    df = dataset["loader"]()
+    if dataset["prepare"] is not None and not df.empty:
+        df = dataset["prepare"](df)
+    return df
+
+
+def arrow_safe_frame(df):
+    """
+    Salinan DataFrame yang aman ditulis ke Parquet/Arrow: kolom object berisi campuran
+    tipe (mis. angka dan teks dari Google Sheet) diubah menjadi teks; nilai kosong tetap kosong.
+    """
+    df = df.copy()
+    for col in df.columns:
+        inferred = pd.api.types.infer_dtype(df[col], skipna=True) if df[col].dtype == object else ""
+        if inferred.startswith("mixed") and inferred != "mixed-integer-float":
+            df[col] = df[col].map(lambda x: x if pd.isna(x) else str(x)).astype("string")
+    df.columns = [str(col) for col in df.columns]
+    return df
@@ -0,0 +1,243 @@
+import atexit
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+
+# Jumlah proses pembuat file (XLSX/PDF). 0 = jalankan langsung di thread Streamlit.
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", min(4, os.cpu_count() or 1)))
+# Batas waktu (detik) pembuatan satu file sebelum dibatalkan
+EXPORT_TIMEOUT = float(os.environ.get("EXPORT_TIMEOUT", 120))
+# Proses dipakai ulang untuk sejumlah file, lalu diganti agar memori tidak terus bertambah
+TASKS_PER_WORKER = 50
+POLL_INTERVAL = 0.1 # detik; seberapa cepat pembatalan dan batas waktu diperiksa
+
+_context = None
+_idle = [] # Proses yang sedang menganggur
+_state_lock = threading.Lock()
+# Satu proses hanya mengerjakan satu file pada satu waktu, jadi proses yang macet bisa dihentikan sendiri
+_worker_slots = threading.BoundedSemaphore(max(EXPORT_WORKERS, 1))
+# Membatasi jumlah ekspor yang menunggu/berjalan agar antrean tidak tumbuh tanpa batas
+_slots = threading.BoundedSemaphore(max(EXPORT_WORKERS, 1) * 2)
+_calls = set() # Ekspor yang sedang menunggu/berjalan (lihat cancel_exports)
+_shutting_down = False
+
+
+class ExportTimeoutError(TimeoutError):
+    """Pembuatan file ekspor melebihi EXPORT_TIMEOUT atau server sedang terlalu sibuk."""
+
+
+class ExportCancelledError(RuntimeError):
+    """Pembuatan file ekspor dibatalkan (oleh pengguna, atau proses pembuatnya berhenti)."""
+
+
+def _worker_main(conn):
+    """Loop proses pembuat file: menerima (export_fn, df), mengirim balik (berhasil, hasil/galat)."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        export_fn, df = task
+        try:
+            conn.send((True, export_fn(df)))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception: # Galat yang tidak bisa di-pickle
+                conn.send((False, RuntimeError(repr(e))))
+
+
+def _get_context():
+    global _context
+    if _context is None:
+        # forkserver: proses baru tidak menyalin thread dan lock milik server Streamlit
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(method)
+        if method == "forkserver":
+            context.set_forkserver_preload(["pandas", "fpdf", "xlsxwriter"])
+        _context = context
+    return _context
+
+
+class _Worker:
+    def __init__(self):
+        context = _get_context()
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), name="export-worker", daemon=True)
+        self.process.start()
+        child.close()
+        self.tasks = 0
+
+    def kill(self):
+        """Menghentikan paksa proses ini saja (tugas proses lain tidak terganggu)."""
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+def _take_worker() -> _Worker:
+    with _state_lock:
+        while _idle:
+            worker = _idle.pop()
+            if worker.process.is_alive():
+                return worker
+            worker.conn.close()
+    return _Worker()
+
+
+def _return_worker(worker: _Worker):
+    worker.tasks += 1
+    if worker.tasks >= TASKS_PER_WORKER or _shutting_down:
+        worker.stop()
+        return
+    with _state_lock:
+        _idle.append(worker)
+
+
+class _ExportCall:
+    """Satu pemanggilan run_exports(): tugas-tugasnya dan tanda pembatalannya."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.cancelled = threading.Event()
+
+
+def cancel_exports(owner) -> int:
+    """
+    Membatalkan ekspor milik owner (mis. id sesi Streamlit) yang sedang menunggu/berjalan.
+    Proses yang sedang mengerjakannya dihentikan; mengembalikan jumlah ekspor yang dibatalkan.
+    """
+    with _state_lock:
+        calls = [call for call in _calls if call.owner == owner]
+    for call in calls:
+        call.cancelled.set()
+    return len(calls)
+
+
+def shutdown_pool():
+    """Menghentikan semua proses; ekspor yang masih berjalan langsung gagal (dipanggil saat server berhenti)."""
+    global _shutting_down
+    with _state_lock:
+        _shutting_down = True
+        calls, idle = list(_calls), list(_idle)
+        _idle.clear()
+    for call in calls:
+        call.cancelled.set()
+    for worker in idle:
+        worker.stop()
+
+
+atexit.register(shutdown_pool)
+
+
+def _can_offload(export_fn) -> bool:
+    # Fungsi dikirim ke proses lain lewat nama modulnya, jadi lambda/fungsi lokal tidak bisa
+    qualname = getattr(export_fn, "__qualname__", "<")
+    return EXPORT_WORKERS > 0 and "<" not in qualname and hasattr(export_fn, "__module__")
+
+
+def _acquire_worker_slot(call: _ExportCall, deadline: float, block: bool) -> bool:
+    if not block:
+        return _worker_slots.acquire(blocking=False)
+    while not call.cancelled.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if _worker_slots.acquire(timeout=min(POLL_INTERVAL, remaining)):
+            return True
+    return False
+
+
+def run_exports(tasks, timeout: float = None, owner=None) -> list:
+    """
+    Menjalankan export_fn(df) untuk setiap (export_fn, df) di tasks secara paralel di proses
+    pembuat file, agar pembuatan file yang berat tidak menahan GIL proses Streamlit (dan tidak
+    memperlambat sesi pengguna lain). Hasil dikembalikan sesuai urutan tasks.
+
+    Setiap file punya batas waktu sendiri. Jika terlewati, atau jika cancel_exports(owner) dipanggil,
+    hanya proses milik pemanggilan ini yang dihentikan lalu ExportTimeoutError / ExportCancelledError
+    dimunculkan; ekspor sesi lain tetap berjalan.
+    """
+    tasks = list(tasks)
+    if not all(_can_offload(export_fn) for export_fn, _ in tasks):
+        return [export_fn(df) for export_fn, df in tasks]
+
+    timeout = EXPORT_TIMEOUT if timeout is None else timeout
+    if not _slots.acquire(timeout=timeout):
+        raise ExportTimeoutError("Server sedang sibuk membuat file lain. Silakan coba lagi beberapa saat.")
+    call = _ExportCall(owner)
+    with _state_lock:
+        _calls.add(call)
+    results = [None] * len(tasks)
+    pending = list(enumerate(tasks))
+    running = {} # conn -> (indeks tugas, proses, batas waktu)
+    wait_deadline = time.monotonic() + timeout
+    try:
+        while pending or running:
+            if call.cancelled.is_set():
+                raise ExportCancelledError("Pembuatan file dibatalkan.")
+            # Tugas berikutnya dimulai selama masih ada proses bebas (menunggu hanya jika belum ada yang berjalan)
+            while pending and _acquire_worker_slot(call, wait_deadline, block=not running):
+                index, (export_fn, df) = pending.pop(0)
+                worker = None
+                try:
+                    worker = _take_worker()
+                    worker.conn.send((export_fn, df))
+                except BaseException:
+                    if worker is not None:
+                        worker.kill()
+                    _worker_slots.release()
+                    raise
+                running[worker.conn] = (index, worker, time.monotonic() + timeout)
+            if not running:
+                if call.cancelled.is_set():
+                    continue
+                raise ExportTimeoutError("Server sedang sibuk membuat file lain. Silakan coba lagi beberapa saat.")
+
+            for conn in multiprocessing.connection.wait(list(running), timeout=POLL_INTERVAL):
+                index, worker, _ = running.pop(conn)
+                try:
+                    ok, value = conn.recv()
+                except (EOFError, OSError):
+                    worker.kill()
+                    _worker_slots.release()
+                    raise ExportCancelledError("Proses pembuat file berhenti sebelum selesai.")
+                _return_worker(worker)
+                _worker_slots.release()
+                if not ok:
+                    raise value
+                results[index] = value
+                wait_deadline = time.monotonic() + timeout
+
+            now = time.monotonic()
+            if any(deadline <= now for _, _, deadline in running.values()):
+                raise ExportTimeoutError(f"Pembuatan file melebihi batas waktu {timeout:.0f} detik dan dibatalkan.")
+        return results
+    finally:
+        # Tugas yang belum selesai (galat, batas waktu, atau dibatalkan): hanya proses milik pemanggilan ini yang dihentikan
+        for _, worker, _ in running.values():
+            worker.kill()
+            _worker_slots.release()
+        with _state_lock:
+            _calls.discard(call)
+        _slots.release()
+
+
+def run_export(export_fn, df, timeout: float = None, owner=None):
+    """Satu file ekspor di proses pembuat file (lihat run_exports)."""
+    return run_exports([(export_fn, df)], timeout, owner)[0]
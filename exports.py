@@ -0,0 +1,159 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from export_pool import run_export, run_exports, cancel_exports
+from memory_accounting import register_cache
+from tracing import span
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MIME_PDF = "application/pdf"
+
+# Batas jumlah file hasil ekspor yang disimpan di memori (LRU)
+EXPORT_CACHE_MAX_ENTRIES = 64
+
+_export_cache = OrderedDict()
+_export_cache_lock = threading.Lock()
+register_cache("ekspor", _export_cache, _export_cache_lock)
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """
+    Menghasilkan versi (hash isi) dari sebuah DataFrame.
+    Versi hanya berubah jika isi atau nama kolom berubah, sehingga aman dipakai sebagai kunci cache.
+    """
+    if df is None or df.empty:
+        return "empty"
+    row_hashes = pd.util.hash_pandas_object(df, index=False)
+    digest = hashlib.sha1(row_hashes.values.tobytes())
+    digest.update("|".join(map(str, df.columns)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _cache_get(key):
+    with _export_cache_lock:
+        if key in _export_cache:
+            _export_cache.move_to_end(key)
+            return _export_cache[key]
+    return None
+
+
+def _cache_put(key, data: bytes):
+    with _export_cache_lock:
+        _export_cache[key] = data
+        _export_cache.move_to_end(key)
+        while len(_export_cache) > EXPORT_CACHE_MAX_ENTRIES:
+            _export_cache.popitem(last=False)
+
+
+def get_export_bytes(cache_key: str, fmt: str, export_fn, df: pd.DataFrame, version: str = None,
+                     offload: bool = True, owner=None) -> bytes:
+    """
+    Mengembalikan hasil ekspor (XLSX/PDF) dari cache, atau membuatnya jika belum ada.
+    Kunci cache: (cache_key, fmt, versi dataset), jadi unduhan berulang untuk data yang sama tidak dihitung ulang.
+    File baru dibuat di pool proses (lihat export_pool.run_export) kecuali offload=False;
+    owner (id sesi) dipakai untuk membatalkannya lewat export_pool.cancel_exports.
+    """
+    with span("export", dataset=cache_key, format=fmt, rows=len(df)) as export_span:
+        if version is None:
+            version = dataset_version(df)
+        key = (cache_key, fmt, version)
+
+        data = _cache_get(key)
+        if data is not None:
+            export_span.set(cache_hit=True, bytes=len(data))
+            return data
+
+        data = run_export(export_fn, df, owner=owner) if offload else export_fn(df)
+        export_span.set(cache_hit=False, bytes=len(data))
+
+    _cache_put(key, data)
+    return data
+
+
+def get_export_bytes_many(requests, owner=None) -> list:
+    """
+    Seperti get_export_bytes untuk banyak file sekaligus; requests berisi
+    (cache_key, fmt, export_fn, df, versi). File yang belum ada di cache dibuat paralel
+    di proses pembuat file (export_pool.run_exports). Hasil sesuai urutan requests.
+    """
+    keys = [(cache_key, fmt, version if version is not None else dataset_version(df))
+            for cache_key, fmt, _, df, version in requests]
+    results = [_cache_get(key) for key in keys]
+    missing = [i for i, data in enumerate(results) if data is None]
+    with span("export", dataset="banyak", format="+".join(sorted({fmt for _, fmt, _, _, _ in requests})),
+              files=len(requests)) as export_span:
+        built = run_exports([(requests[i][2], requests[i][3]) for i in missing], owner=owner) if missing else []
+        export_span.set(cache_hit=not missing, built=len(missing))
+    for i, data in zip(missing, built):
+        _cache_put(keys[i], data)
+        results[i] = data
+    return results
+
+
+def clear_export_cache():
+    """Mengosongkan seluruh cache hasil ekspor."""
+    with _export_cache_lock:
+        _export_cache.clear()
+
+
+def session_owner():
+    """Id sesi Streamlit yang sedang berjalan (pemilik ekspor), atau None di luar sesi."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def _cancel_session_exports(owner):
+    if cancel_exports(owner):
+        st.toast("Pembuatan file dibatalkan.")
+    else:
+        st.toast("Tidak ada file yang sedang dibuat.")
+
+
+def render_cancel_button(owner, key: str):
+    """
+    Tombol untuk membatalkan ekspor sesi ini yang masih dibuat (mis. unduhan besar yang terlalu lama).
+    Selalu ditampilkan: tombol unduh tidak memicu rerun, jadi halaman tidak tahu kapan ekspor sedang berjalan.
+    File dibuat di thread server terpisah, sehingga klik tombol ini tetap diproses selama ekspor berjalan.
+    """
+    if owner is not None:
+        st.button("Batalkan pembuatan file", key=key, on_click=_cancel_session_exports, args=(owner,),
+                  type="tertiary", help="Menghentikan file XLSX/PDF yang sedang dibuat untuk sesi ini")
+
+
+def render_download_buttons(df: pd.DataFrame, to_excel_fn, to_pdf_fn, file_stem: str):
+    """
+    Menampilkan tombol 'Download as XLSX' dan 'Download as PDF'.
+
+    File tidak dibuat saat halaman dirender: tombol menerima callable sehingga
+    to_excel/df_to_pdf baru dijalankan ketika pengguna benar-benar menekan tombol unduh.
+    """
+    version = dataset_version(df)
+    owner = session_owner()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Download as XLSX",
+            data=lambda: get_export_bytes(file_stem, "xlsx", to_excel_fn, df, version, owner=owner),
+            file_name=f"{file_stem}.xlsx",
+            mime=MIME_XLSX,
+            key=f"download_xlsx_{file_stem}",
+            on_click="ignore",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            label="Download as PDF",
+            data=lambda: get_export_bytes(file_stem, "pdf", to_pdf_fn, df, version, owner=owner),
+            file_name=f"{file_stem}.pdf",
+            mime=MIME_PDF,
+            key=f"download_pdf_{file_stem}",
+            on_click="ignore",
+            use_container_width=True
+        )
+    render_cancel_button(owner, key=f"batal_ekspor_{file_stem}")
@@ -0,0 +1,147 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (
+    load_penduduk_2020_from_gsheet, load_jenis_pekerjaan_dominan_gsheet, load_jenis_tanah_gsheet,
+    load_disabilitas_data_gsheet, load_sarana_prasarana_from_gsheet
+)
+from aggregates import get_rw_cube
+
+# Worksheet yang memiliki kolom waktu (Tahun/Tanggal).
+#   loader : fungsi load_*() dari data_loader
+#   time   : kolom periode
+#   group  : kolom kategori (pertumbuhan dihitung per kategori), None jika satu baris per periode
+#   values : kolom angka yang dihitung perubahan dan pertumbuhannya
+#   ratios : {nama indikator: (pembilang, penyebut, pengali)}
+TIME_SERIES = {
+    "jumlah_penduduk": {
+        "loader": load_penduduk_2020_from_gsheet, "time": "Tahun", "group": None,
+        "values": ["Jumlah Laki-Laki (orang)", "Jumlah Perempuan (orang)", "Jumlah Total (orang)"],
+        "ratios": {"Rasio Jenis Kelamin": ("Jumlah Laki-Laki (orang)", "Jumlah Perempuan (orang)", 100)},
+    },
+    "jenis_pekerjaan": {
+        "loader": load_jenis_pekerjaan_dominan_gsheet, "time": "Tanggal", "group": "Jenis Pekerjaan",
+        "values": ["Jumlah"], "ratios": {},
+    },
+    "jenis_tanah": {
+        "loader": load_jenis_tanah_gsheet, "time": "Tanggal", "group": None,
+        "values": ["Tanah Sawah (Ha)", "Tanah Kering (Ha)", "Tanah Basah (Ha)", "Tanah Perkebunan (Ha)",
+                   "Tanah Fasilitas Umum (Ha)", "Tanah Hutan (Ha)"],
+        "ratios": {},
+    },
+    "disabilitas": {
+        "loader": load_disabilitas_data_gsheet, "time": "Tanggal", "group": "Jenis Cacat",
+        "values": ["Jumlah (Orang)"],
+        "ratios": {"Rasio Jenis Kelamin": ("Laki-Laki (orang)", "Perempuan (orang)", 100)},
+    },
+    "sarana_prasarana": {
+        "loader": load_sarana_prasarana_from_gsheet, "time": "Tahun", "group": "Jenis Sarana dan Prasarana",
+        "values": ["Jumlah (Unit)"], "ratios": {},
+    },
+}
+
+# Hasil per worksheet: hash setiap baris input + hasil perhitungannya (untuk pembaruan inkremental)
+_indicator_cache = {}
+_indicator_lock = threading.Lock()
+
+
+def period_growth(df: pd.DataFrame, time_col: str, value_cols, group_col: str = None, ratios: dict = None,
+                  context: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Menghitung perubahan dan pertumbuhan (%) dari periode sebelumnya untuk setiap kolom angka,
+    sekaligus untuk seluruh baris (tanpa loop per tahun/kategori).
+
+    context: baris periode sebelumnya yang hanya dipakai sebagai pembanding (tidak ikut dikembalikan).
+    """
+    value_cols = [col for col in value_cols if col in df.columns]
+    keys = [col for col in (group_col, time_col) if col]
+    frame = df if context is None else pd.concat([context, df], keys=["context", "baru"])
+    ordered = frame.sort_values(keys, kind="stable")
+    numbers = ordered[value_cols].apply(pd.to_numeric, errors="coerce")
+
+    grouped = numbers.groupby(ordered[group_col], sort=False) if group_col else numbers
+    previous = grouped.shift(1)
+    previous_time = ordered.groupby(group_col, sort=False)[time_col].shift(1) if group_col else ordered[time_col].shift(1)
+    if pd.api.types.is_integer_dtype(ordered[time_col]):
+        previous_time = previous_time.astype("Int64") # Tahun tetap bilangan bulat walau ada nilai kosong
+
+    result = ordered[keys].copy()
+    result[f"{time_col} Sebelumnya"] = previous_time
+    for col in value_cols:
+        result[col] = numbers[col]
+        result[f"{col} Sebelumnya"] = previous[col]
+        result[f"Perubahan {col}"] = numbers[col] - previous[col]
+        result[f"Pertumbuhan {col} (%)"] = ((numbers[col] - previous[col]) / previous[col].where(previous[col] != 0) * 100).round(2)
+    for name, (numerator, denominator, scale) in (ratios or {}).items():
+        if numerator in ordered.columns and denominator in ordered.columns:
+            top = pd.to_numeric(ordered[numerator], errors="coerce")
+            bottom = pd.to_numeric(ordered[denominator], errors="coerce")
+            result[name] = (top / bottom.where(bottom != 0) * scale).round(2)
+
+    if context is not None:
+        result = result.xs("baru", level=0)
+    return result.sort_values([col for col in (time_col, group_col) if col], kind="stable")
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def compute_indicators(slug: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Indikator satu worksheet, di-cache per isi data.
+
+    Jika data baru hanya berupa baris tambahan untuk periode yang lebih baru (baris lama tidak berubah),
+    hanya baris baru yang dihitung, memakai periode terakhir setiap kategori sebagai pembanding.
+    """
+    spec = TIME_SERIES[slug]
+    time_col, group_col = spec["time"], spec["group"]
+    if df.empty or time_col not in df.columns:
+        return pd.DataFrame()
+
+    hashes = _row_hashes(df)
+    with _indicator_lock:
+        cached = _indicator_cache.get(slug)
+
+    if cached is not None and np.array_equal(cached["hashes"], hashes):
+        return cached["result"]
+
+    n_old = 0 if cached is None else len(cached["hashes"])
+    # Periode berupa teks (mis. tanggal yang tidak bisa dikonversi) tidak bisa dibandingkan dengan aman
+    time_is_ordered = pd.api.types.is_numeric_dtype(df[time_col]) or pd.api.types.is_datetime64_any_dtype(df[time_col])
+    appended = (
+        time_is_ordered and cached is not None and 0 < n_old < len(hashes)
+        and np.array_equal(cached["hashes"], hashes[:n_old])
+        and df[time_col].iloc[n_old:].min() > cached["last_time"]
+    )
+    if appended:
+        old_rows = df.iloc[:n_old]
+        # Pembanding: baris periode terakhir setiap kategori dari data lama
+        context = old_rows.groupby(group_col, sort=False).tail(1) if group_col else old_rows.tail(1)
+        new_result = period_growth(df.iloc[n_old:], time_col, spec["values"], group_col, spec["ratios"], context)
+        result = pd.concat([cached["result"], new_result])
+    else:
+        result = period_growth(df, time_col, spec["values"], group_col, spec["ratios"])
+
+    with _indicator_lock:
+        _indicator_cache[slug] = {"hashes": hashes, "result": result, "last_time": df[time_col].max()}
+    return result
+
+
+def get_indicators(slug: str) -> pd.DataFrame:
+    """Indikator pertumbuhan (per periode) untuk worksheet di TIME_SERIES."""
+    return compute_indicators(slug, TIME_SERIES[slug]["loader"]())
+
+
+def latest_period(indicators: pd.DataFrame, time_col: str) -> pd.DataFrame:
+    """Baris indikator pada periode terakhir."""
+    if indicators.empty:
+        return indicators
+    return indicators[indicators[time_col] == indicators[time_col].max()]
+
+
+def rw_indicators() -> pd.DataFrame:
+    """Rasio jenis kelamin dan rata-rata anggota keluarga per RW (dari cube agregat RW/RT)."""
+    return get_rw_cube()["rw"][["Jumlah_Penduduk", "Jumlah_KK", "Rasio_JK", "Rata_Anggota_KK"]]
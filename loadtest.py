@@ -0,0 +1,209 @@
+"""
+Uji beban: banyak sesi pengguna bersamaan dalam SATU proses Streamlit, dengan data sintetis
+(lihat synthetic_data.py) sehingga Google Sheets tidak diakses.
+
+Setiap sesi adalah AppTest yang menjalankan main.py; sesi memilih halaman bergiliran
+(sesi ke-i mulai dari halaman ke-i) sehingga beban tersebar ke seluruh halaman. Semua sesi
+berbagi st.cache_data dan modul yang sama, seperti sesi-sesi browser pada satu server.
+
+    python loadtest.py --sessions 8 --iterations 5
+    python loadtest.py --sessions 20 --pages Home --rows 10000 --output loadtest_hasil
+
+Laporan:
+    throughput               render per detik selama fase beban
+    p50/p95/p99              latensi render (detik), total dan per halaman
+    memory_per_session_bytes pertambahan memori (tracemalloc) per sesi yang tetap hidup, setelah cache terisi
+    peak_rss_bytes           puncak RSS proses
+"""
+import argparse
+import datetime
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+PAGE_STATE_KEY = "_loadtest_halaman" # Halaman yang "diklik" sesi ini (menggantikan option_menu)
+
+# Halaman yang memuat data; halaman tautan statis (Peta, Profil, dst.) tidak berarti untuk uji beban
+PAGES = ['Home', 'Jumlah Penduduk', 'Jumlah Penduduk (Pendidikan)', 'Jenis Pekerjaan Dominan', 'Jenis Tanah',
+         'Jumlah Industri UMKM', 'Jumlah KK Menurut RW', 'Jumlah Penduduk (Status Pekerja)', 'Penduduk Disabilitas',
+         'Penduduk Menurut Jenis Kelamin', 'Sarana dan Prasarana', 'Sarana Kebersihan', 'Tenaga Kerja',
+         'Unduh Semua Data']
+
+
+def _install_page_selector():
+    """
+    option_menu adalah komponen kustom yang tidak bisa diklik lewat AppTest; diganti dengan fungsi
+    yang membaca pilihan halaman dari session_state sesi yang sedang berjalan.
+    """
+    import streamlit as st
+    import streamlit_option_menu
+
+    def option_menu(menu_title, options, default_index=0, **kwargs):
+        return st.session_state.get(PAGE_STATE_KEY, options[default_index])
+
+    streamlit_option_menu.option_menu = option_menu
+
+
+def percentile(values, q: float):
+    """Persentil (interpolasi linear), q dalam 0-100."""
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def summarize(latencies) -> dict:
+    return {"count": len(latencies), **{f"p{q}": round(percentile(latencies, q), 4) for q in (50, 95, 99)},
+            "max": round(max(latencies), 4)} if latencies else {"count": 0}
+
+
+def render(page: str, timeout: float, app=None):
+    """Satu render halaman; mengembalikan (AppTest, detik, pesan galat atau None)."""
+    from streamlit.testing.v1 import AppTest
+
+    if app is None:
+        app = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+    app.session_state[PAGE_STATE_KEY] = page
+    started = time.perf_counter()
+    try:
+        app.run()
+    except Exception as e: # Termasuk RuntimeError jika render melewati batas waktu
+        return app, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - started
+    errors = [str(el.value) for el in app.exception] + [str(el.value) for el in app.error]
+    return app, elapsed, (errors[0][:300] if errors else None)
+
+
+def run_session(index: int, pages, iterations: int, timeout: float, barrier: threading.Barrier) -> list:
+    """Satu sesi pengguna: `iterations` kali memilih halaman bergiliran. Mengembalikan daftar hasil render."""
+    barrier.wait() # Semua sesi mulai bersamaan
+    app, results = None, []
+    for i in range(iterations):
+        page = pages[(index + i) % len(pages)]
+        app, seconds, error = render(page, timeout, app)
+        results.append({"session": index, "page": page, "seconds": seconds, "error": error})
+    return results
+
+
+def measure_session_memory(sessions: int, page: str, timeout: float) -> int:
+    """Rata-rata pertambahan memori per sesi yang tetap hidup (cache data sudah terisi sebelumnya)."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        apps = [render(page, timeout)[0] for _ in range(sessions)]
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del apps
+    return max(0, (current - baseline) // sessions)
+
+
+def run_load_test(sessions: int, iterations: int, pages, rows: int, timeout: float, seed: int = 0) -> dict:
+    from synthetic_data import generate_all, install_fake_source
+
+    install_fake_source(generate_all(rows, seed))
+    _install_page_selector()
+
+    # Pemanasan: setiap halaman dirender sekali agar cache terisi (diukur terpisah sebagai cold start)
+    cold = {}
+    for page in pages:
+        _, seconds, error = render(page, timeout)
+        cold[page] = round(seconds, 4)
+        if error:
+            print(f"[galat] {page} (pemanasan): {error}", file=sys.stderr)
+
+    barrier = threading.Barrier(sessions)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, i, pages, iterations, timeout, barrier) for i in range(sessions)]
+        results = [result for future in futures for result in future.result()]
+    wall = time.perf_counter() - started
+
+    ok = [r for r in results if r["error"] is None]
+    per_page = {page: summarize([r["seconds"] for r in ok if r["page"] == page]) for page in pages}
+    errors = [r for r in results if r["error"] is not None]
+    return {
+        "sessions": sessions, "iterations": iterations, "rows": rows, "pages": list(pages),
+        "wall_seconds": round(wall, 3),
+        "renders": len(results), "errors": len(errors),
+        "throughput_per_second": round(len(ok) / wall, 3) if wall else None,
+        "latency": summarize([r["seconds"] for r in ok]),
+        "latency_per_page": per_page,
+        "cold_start_seconds": cold,
+        "memory_per_session_bytes": measure_session_memory(sessions, pages[0], timeout),
+        # ru_maxrss dalam KiB di Linux
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "error_samples": [{"page": r["page"], "error": r["error"]} for r in errors[:10]],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban sesi bersamaan dashboard kelurahan (data sintetis).")
+    parser.add_argument("--sessions", type=int, default=8, help="jumlah sesi bersamaan (default: 8)")
+    parser.add_argument("--iterations", type=int, default=5, help="jumlah pilihan halaman per sesi (default: 5)")
+    parser.add_argument("--pages", default=None, help="nama halaman dipisah koma (default: semua halaman data)")
+    parser.add_argument("--rows", type=int, default=100, help="jumlah baris per worksheet sintetis (default: 100)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="batas waktu satu render (detik)")
+    parser.add_argument("--seed", type=int, default=0, help="seed data sintetis")
+    parser.add_argument("--output", default=None, help="folder laporan JSON (default: hanya dicetak)")
+    args = parser.parse_args(argv)
+
+    if args.pages:
+        args.pages = [page.strip() for page in args.pages.split(",") if page.strip()]
+        unknown = [page for page in args.pages if page not in PAGES]
+        if unknown:
+            parser.error(f"halaman tidak dikenal: {', '.join(unknown)}")
+    else:
+        args.pages = PAGES
+    if args.sessions < 1 or args.iterations < 1 or args.rows < 1:
+        parser.error("--sessions, --iterations dan --rows minimal 1")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Snapshot versi data sintetis tidak boleh bercampur dengan snapshot data asli
+    snapshot_dir = tempfile.mkdtemp(prefix="loadtest_snapshots_")
+    os.environ["SNAPSHOT_DIR"] = snapshot_dir
+
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    started = datetime.datetime.now()
+    try:
+        report = run_load_test(args.sessions, args.iterations, args.pages, args.rows, args.timeout, args.seed)
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    report = {"generated_at": started.isoformat(timespec="seconds"), **report}
+
+    latency = report["latency"]
+    print(f"{report['renders']} render oleh {args.sessions} sesi dalam {report['wall_seconds']:.1f} s "
+          f"({report['throughput_per_second']:.2f} render/s, {report['errors']} galat)")
+    if latency["count"]:
+        print(f"Latensi p50 {latency['p50']:.3f} s | p95 {latency['p95']:.3f} s | p99 {latency['p99']:.3f} s")
+    print(f"Memori per sesi ~{report['memory_per_session_bytes'] / 1024:.0f} KiB | "
+          f"puncak RSS {report['peak_rss_bytes'] / 1024 / 1024:.0f} MiB")
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        path = os.path.join(args.output, f"{started:%Y%m%d-%H%M%S}_{args.sessions}sesi.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Laporan: {path}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
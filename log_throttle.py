@@ -0,0 +1,27 @@
+"""
+Peringatan log yang dibatasi lajunya: peringatan sejenis yang berulang (mis. setiap render atau setiap
+batch) hanya ditulis sekali per WARNING_INTERVAL, ditambah jumlah peringatan yang dilewati sejak itu.
+"""
+import logging
+import threading
+import time
+
+WARNING_INTERVAL = 60 # detik
+
+_warnings = {} # (nama logger, jenis) -> (waktu terakhir ditulis, jumlah yang dilewati sejak itu)
+_warnings_lock = threading.Lock()
+
+
+def warn_throttled(logger: logging.Logger, kind, message: str, *args, interval: float = WARNING_INTERVAL):
+    """Menulis logger.warning(message, *args), paling banyak sekali per `interval` detik untuk setiap jenis."""
+    now = time.monotonic()
+    key = (logger.name, kind)
+    with _warnings_lock:
+        last, skipped = _warnings.get(key, (None, 0))
+        if last is not None and now - last < interval:
+            _warnings[key] = (last, skipped + 1)
+            return
+        _warnings[key] = (now, 0)
+    if skipped:
+        message += f" ({skipped} peringatan serupa dilewati)"
+    logger.warning(message, *args)
@@ -43,15 +43,32 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-from pages import home, jumlah_penduduk, jumlah_penduduk_pendidikan, jenis_pekerjaan_dominan, jenis_tanah, jumlah_industri_umkm, jumlah_kk_menurut_rw, jumlah_penduduk_status_pekerja, penduduk_disabilitas, penduduk_menurut_jenis_kelamin, sarana_dan_prasarana, sarana_kebersihan, tenaga_kerja, admin
-from data_loader import GOOGLE_SHEET_URL
+from pages import home, jumlah_penduduk, jumlah_penduduk_pendidikan, jenis_pekerjaan_dominan, jenis_tanah, jumlah_industri_umkm, jumlah_kk_menurut_rw, jumlah_penduduk_status_pekerja, penduduk_disabilitas, penduduk_menurut_jenis_kelamin, sarana_dan_prasarana, sarana_kebersihan, tenaga_kerja, unduh_semua_data, admin
+from profiler import start_page_profile, show_profile
+from memory_accounting import enforce_budgets
+from payload import start_payload_meter, show_payload
+
+# API data baca-saja (opsional), berjalan di thread latar proses Streamlit ini
+if os.environ.get("DATA_API_PORT"):
+    from data_api import DEFAULT_HOST, start_in_background
+    start_in_background(host=os.environ.get("DATA_API_HOST", DEFAULT_HOST), port=int(os.environ["DATA_API_PORT"]))
+
+# Metrik Prometheus (opsional): cache hit/miss, lama fetch, dan umur data per worksheet
+if os.environ.get("METRICS_PORT"):
+    import metrics
+    metrics.start_in_background(port=int(os.environ["METRICS_PORT"]))
+
+# Log render/loader lambat (JSON Lines) dengan rincian waktu per tahap
+if os.environ.get("SLOW_LOG_FILE"):
+    import slow_log
+    slow_log.install()
 
 with st.sidebar:
     st.title("SIGEMA")
     selected = option_menu(
         menu_title=None, 
-        options=['Home', 'Jumlah Penduduk', 'Jumlah Penduduk (Pendidikan)', 'Jenis Pekerjaan Dominan', 'Jenis Tanah', 'Jumlah Industri UMKM', 'Jumlah KK Menurut RW', 'Jumlah Penduduk (Status Pekerja)', 'Penduduk Disabilitas', 'Penduduk Menurut Jenis Kelamin', 'Sarana dan Prasarana', 'Sarana Kebersihan', 'Tenaga Kerja', 'Peta', 'Admin', 'Infografis & Monografi', 'Profil Kelurahan', 'Meta Data'],
-        icons=['house', 'graph-up', 'mortarboard', 'person-workspace', 'map', 'building', 'people', 'person-badge', 'universal-access', 'person-fill-gear', 'hospital', 'trash', 'briefcase', 'geo-alt-fill', 'gear', 'images', 'person-lines-fill', 'journal-text'],
+        options=['Home', 'Jumlah Penduduk', 'Jumlah Penduduk (Pendidikan)', 'Jenis Pekerjaan Dominan', 'Jenis Tanah', 'Jumlah Industri UMKM', 'Jumlah KK Menurut RW', 'Jumlah Penduduk (Status Pekerja)', 'Penduduk Disabilitas', 'Penduduk Menurut Jenis Kelamin', 'Sarana dan Prasarana', 'Sarana Kebersihan', 'Tenaga Kerja', 'Unduh Semua Data', 'Peta', 'Admin', 'Infografis & Monografi', 'Profil Kelurahan', 'Meta Data'],
+        icons=['house', 'graph-up', 'mortarboard', 'person-workspace', 'map', 'building', 'people', 'person-badge', 'universal-access', 'person-fill-gear', 'hospital', 'trash', 'briefcase', 'cloud-download', 'geo-alt-fill', 'gear', 'images', 'person-lines-fill', 'journal-text'],
         menu_icon="cast",
         default_index=0,
         styles={
@@ -64,43 +81,57 @@ with st.sidebar:
     
     
 
-if selected == 'Home': home.run()
-elif selected == 'Jumlah Penduduk': jumlah_penduduk.run()
-elif selected == 'Jumlah Penduduk (Pendidikan)': jumlah_penduduk_pendidikan.run()
-elif selected == 'Jenis Pekerjaan Dominan': jenis_pekerjaan_dominan.run()
-elif selected == 'Jenis Tanah': jenis_tanah.run()
-elif selected == 'Jumlah Industri UMKM': jumlah_industri_umkm.run()
-elif selected == 'Jumlah KK Menurut RW': jumlah_kk_menurut_rw.run()
-elif selected == 'Jumlah Penduduk (Status Pekerja)': jumlah_penduduk_status_pekerja.run()
-elif selected == 'Penduduk Disabilitas': penduduk_disabilitas.run()
-elif selected == 'Penduduk Menurut Jenis Kelamin': penduduk_menurut_jenis_kelamin.run()
-elif selected == 'Sarana dan Prasarana': sarana_dan_prasarana.run()
-elif selected == 'Sarana Kebersihan': sarana_kebersihan.run()
-elif selected == 'Tenaga Kerja': tenaga_kerja.run()
-elif selected == 'Admin':
-    st.title("🔑 Akses Admin")
-    st.write("Klik tombol di bawah untuk membuka dan mengedit database di Google Sheets:")
-    st.markdown(f'<a href="{GOOGLE_SHEET_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Google Sheet</button></a>', unsafe_allow_html=True)
-    st.info("Pastikan Anda sudah login ke akun Google yang memiliki akses edit ke spreadsheet ini.")
-# <<< DIUBAH: Mengembalikan logika untuk menu Peta >>>
-elif selected == 'Peta':
-    st.title("🗺️ Peta Geospasial")
-    st.write("Klik tombol di bawah untuk membuka peta interaktif kelurahan:")
-    # Ganti URL ini dengan URL Google Earth Anda yang benar
-    PETA_URL = "https://earth.google.com/earth/d/17GwLPOj3Yh1kg8KS_sBaGdHtlp10Dc-k?usp=sharing"
-    st.markdown(f'<a href="{PETA_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Peta</button></a>', unsafe_allow_html=True)
-elif selected == 'Infografis & Monografi':
-    st.title("INFOGRAFIS & MONOGRAFI")
-    st.write("Klik tombol di bawah untuk membuka Infografis dan monografi kelurahan:")
-    INFOGRAFIS_URL = "https://kelkubumarapalam.my.canva.site/dagv8o5tcz8"
-    st.markdown(f'<a href="{INFOGRAFIS_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Infografis dan monografi</button></a>', unsafe_allow_html=True)
-elif selected == 'Profil Kelurahan':
-    st.title("Profil Kelurahan")
-    st.write("Klik tombol di bawah untuk membuka Profil kelurahan:")
-    PROFIL_URL = "https://drive.google.com/drive/folders/1YXKb_3bCBtjo1fd2KFJBv0cCoQ0UhqzL?usp=drive_link"
-    st.markdown(f'<a href="{PROFIL_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Profil</button></a>', unsafe_allow_html=True)
-elif selected == 'Meta Data':
-    st.title("Meta Data")
-    st.write("Klik tombol di bawah untuk membuka Meta Data:")
-    META_DATA = "https://drive.google.com/drive/folders/1BpNKGhj0pqWiu0ahK3XLbSGrJh-CRv5u?usp=sharing"
-    st.markdown(f'<a href="{META_DATA}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Meta Data</button></a>', unsafe_allow_html=True)
\ No newline at end of file
+# Mode profil khusus admin (?profil=<token>): mengukur render halaman yang dipilih
+profil_halaman = start_page_profile(selected)
+# Ukuran data yang dikirim ke browser untuk halaman ini (rincian: ?payload=1)
+payload_halaman = start_payload_meter(selected)
+
+try:
+    if selected == 'Home': home.run()
+    elif selected == 'Jumlah Penduduk': jumlah_penduduk.run()
+    elif selected == 'Jumlah Penduduk (Pendidikan)': jumlah_penduduk_pendidikan.run()
+    elif selected == 'Jenis Pekerjaan Dominan': jenis_pekerjaan_dominan.run()
+    elif selected == 'Jenis Tanah': jenis_tanah.run()
+    elif selected == 'Jumlah Industri UMKM': jumlah_industri_umkm.run()
+    elif selected == 'Jumlah KK Menurut RW': jumlah_kk_menurut_rw.run()
+    elif selected == 'Jumlah Penduduk (Status Pekerja)': jumlah_penduduk_status_pekerja.run()
+    elif selected == 'Penduduk Disabilitas': penduduk_disabilitas.run()
+    elif selected == 'Penduduk Menurut Jenis Kelamin': penduduk_menurut_jenis_kelamin.run()
+    elif selected == 'Sarana dan Prasarana': sarana_dan_prasarana.run()
+    elif selected == 'Sarana Kebersihan': sarana_kebersihan.run()
+    elif selected == 'Tenaga Kerja': tenaga_kerja.run()
+    elif selected == 'Unduh Semua Data': unduh_semua_data.run()
+    elif selected == 'Admin': admin.run()
+    # <<< DIUBAH: Mengembalikan logika untuk menu Peta >>>
+    elif selected == 'Peta':
+        st.title("🗺️ Peta Geospasial")
+        st.write("Klik tombol di bawah untuk membuka peta interaktif kelurahan:")
+        # Ganti URL ini dengan URL Google Earth Anda yang benar
+        PETA_URL = "https://earth.google.com/earth/d/17GwLPOj3Yh1kg8KS_sBaGdHtlp10Dc-k?usp=sharing"
+        st.markdown(f'<a href="{PETA_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Peta</button></a>', unsafe_allow_html=True)
+    elif selected == 'Infografis & Monografi':
+        st.title("INFOGRAFIS & MONOGRAFI")
+        st.write("Klik tombol di bawah untuk membuka Infografis dan monografi kelurahan:")
+        INFOGRAFIS_URL = "https://kelkubumarapalam.my.canva.site/dagv8o5tcz8"
+        st.markdown(f'<a href="{INFOGRAFIS_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Infografis dan monografi</button></a>', unsafe_allow_html=True)
+    elif selected == 'Profil Kelurahan':
+        st.title("Profil Kelurahan")
+        st.write("Klik tombol di bawah untuk membuka Profil kelurahan:")
+        PROFIL_URL = "https://drive.google.com/drive/folders/1YXKb_3bCBtjo1fd2KFJBv0cCoQ0UhqzL?usp=drive_link"
+        st.markdown(f'<a href="{PROFIL_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Profil</button></a>', unsafe_allow_html=True)
+    elif selected == 'Meta Data':
+        st.title("Meta Data")
+        st.write("Klik tombol di bawah untuk membuka Meta Data:")
+        META_DATA = "https://drive.google.com/drive/folders/1BpNKGhj0pqWiu0ahK3XLbSGrJh-CRv5u?usp=sharing"
+        st.markdown(f'<a href="{META_DATA}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Meta Data</button></a>', unsafe_allow_html=True)
+finally:
+    # Profil dan pengukur payload selalu dihentikan, juga jika halaman galat atau memanggil st.rerun()/st.stop()
+    hasil_payload = payload_halaman.finish()
+    hasil_profil = profil_halaman.finish() if profil_halaman is not None else None
+
+show_payload(hasil_payload)
+if hasil_profil is not None:
+    show_profile(hasil_profil)
+
+# Batas memori cache dan session_state (MEMORY_CACHE_BUDGET_MB / MEMORY_SESSION_BUDGET_MB)
+enforce_budgets()
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Pencatatan memori per cache dan per sesi, serta batas memori dengan pengosongan (eviction).
+
+Yang dihitung:
+    st.cache_data      ukuran hasil load_*_gsheet() yang disimpan Streamlit (pickle, per fungsi)
+    cache aplikasi     cache LRU modul (file ekspor, indeks tabel, respons API) yang didaftarkan lewat register_cache()
+    media              file unduhan/gambar yang disimpan Streamlit untuk sesi yang aktif
+    session_state      ukuran isi st.session_state setiap sesi
+
+Batas (variabel lingkungan, dalam MiB; kosong/0 = tanpa batas):
+    MEMORY_CACHE_BUDGET_MB    total st.cache_data + cache aplikasi. Jika terlewati, entri paling lama dari
+                              cache terbesar dikosongkan dulu; cache loader terbesar dikosongkan jika perlu
+                              (data dibaca ulang dari Google Sheets saat dibutuhkan).
+    MEMORY_SESSION_BUDGET_MB  isi session_state satu sesi. Jika terlewati, nilai besar (>= 64 KiB) dihapus
+                              dari yang terbesar; halaman membuat ulang nilai tersebut jika diperlukan.
+
+enforce_budgets() dipanggil main.py di akhir setiap render.
+"""
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MIB = 1024 * 1024
+SESSION_EVICT_MIN_BYTES = 64 * 1024 # Nilai session_state yang lebih kecil tidak pernah dihapus
+TOP_N = 20
+
+_caches = OrderedDict() # nama -> (OrderedDict LRU, lock)
+_entry_sizes = {} # (nama cache, kunci) -> ukuran; isi entri tidak pernah diubah setelah disimpan
+_sizes_lock = threading.Lock()
+_logger = logging.getLogger(__name__)
+
+
+def _budget_bytes(env_name: str):
+    try:
+        value = float(os.environ.get(env_name, "") or 0)
+    except ValueError:
+        return None
+    return int(value * MIB) if value > 0 else None
+
+
+def cache_budget_bytes():
+    return _budget_bytes("MEMORY_CACHE_BUDGET_MB")
+
+
+def session_budget_bytes():
+    return _budget_bytes("MEMORY_SESSION_BUDGET_MB")
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Perkiraan ukuran memori sebuah objek beserta isinya (DataFrame, array, bytes, dict/list bersarang)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    return size
+
+
+def register_cache(name: str, cache: OrderedDict, lock: threading.Lock):
+    """Mendaftarkan cache LRU modul (OrderedDict, entri lama di depan) agar ikut dihitung dan dibatasi."""
+    _caches[name] = (cache, lock)
+
+
+def _describe(key) -> str:
+    text = " / ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+    return text if len(text) <= 120 else text[:117] + "..."
+
+
+def _entry_size(name: str, key, value) -> int:
+    with _sizes_lock:
+        size = _entry_sizes.get((name, key))
+    if size is None:
+        size = deep_sizeof(value)
+        with _sizes_lock:
+            _entry_sizes[(name, key)] = size
+    return size
+
+
+def app_cache_entries() -> list:
+    """Entri cache aplikasi: {kategori, cache, entri, bytes}, urut dari yang paling lama dipakai."""
+    entries = []
+    for name, (cache, lock) in _caches.items():
+        with lock:
+            items = list(cache.items())
+        for key, value in items:
+            entries.append({"kategori": "cache aplikasi", "cache": name, "entri": _describe(key),
+                            "bytes": _entry_size(name, key, value), "_key": key})
+    with _sizes_lock: # Ukuran entri yang sudah tidak ada di cache tidak perlu diingat lagi
+        live = {(e["cache"], e["_key"]) for e in entries}
+        for stale in [k for k in _entry_sizes if k not in live]:
+            del _entry_sizes[stale]
+    return entries
+
+
+def _streamlit_stats() -> list:
+    """CacheStat Streamlit (st.cache_data, st.cache_resource, dan media jika server berjalan)."""
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+
+    stats = []
+    for provider in (get_data_cache_stats_provider(), get_resource_cache_stats_provider()):
+        stats.extend(stat for family in provider.get_stats().values() for stat in family)
+    if Runtime.exists(): # File media hanya tercatat di stats_mgr server
+        stats.extend(stat for family in Runtime.instance().stats_mgr.get_stats().values() for stat in family
+                     if stat.category_name == "st_memory_media_file_storage")
+    return stats
+
+
+def streamlit_cache_entries() -> list:
+    categories = {"st_cache_data": "st.cache_data", "st_cache_resource": "st.cache_resource",
+                  "st_memory_media_file_storage": "media"}
+    entries = []
+    for stat in _streamlit_stats():
+        if stat.category_name in categories:
+            # Streamlit menjumlahkan ukuran per fungsi, bukan per argumen
+            entries.append({"kategori": categories[stat.category_name], "cache": stat.cache_name or "-",
+                            "entri": "-", "bytes": int(stat.byte_length)})
+    return entries
+
+
+def _session_states() -> dict:
+    """{id sesi: dict isi session_state} untuk seluruh sesi aktif; tanpa server hanya sesi saat ini."""
+    from streamlit.runtime import Runtime
+
+    states = {}
+    if Runtime.exists():
+        try:
+            # SessionManager tidak punya API publik di Runtime; jika berubah, cukup sesi saat ini
+            for info in Runtime.instance()._session_mgr.list_active_sessions():
+                states[info.session.id] = dict(info.session.session_state.filtered_state)
+        except AttributeError:
+            states = {}
+    if not states:
+        ctx = _script_context()
+        if ctx is not None:
+            states[ctx.session_id] = st.session_state.to_dict()
+    return states
+
+
+def _script_context():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def session_entries() -> list:
+    """Isi session_state per sesi: {sesi, kunci, bytes}."""
+    entries = []
+    for session_id, state in _session_states().items():
+        for key, value in state.items():
+            entries.append({"sesi": session_id[:8], "kunci": str(key), "bytes": deep_sizeof(value)})
+    return entries
+
+
+def memory_report() -> dict:
+    """Ringkasan memori: entri cache, ukuran per sesi, dan objek terbesar."""
+    caches = streamlit_cache_entries() + app_cache_entries()
+    sessions = session_entries()
+
+    df_cache = pd.DataFrame([{k: v for k, v in e.items() if k != "_key"} for e in caches],
+                            columns=["kategori", "cache", "entri", "bytes"])
+    df_session = pd.DataFrame(sessions, columns=["sesi", "kunci", "bytes"])
+    per_session = (df_session.groupby("sesi", as_index=False)
+                   .agg(kunci=("kunci", "count"), bytes=("bytes", "sum"))
+                   .sort_values("bytes", ascending=False))
+    largest = pd.concat([
+        df_cache.assign(objek=df_cache["cache"].where(df_cache["entri"] == "-", df_cache["cache"] + " : " + df_cache["entri"]))[
+            ["kategori", "objek", "bytes"]],
+        df_session.assign(kategori="session_state", objek=df_session["sesi"] + " : " + df_session["kunci"])[
+            ["kategori", "objek", "bytes"]],
+    ], ignore_index=True).sort_values("bytes", ascending=False).head(TOP_N)
+
+    budgeted = df_cache[df_cache["kategori"].isin(["st.cache_data", "cache aplikasi"])]
+    return {
+        "caches": df_cache.sort_values("bytes", ascending=False),
+        "sessions": per_session,
+        "largest": largest,
+        "cache_total_bytes": int(budgeted["bytes"].sum()),
+        "media_total_bytes": int(df_cache.loc[df_cache["kategori"] == "media", "bytes"].sum()),
+        "session_total_bytes": int(df_session["bytes"].sum()),
+        "cache_budget_bytes": cache_budget_bytes(),
+        "session_budget_bytes": session_budget_bytes(),
+    }
+
+
+def _loader_functions() -> dict:
+    """Nama tampilan st.cache_data ('modul.fungsi') -> loader yang bisa di-clear()."""
+    from datasets import DATASETS
+    return {f"{d['loader'].__module__}.{d['loader'].__qualname__}": d["loader"] for d in DATASETS}
+
+
+def enforce_cache_budget(budget: int = None) -> list:
+    """
+    Mengosongkan cache sampai total st.cache_data + cache aplikasi <= budget.
+    Mengembalikan daftar yang dikosongkan (untuk log).
+    """
+    budget = cache_budget_bytes() if budget is None else budget
+    if budget is None:
+        return []
+    evicted = []
+    loaders = None
+    while True:
+        app_entries = app_cache_entries()
+        data_entries = [e for e in streamlit_cache_entries() if e["kategori"] == "st.cache_data"]
+        total = sum(e["bytes"] for e in app_entries) + sum(e["bytes"] for e in data_entries)
+        if total <= budget:
+            return evicted
+
+        # Cache aplikasi terbesar kehilangan entri paling lamanya; hasilnya murah dibuat ulang
+        per_cache = {}
+        for e in app_entries:
+            per_cache.setdefault(e["cache"], []).append(e)
+        if per_cache:
+            name = max(per_cache, key=lambda n: sum(e["bytes"] for e in per_cache[n]))
+            oldest = per_cache[name][0]
+            cache, lock = _caches[name]
+            with lock:
+                cache.pop(oldest["_key"], None)
+            evicted.append(f"{name}: {oldest['entri']}")
+            continue
+
+        # Tinggal st.cache_data: loader terbesar dikosongkan (dibaca ulang dari Google Sheets saat diminta)
+        loaders = loaders if loaders is not None else _loader_functions()
+        candidates = sorted((e for e in data_entries if e["cache"] in loaders), key=lambda e: e["bytes"], reverse=True)
+        if not candidates:
+            return evicted
+        loaders.pop(candidates[0]["cache"]).clear()
+        evicted.append(f"st.cache_data: {candidates[0]['cache']}")
+
+
+def enforce_session_budget(budget: int = None) -> list:
+    """Menghapus nilai besar dari session_state sesi saat ini sampai ukurannya <= budget."""
+    budget = session_budget_bytes() if budget is None else budget
+    if budget is None or _script_context() is None:
+        return []
+    sizes = {key: deep_sizeof(value) for key, value in st.session_state.to_dict().items()}
+    total = sum(sizes.values())
+    evicted = []
+    for key, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        if total <= budget or size < SESSION_EVICT_MIN_BYTES:
+            break
+        del st.session_state[key]
+        total -= size
+        evicted.append(key)
+    return evicted
+
+
+def enforce_budgets():
+    """Menerapkan kedua batas memori; yang dikosongkan dicatat ke log."""
+    for label, evicted in (("cache", enforce_cache_budget()), ("session_state", enforce_session_budget())):
+        if evicted:
+            _logger.warning("Batas memori %s terlewati, dikosongkan: %s", label, ", ".join(map(str, evicted)))
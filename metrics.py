@@ -0,0 +1,286 @@
+"""
+Metrik cache dan kesegaran data dalam format teks Prometheus.
+
+Metrik per worksheet:
+    sigema_cache_requests_total{worksheet,result}      pemanggilan load_*_gsheet(): hit (dari st.cache_data) / miss
+    sigema_fetch_duration_seconds{worksheet}           histogram lama conn.read
+    sigema_fetch_errors_total{worksheet}               pembacaan Google Sheet yang gagal
+    sigema_fetch_bytes_total{worksheet}                ukuran data yang diterima (estimasi: memori DataFrame hasil baca)
+    sigema_cached_frame_bytes{worksheet}               memori DataFrame bersih yang disimpan cache
+    sigema_last_refresh_timestamp_seconds{worksheet}   waktu (Unix) pemuatan ulang terakhir yang berhasil
+    sigema_data_age_seconds{worksheet}                 umur data yang sedang disajikan
+
+Metrik per halaman:
+    sigema_page_payload_bytes{page}                    ukuran data render terakhir yang dikirim ke browser
+    sigema_page_payload_over_budget_total{page}        render yang melewati batas payload (lihat payload.py)
+
+Metrik kuota Google Sheets (lihat sheets_quota.py):
+    sigema_sheets_requests_total{kind,priority}        permintaan read/write menurut prioritas (interaktif/latar)
+    sigema_sheets_throttle_wait_seconds_total{kind,priority}  total waktu menunggu jatah kuota
+    sigema_sheets_quota_errors_total{kind}             permintaan yang tetap ditolak Google karena kuota
+    sigema_sheets_coalesced_total{kind}                pembacaan yang digabung dengan pembacaan sama yang sedang berjalan
+
+Metrik dikumpulkan di dalam proses Streamlit, jadi server /metrics dijalankan di thread latar
+proses yang sama oleh main.py jika METRICS_PORT diisi.
+"""
+import bisect
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from tracing import span
+
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+_cache_requests = defaultdict(int) # (worksheet, "hit"/"miss") -> jumlah
+_fetch_buckets = defaultdict(lambda: [0] * (len(FETCH_BUCKETS) + 1)) # worksheet -> jumlah per bucket (+Inf terakhir)
+_fetch_sum = defaultdict(float)
+_fetch_errors = defaultdict(int)
+_fetch_bytes = defaultdict(int)
+_frame_bytes = {}
+_last_refresh = {}
+_generations = defaultdict(int) # worksheet -> berapa kali loader benar-benar dijalankan (versi data murah)
+_page_payload = {}
+_payload_over_budget = defaultdict(int)
+_sheets_requests = defaultdict(int) # (read/write, prioritas) -> jumlah
+_sheets_wait = defaultdict(float)
+_sheets_quota_errors = defaultdict(int)
+_sheets_coalesced = defaultdict(int)
+
+# Ditandai oleh loader saat benar-benar dijalankan (cache miss) dan oleh observe_fetch saat worksheet
+# benar-benar dibaca dari Google Sheets, di thread yang sama dengan pemanggilnya
+_thread_state = threading.local()
+
+_logger = logging.getLogger(__name__)
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def observe_fetch(worksheet: str, seconds: float, df: pd.DataFrame = None, error: bool = False):
+    """Mencatat satu pembacaan worksheet dari Google Sheets."""
+    fetched = getattr(_thread_state, "fetched", None)
+    if fetched is not None:
+        fetched.add(worksheet)
+    with _lock:
+        _fetch_buckets[worksheet][bisect.bisect_left(FETCH_BUCKETS, seconds)] += 1
+        _fetch_sum[worksheet] += seconds
+        if error:
+            _fetch_errors[worksheet] += 1
+        elif df is not None:
+            _fetch_bytes[worksheet] += frame_bytes(df)
+
+
+def observe_payload(page: str, size: int, over_budget: bool):
+    """Mencatat ukuran payload satu render halaman."""
+    with _lock:
+        _page_payload[page] = size
+        if over_budget:
+            _payload_over_budget[page] += 1
+
+
+def observe_sheets_request(kind: str, priority: str, waited: float, quota_error: bool = False):
+    """Mencatat satu permintaan ke Google Sheets yang melewati pembatas kuota (lihat sheets_quota.py)."""
+    with _lock:
+        _sheets_requests[(kind, priority)] += 1
+        _sheets_wait[(kind, priority)] += waited
+        if quota_error:
+            _sheets_quota_errors[kind] += 1
+
+
+def observe_sheets_coalesced(kind: str):
+    """Mencatat pembacaan yang digabung dengan pembacaan sama yang sedang berjalan."""
+    with _lock:
+        _sheets_coalesced[kind] += 1
+
+
+def cache_metrics(worksheet: str):
+    """
+    Dekorator yang dipasang DI ATAS @st.cache_data: setiap pemanggilan dihitung sebagai hit,
+    kecuali jika fungsi aslinya benar-benar dijalankan (lihat refresh_metrics).
+
+    load_*_gsheet.version() mengembalikan versi data hasil pemanggilan terakhir di thread ini
+    (berubah setiap kali loader benar-benar dijalankan; None jika tidak pasti). Versi ini murah,
+    tanpa hash isi, dan dipakai sebagai kunci cache turunan (tabel SQL, indeks tabel).
+
+    Pemanggilan juga dicatat sebagai span "load" dengan atribut cache:
+        hit    hasil dari st.cache_data
+        miss   loader dijalankan dan worksheet dibaca dari Google Sheets
+        stale  loader dijalankan, tetapi data mentah masih dari cache load_data_from_gsheets (belum dibaca ulang)
+    """
+    def decorator(cached_fn):
+        @functools.wraps(cached_fn)
+        def wrapper(*args, **kwargs):
+            refreshed = getattr(_thread_state, "refreshed", None)
+            fetched = getattr(_thread_state, "fetched", None)
+            _thread_state.refreshed, _thread_state.fetched = set(), set()
+            with _lock:
+                generation_before = _generations[worksheet]
+            try:
+                with span("load", dataset=worksheet) as load_span:
+                    result = cached_fn(*args, **kwargs)
+                    outcome = "miss" if worksheet in _thread_state.refreshed else "hit"
+                    state = "stale" if outcome == "miss" and worksheet not in _thread_state.fetched else outcome
+                    load_span.set(cache=state, rows=len(result) if isinstance(result, pd.DataFrame) else None)
+            finally:
+                _thread_state.refreshed, _thread_state.fetched = refreshed, fetched
+            with _lock:
+                _cache_requests[(worksheet, outcome)] += 1
+                generation = _generations[worksheet]
+            # Jika sesi lain memuat ulang di tengah pemanggilan ini, versi hasilnya tidak pasti
+            versions = getattr(_thread_state, "versions", None)
+            if versions is None:
+                versions = _thread_state.versions = {}
+            expected = generation_before + (1 if outcome == "miss" else 0)
+            versions[worksheet] = f"{worksheet}#{generation}" if generation == expected else None
+            return result
+        wrapper.clear = cached_fn.clear # Tetap bisa mengosongkan cache: load_*_gsheet.clear()
+        wrapper.version = lambda: getattr(_thread_state, "versions", {}).get(worksheet)
+        return wrapper
+    return decorator
+
+
+def refresh_metrics(worksheet: str):
+    """Dekorator yang dipasang DI BAWAH @st.cache_data: mencatat memori dan waktu pemuatan ulang."""
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            df = loader(*args, **kwargs)
+            refreshed = getattr(_thread_state, "refreshed", None)
+            if refreshed is not None:
+                refreshed.add(worksheet)
+            with _lock:
+                _generations[worksheet] += 1
+            if isinstance(df, pd.DataFrame):
+                with _lock:
+                    _frame_bytes[worksheet] = frame_bytes(df)
+                    if not df.empty:
+                        _last_refresh[worksheet] = time.time()
+            return df
+        return wrapper
+    return decorator
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_metrics() -> str:
+    """Seluruh metrik dalam format teks Prometheus."""
+    now = time.time()
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    with _lock:
+        family("sigema_cache_requests_total", "counter", "Pemanggilan load_*_gsheet() menurut hasil cache.")
+        for (worksheet, outcome), count in sorted(_cache_requests.items()):
+            lines.append(f'sigema_cache_requests_total{{worksheet="{_label(worksheet)}",result="{outcome}"}} {count}')
+
+        family("sigema_fetch_duration_seconds", "histogram", "Lama membaca worksheet dari Google Sheets.")
+        for worksheet, buckets in sorted(_fetch_buckets.items()):
+            label = f'worksheet="{_label(worksheet)}"'
+            cumulative = 0
+            for bound, count in zip(FETCH_BUCKETS + (float("inf"),), buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'sigema_fetch_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"sigema_fetch_duration_seconds_sum{{{label}}} {_fetch_sum[worksheet]:.6f}")
+            lines.append(f"sigema_fetch_duration_seconds_count{{{label}}} {cumulative}")
+
+        family("sigema_fetch_errors_total", "counter", "Pembacaan worksheet yang gagal.")
+        for worksheet, count in sorted(_fetch_errors.items()):
+            lines.append(f'sigema_fetch_errors_total{{worksheet="{_label(worksheet)}"}} {count}')
+
+        family("sigema_fetch_bytes_total", "counter", "Ukuran data yang dibaca (estimasi dari memori DataFrame).")
+        for worksheet, count in sorted(_fetch_bytes.items()):
+            lines.append(f'sigema_fetch_bytes_total{{worksheet="{_label(worksheet)}"}} {count}')
+
+        family("sigema_cached_frame_bytes", "gauge", "Memori DataFrame bersih yang disimpan cache.")
+        for worksheet, size in sorted(_frame_bytes.items()):
+            lines.append(f'sigema_cached_frame_bytes{{worksheet="{_label(worksheet)}"}} {size}')
+
+        family("sigema_last_refresh_timestamp_seconds", "gauge", "Waktu pemuatan ulang terakhir yang berhasil (Unix).")
+        for worksheet, timestamp in sorted(_last_refresh.items()):
+            lines.append(f'sigema_last_refresh_timestamp_seconds{{worksheet="{_label(worksheet)}"}} {timestamp:.3f}')
+
+        family("sigema_data_age_seconds", "gauge", "Umur data yang sedang disajikan.")
+        for worksheet, timestamp in sorted(_last_refresh.items()):
+            lines.append(f'sigema_data_age_seconds{{worksheet="{_label(worksheet)}"}} {now - timestamp:.3f}')
+
+        family("sigema_page_payload_bytes", "gauge", "Ukuran data render halaman terakhir yang dikirim ke browser.")
+        for page, size in sorted(_page_payload.items()):
+            lines.append(f'sigema_page_payload_bytes{{page="{_label(page)}"}} {size}')
+
+        family("sigema_page_payload_over_budget_total", "counter", "Render halaman yang melewati batas payload.")
+        for page, count in sorted(_payload_over_budget.items()):
+            lines.append(f'sigema_page_payload_over_budget_total{{page="{_label(page)}"}} {count}')
+
+        family("sigema_sheets_requests_total", "counter", "Permintaan ke Google Sheets menurut jenis dan prioritas.")
+        for (kind, priority), count in sorted(_sheets_requests.items()):
+            lines.append(f'sigema_sheets_requests_total{{kind="{kind}",priority="{_label(priority)}"}} {count}')
+
+        family("sigema_sheets_throttle_wait_seconds_total", "counter", "Total waktu menunggu jatah kuota Google Sheets.")
+        for (kind, priority), seconds in sorted(_sheets_wait.items()):
+            lines.append(f'sigema_sheets_throttle_wait_seconds_total{{kind="{kind}",priority="{_label(priority)}"}} {seconds:.6f}')
+
+        family("sigema_sheets_quota_errors_total", "counter", "Permintaan yang ditolak Google karena kuota.")
+        for kind, count in sorted(_sheets_quota_errors.items()):
+            lines.append(f'sigema_sheets_quota_errors_total{{kind="{kind}"}} {count}')
+
+        family("sigema_sheets_coalesced_total", "counter", "Pembacaan yang digabung dengan pembacaan sama yang sedang berjalan.")
+        for kind, count in sorted(_sheets_coalesced.items()):
+            lines.append(f'sigema_sheets_coalesced_total{{kind="{kind}"}} {count}')
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Gunakan /metrics")
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Scrape rutin tidak perlu memenuhi log
+
+
+def create_server(host: str = "0.0.0.0", port: int = 9108) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(host: str = "0.0.0.0", port: int = 9108):
+    """Menjalankan server metrik di thread latar, sekali per proses (aman dipanggil di setiap rerun main.py)."""
+    global _server, _server_started
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = create_server(host, port)
+            except OSError as e:
+                _logger.error("Server metrik tidak dapat dijalankan di port %s: %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        return _server
+
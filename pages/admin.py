@@ -0,0 +1,138 @@
+import hmac
+import os
+
+import streamlit as st
+
+from data_loader import GOOGLE_SHEET_URL
+from table_view import paginated_table
+from memory_accounting import memory_report, enforce_budgets
+from sheets_quota import quota_status
+from sql_engine import sql_available, run_console_query, table_overview, QueryError, MAX_RESULT_ROWS
+from tracing import traced
+
+CONTOH_QUERY = """SELECT RW, SUM(LAKI_LAKI) AS laki_laki, SUM(PEREMPUAN) AS perempuan, SUM(Jumlah_Penduduk) AS penduduk
+FROM jenis_kelamin
+GROUP BY RW
+ORDER BY RW"""
+
+
+def _admin_token() -> str:
+    token = os.environ.get("ADMIN_TOKEN", "")
+    if not token:
+        try:
+            token = st.secrets.get("admin_token", "")
+        except Exception: # Tidak ada secrets.toml
+            token = ""
+    return str(token)
+
+
+def admin_unlocked() -> bool:
+    """
+    Panel admin (memori dan konsol SQL) hanya untuk yang memasukkan token admin: ADMIN_TOKEN
+    (variabel lingkungan) atau `admin_token` di .streamlit/secrets.toml. Tanpa token, panel tidak tersedia.
+    """
+    token = _admin_token()
+    if not token:
+        st.info("Panel admin tidak aktif. Atur ADMIN_TOKEN atau `admin_token` di secrets untuk mengaktifkannya.")
+        return False
+    entered = st.session_state.get("admin_token", "")
+    if entered and hmac.compare_digest(entered.encode("utf-8"), token.encode("utf-8")):
+        return True
+    with st.form("admin_login"):
+        entered = st.text_input("Token admin", type="password")
+        submitted = st.form_submit_button("Masuk")
+    if submitted:
+        if hmac.compare_digest(entered.encode("utf-8"), token.encode("utf-8")):
+            st.session_state.admin_token = entered
+            st.rerun()
+        st.error("Token admin salah.")
+    return False
+
+
+def run_query_console():
+    """Konsol SQL (hanya baca) atas seluruh dataset dashboard."""
+    st.subheader("Konsol Query SQL")
+    if not sql_available():
+        st.info("Konsol query membutuhkan paket 'duckdb'. Jalankan: pip install duckdb")
+        return
+
+    with st.expander("Daftar tabel"):
+        st.dataframe(table_overview(), use_container_width=True, hide_index=True)
+
+    with st.form("admin_sql_console"):
+        sql = st.text_area("Query SQL", value=CONTOH_QUERY, height=160,
+                           help="Nama tabel = slug dataset. Nama kolom yang mengandung spasi ditulis dengan tanda kutip ganda.")
+        submitted = st.form_submit_button("Jalankan")
+    if submitted:
+        try:
+            # Hasil disimpan agar tetap tampil saat halaman/pencarian tabel hasil diganti (rerun)
+            st.session_state.admin_sql_hasil = run_console_query(sql)
+        except QueryError as e:
+            st.session_state.pop('admin_sql_hasil', None)
+            st.error(f"Query gagal: {e}")
+            return
+    if 'admin_sql_hasil' not in st.session_state:
+        return
+
+    df_hasil, terpotong = st.session_state.admin_sql_hasil
+    if terpotong:
+        st.warning(f"Hasil dipotong menjadi {MAX_RESULT_ROWS:,} baris pertama.")
+    st.caption(f"{len(df_hasil):,} baris")
+    paginated_table(df_hasil, key="admin_sql_hasil")
+
+
+def _mib(n) -> str:
+    return f"{n / 1024 / 1024:,.1f} MiB"
+
+
+def run_memory_panel():
+    """Pemakaian memori cache dan session_state, serta batas memori yang berlaku."""
+    st.subheader("Pemakaian Memori")
+    laporan = memory_report()
+    col1, col2, col3 = st.columns(3)
+    batas_cache, batas_sesi = laporan["cache_budget_bytes"], laporan["session_budget_bytes"]
+    col1.metric("Cache data + aplikasi", _mib(laporan["cache_total_bytes"]),
+                help=f"Batas: {_mib(batas_cache) if batas_cache else 'tidak ada'} (MEMORY_CACHE_BUDGET_MB)")
+    col2.metric("Session state (semua sesi)", _mib(laporan["session_total_bytes"]),
+                help=f"Batas per sesi: {_mib(batas_sesi) if batas_sesi else 'tidak ada'} (MEMORY_SESSION_BUDGET_MB)")
+    col3.metric("File media/unduhan", _mib(laporan["media_total_bytes"]))
+
+    with st.expander("Objek terbesar", expanded=True):
+        st.dataframe(laporan["largest"], use_container_width=True, hide_index=True)
+    with st.expander("Entri cache"):
+        st.dataframe(laporan["caches"], use_container_width=True, hide_index=True)
+    with st.expander("Session state per sesi"):
+        st.dataframe(laporan["sessions"], use_container_width=True, hide_index=True)
+    if (batas_cache or batas_sesi) and st.button("Terapkan batas memori sekarang"):
+        enforce_budgets()
+        st.rerun()
+
+
+def run_quota_panel():
+    """Pemakaian kuota Google Sheets per menit dan antrean pembatas laju."""
+    st.subheader("Kuota Google Sheets")
+    status = quota_status()
+    baca = status[status["jenis"] == "read"].iloc[0]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Baca dalam 60 detik terakhir", f"{baca['permintaan_menit_ini']} / {baca['jatah']}",
+                help=f"Kuota {baca['kuota']} per menit; permintaan latar dibatasi {baca['jatah_latar']}")
+    col2.metric("Ditolak karena kuota", int(status["ditolak_kuota"].sum()))
+    col3.metric("Ditahan", f"{baca['ditahan_detik']} detik")
+    with st.expander("Rincian per jenis permintaan"):
+        st.dataframe(status, use_container_width=True, hide_index=True)
+
+
+@traced("page")
+def run():
+    st.title("🔑 Akses Admin")
+    st.write("Klik tombol di bawah untuk membuka dan mengedit database di Google Sheets:")
+    st.markdown(f'<a href="{GOOGLE_SHEET_URL}" target="_blank" style="text-decoration: none;"><button style="background-color:#1a73e8;color:white;padding:12px 24px;border:none;border-radius:8px;cursor:pointer;font-size:16px;">Buka Google Sheet</button></a>', unsafe_allow_html=True)
+    st.info("Pastikan Anda sudah login ke akun Google yang memiliki akses edit ke spreadsheet ini.")
+    st.markdown("---")
+    run_quota_panel()
+    st.markdown("---")
+    if not admin_unlocked():
+        return
+    run_memory_panel()
+    st.markdown("---")
+    run_query_console()
@@ -1,4 +1,6 @@
 import streamlit as st
+import pandas as pd
+import altair as alt
 
 # Import semua fungsi get_chart() dari setiap halaman
 from pages.jumlah_penduduk import get_penduduk_tahun_chart
@@ -15,7 +17,9 @@ from pages.sarana_kebersihan import get_sarana_kebersihan_chart
 from pages.tenaga_kerja import get_tenaga_kerja_chart
 
 # Impor fungsi pemuat data yang diperlukan
-from data_loader import load_infografis_urls_from_gsheet, load_penduduk_jenis_kelamin_gsheet, load_tenaga_kerja_from_gsheet
+from data_loader import load_infografis_urls_from_gsheet, load_penduduk_jenis_kelamin_gsheet, load_tenaga_kerja_from_gsheet, load_kk_rw_data_gsheet
+from aggregates import rw_key
+from tracing import traced
 
 def display_slideshow():
     """
@@ -55,6 +59,73 @@ def display_slideshow():
         st.markdown(f"<p style='text-align: center; color: grey;'>Infografis {st.session_state.home_slide_index + 1} dari {len(image_urls)}</p>", unsafe_allow_html=True)
 
 
+@traced("chart")
+def get_rw_cross_filter_chart(df_kk_rw: pd.DataFrame, df_penduduk_jk: pd.DataFrame):
+    """
+    Grafik KK per RW yang terhubung dengan grafik penduduk menurut jenis kelamin.
+    Klik RW (Shift+klik untuk beberapa RW) menyaring grafik lain langsung di browser
+    melalui parameter seleksi Vega-Lite, tanpa rerun Streamlit.
+    """
+    if df_kk_rw.empty or df_penduduk_jk.empty:
+        return None
+    if not {'RW', 'JUMLAH KK'}.issubset(df_kk_rw.columns) or not {'RW', 'RW_RT', 'LAKI_LAKI', 'PEREMPUAN'}.issubset(df_penduduk_jk.columns):
+        return None
+
+    # RW_ID: penulisan RW diseragamkan agar kedua worksheet bisa disaring dengan seleksi yang sama
+    df_kk = df_kk_rw[['RW', 'JUMLAH KK']].assign(RW_ID=rw_key(df_kk_rw['RW']))
+    df_jk = df_penduduk_jk.assign(RW_ID=rw_key(df_penduduk_jk['RW'])).melt(
+        id_vars=['RW_ID', 'RW_RT'],
+        value_vars=['LAKI_LAKI', 'PEREMPUAN'],
+        var_name='Jenis_Kelamin',
+        value_name='Jumlah'
+    )
+    df_jk['Jenis_Kelamin'] = df_jk['Jenis_Kelamin'].replace({'LAKI_LAKI': 'Laki-laki', 'PEREMPUAN': 'Perempuan'})
+
+    # Satu dataset untuk ketiga grafik; setiap grafik memilih barisnya lewat kolom 'Bagian'
+    df_gabungan = pd.concat([df_kk.assign(Bagian='kk'), df_jk.assign(Bagian='jk')], ignore_index=True)
+
+    pilih_rw = alt.selection_point(name='pilih_rw', fields=['RW_ID'], empty=True)
+    warna_jk = alt.Color('Jenis_Kelamin:N', title='Jenis Kelamin', scale=alt.Scale(range=['#004488', '#66B2FF']),
+                         legend=alt.Legend(orient='bottom'))
+
+    chart_kk = alt.Chart().transform_filter(alt.datum.Bagian == 'kk').mark_bar(cornerRadiusEnd=4).encode(
+        x=alt.X('JUMLAH KK:Q', title='Jumlah Kepala Keluarga (KK)'),
+        y=alt.Y('RW:N', sort='-x', title='Wilayah RW'),
+        color=alt.condition(pilih_rw, alt.value('#004488'), alt.value('#D0D7E1')),
+        tooltip=[
+            alt.Tooltip('RW:N', title='Wilayah RW'),
+            alt.Tooltip('JUMLAH KK:Q', title='Jumlah KK', format='.0f')
+        ]
+    ).add_params(pilih_rw).properties(title='Klik RW untuk menyaring (Shift+klik: beberapa RW)')
+
+    chart_total = alt.Chart().transform_filter(alt.datum.Bagian == 'jk').transform_filter(pilih_rw).mark_bar().encode(
+        x=alt.X('sum(Jumlah):Q', title='Jumlah Penduduk'),
+        y=alt.Y('Jenis_Kelamin:N', title=None),
+        color=warna_jk,
+        tooltip=[
+            alt.Tooltip('Jenis_Kelamin:N', title='Jenis Kelamin'),
+            alt.Tooltip('sum(Jumlah):Q', title='Jumlah', format='.0f')
+        ]
+    ).properties(height=70, title='Total Penduduk RW Terpilih')
+
+    # Batang mendatar: tinggi grafik mengikuti jumlah RT sehingga tetap terbaca di layar sempit
+    chart_rt = alt.Chart().transform_filter(alt.datum.Bagian == 'jk').transform_filter(pilih_rw).mark_bar().encode(
+        x=alt.X('Jumlah:Q', title='Jumlah Penduduk'),
+        y=alt.Y('RW_RT:N', title='RW - RT'),
+        color=warna_jk,
+        yOffset='Jenis_Kelamin:N',
+        tooltip=[
+            alt.Tooltip('RW_RT:N', title='RW-RT'),
+            alt.Tooltip('Jenis_Kelamin:N', title='Jenis Kelamin'),
+            alt.Tooltip('Jumlah:Q', title='Jumlah', format='.0f')
+        ]
+    ).properties(height=alt.Step(18), title='Penduduk Laki-laki dan Perempuan per RW-RT')
+
+    # Disusun vertikal tanpa lebar tetap: dengan use_container_width setiap grafik selebar kontainer
+    return alt.vconcat(chart_kk, chart_total, chart_rt, data=df_gabungan)
+
+
+@traced("page")
 def run():
     st.title("Selamat Datang di Dashboard Kelurahan Marapalam")
     st.markdown("""
@@ -100,8 +171,8 @@ def run():
             else:
                 st.info("Grafik tidak tersedia.")
     
-    # --- Baris 2: Jenis Tanah, UMKM, dan KK per RW ---
-    col3, col4, col5 = st.columns(3)
+    # --- Baris 2: Jenis Tanah dan UMKM ---
+    col3, col4 = st.columns(2)
     with col3:
         with st.container(border=True):
             st.subheader("🗺️ Perbandingan Jenis Tanah")
@@ -118,14 +189,6 @@ def run():
                 st.altair_chart(chart_umkm, use_container_width=True)
             else:
                 st.info("Grafik tidak tersedia.")
-    with col5:
-        with st.container(border=True):
-            st.subheader("👨‍👩‍👧‍👦 Jumlah KK Menurut RW")
-            chart_kk_rw = get_kk_rw_chart()
-            if chart_kk_rw:
-                st.altair_chart(chart_kk_rw, use_container_width=True)
-            else:
-                st.info("Grafik tidak tersedia.")
 
     # --- Baris 3: Status Pekerja & Disabilitas ---
     col6, col7 = st.columns(2)
@@ -146,15 +209,23 @@ def run():
             else:
                 st.info("Grafik tidak tersedia.")
 
-    # --- Grafik Jenis Kelamin ---
+    # --- KK per RW & Jenis Kelamin (saling menyaring di browser) ---
     with st.container(border=True):
-        st.subheader("♀️ /♂️ Jumlah Penduduk Menurut Jenis Kelamin")
+        st.subheader("👨‍👩‍👧‍👦 Jumlah KK dan Penduduk Menurut Jenis Kelamin per RW")
+        df_kk_rw_home = load_kk_rw_data_gsheet()
         df_penduduk_jk_home = load_penduduk_jenis_kelamin_gsheet()
-        chart_kelamin = get_penduduk_jenis_kelamin_chart1(df_penduduk_jk_home)
-        if chart_kelamin:
-            st.altair_chart(chart_kelamin, use_container_width=True)
+        chart_rw = get_rw_cross_filter_chart(df_kk_rw_home, df_penduduk_jk_home)
+        if chart_rw:
+            st.altair_chart(chart_rw, use_container_width=True)
         else:
-            st.info("Grafik Jumlah Penduduk Menurut Jenis Kelamin tidak tersedia atau data kosong.")
+            # Salah satu worksheet kosong: tampilkan grafik yang tersedia secara terpisah
+            chart_kk_rw = get_kk_rw_chart() if not df_kk_rw_home.empty else None
+            chart_kelamin = get_penduduk_jenis_kelamin_chart1(df_penduduk_jk_home)
+            for chart in (chart_kk_rw, chart_kelamin):
+                if chart:
+                    st.altair_chart(chart, use_container_width=True)
+            if not chart_kk_rw and not chart_kelamin:
+                st.info("Grafik Jumlah KK dan Penduduk Menurut Jenis Kelamin tidak tersedia atau data kosong.")
     
     # --- Baris 4: Sarana & Prasarana dan Kebersihan ---
     col8, col9 = st.columns(2)
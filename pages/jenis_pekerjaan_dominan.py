@@ -1,67 +1,33 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-import io
-from fpdf import FPDF
 from data_loader import load_jenis_pekerjaan_dominan_gsheet
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 alt.data_transformers.disable_max_rows()
 
+def excel_frame(df: pd.DataFrame):
+    return df.drop(columns=['Tanggal'], errors='ignore')
+
+@traced("serialize", dataset="jenis_pekerjaan")
 def to_excel(df: pd.DataFrame):
-    df_filtered = df.drop(columns=['Tanggal'], errors='ignore')
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df_filtered.to_excel(writer, index=False, sheet_name='DataPekerjaan')
-    return output.getvalue()
+    return df_to_xlsx(excel_frame(df), 'DataPekerjaan')
 
+@traced("serialize", dataset="jenis_pekerjaan")
 def df_to_pdf(df: pd.DataFrame):
-    pdf = FPDF(orientation="P", unit="mm", format="A4")
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, 'Data Jenis Pekerjaan Dominan', 0, 1, 'C')
-    pdf.ln(10)
-    df_for_pdf = df.drop(columns=['Tanggal'], errors='ignore')
-    if 'No.' not in df_for_pdf.columns:
-        df_for_pdf.insert(0, 'No.', range(1, 1 + len(df_for_pdf))) 
-    pdf.set_font("Arial", "B", 10)
-    effective_page_width = pdf.w - 2 * pdf.l_margin
-    col_widths = {'No.': 15, 'Jenis Pekerjaan': 100, 'Jumlah': 30}
-    headers = df_for_pdf.columns.tolist()
-    remaining_width = effective_page_width - sum(col_widths.get(h, 0) for h in headers)
-    remaining_cols = len(headers) - sum(1 for h in headers if h in col_widths)
-    default_col_width = remaining_width / remaining_cols if remaining_cols > 0 else 30
-    if default_col_width < 10: default_col_width = 10
-    y_start_headers = pdf.get_y()
-    x_current = pdf.get_x()
-    max_y_after_headers = y_start_headers
-    for i, header in enumerate(headers):
-        current_col_width = col_widths.get(header, default_col_width)
-        pdf.set_xy(x_current, y_start_headers)
-        pdf.multi_cell(current_col_width, 5, str(header).encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        x_current += current_col_width
-        max_y_after_headers = max(max_y_after_headers, pdf.get_y())
-    pdf.set_y(max_y_after_headers) 
-    pdf.set_font("Arial", "", 9)
-    for index, row in df_for_pdf.iterrows():
-        for i, item in enumerate(row):
-            header = headers[i]
-            current_col_width = col_widths.get(header, default_col_width)
-            formatted_item = str(item)
-            if isinstance(item, (int, float)) and float(item).is_integer():
-                formatted_item = str(int(item))
-            pdf.cell(current_col_width, 10, formatted_item.encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        pdf.ln()
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", size=8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-
+    df_for_pdf = excel_frame(df)
+    return table_to_pdf(df_for_pdf, 'Data Jenis Pekerjaan Dominan', number_column='No.')
 
-    return bytes(pdf.output())
-    
 
 # <<< DIUBAH: Fungsi get_jenis_pekerjaan_chart diperbarui sepenuhnya >>>
-def get_jenis_pekerjaan_chart():
-    df_pekerjaan = load_jenis_pekerjaan_dominan_gsheet()
+@traced("chart", dataset="jenis_pekerjaan")
+def get_jenis_pekerjaan_chart(df_pekerjaan: pd.DataFrame = None):
+    if df_pekerjaan is None:
+        df_pekerjaan = load_jenis_pekerjaan_dominan_gsheet()
     if df_pekerjaan.empty:
         return None
     
@@ -89,13 +55,14 @@ def get_jenis_pekerjaan_chart():
         return chart
     return None
 
+@traced("page", dataset="jenis_pekerjaan")
 def run():
     st.title("👷‍♂️ Jenis Pekerjaan Dominan")
     df_pekerjaan = load_jenis_pekerjaan_dominan_gsheet()
     if not df_pekerjaan.empty:
         st.subheader("Tabel Rincian Jenis Pekerjaan Dominan")
         df_display = df_pekerjaan.drop(columns=['Tanggal'], errors='ignore')
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        paginated_table(df_display, key="tabel_jenis_pekerjaan", version=load_jenis_pekerjaan_dominan_gsheet.version())
         st.markdown("---")
 
         st.subheader("Grafik Distribusi Jenis Pekerjaan Dominan")
@@ -105,12 +72,6 @@ def run():
         else:
             st.info("Tidak dapat menampilkan grafik.")
 
-        df_excel = to_excel(df_pekerjaan)
-        pdf_data = df_to_pdf(df_pekerjaan)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button("Download as XLSX", df_excel, "data_jenis_pekerjaan.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
-        with col2:
-            st.download_button("Download as PDF", pdf_data, "data_jenis_pekerjaan.pdf", "application/pdf", use_container_width=True)
+        render_download_buttons(df_pekerjaan, to_excel, df_to_pdf, "data_jenis_pekerjaan")
     else:
         st.info("Belum ada data jenis pekerjaan yang valid untuk divisualisasikan.")
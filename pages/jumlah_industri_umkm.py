@@ -1,70 +1,49 @@
 import streamlit as st
 import pandas as pd
 import altair as alt 
-import io
-from fpdf import FPDF
 import numpy as np
 from data_loader import load_umkm_data_gsheet
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 alt.data_transformers.disable_max_rows()
 
-# --- Fungsi Konversi (Tidak diubah) ---
+# --- Fungsi Konversi ---
+def excel_frame(df: pd.DataFrame):
+    return df.drop(columns=['No.'], errors='ignore')
+
+@traced("serialize", dataset="umkm")
 def to_excel(df: pd.DataFrame):
-    df_filtered = df.drop(columns=['No.'], errors='ignore')
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df_filtered.to_excel(writer, index=False, sheet_name='DataUMKM')
-    return output.getvalue()
+    return df_to_xlsx(excel_frame(df), 'DataUMKM')
 
+@traced("serialize", dataset="umkm")
 def df_to_pdf(df: pd.DataFrame):
-    pdf = FPDF(orientation="P", unit="mm", format="A4")
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, 'Data Jumlah Industri UMKM', 0, 1, 'C')
-    pdf.ln(10)
-    df_for_pdf = df.drop(columns=['No.'], errors='ignore')
-    df_for_pdf.insert(0, 'No.', range(1, 1 + len(df_for_pdf))) 
-    pdf.set_font("Arial", "B", 10)
-    effective_page_width = pdf.w - 2 * pdf.l_margin
-    col_widths = {'No.': 15, 'Jenis': 100, 'Jumlah': 40}
-    headers = df_for_pdf.columns.tolist()
-    remaining_width = effective_page_width - sum(col_widths.get(h, 0) for h in headers)
-    remaining_cols = len(headers) - sum(1 for h in headers if h in col_widths)
-    default_col_width = remaining_width / remaining_cols if remaining_cols > 0 else 20
-    if default_col_width < 10: default_col_width = 10
-    y_start_headers = pdf.get_y()
-    x_current = pdf.get_x()
-    max_y_after_headers = y_start_headers
-    for i, header in enumerate(headers):
-        current_col_width = col_widths.get(header, default_col_width)
-        pdf.set_xy(x_current, y_start_headers)
-        pdf.multi_cell(current_col_width, 5, str(header).encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        x_current += current_col_width
-        max_y_after_headers = max(max_y_after_headers, pdf.get_y())
-    pdf.set_y(max_y_after_headers) 
-    pdf.set_font("Arial", "", 9)
-    for index, row in df_for_pdf.iterrows():
-        for i, item in enumerate(row):
-            header = headers[i]
-            current_col_width = col_widths.get(header, default_col_width)
-            formatted_item = str(item)
-            if isinstance(item, (int, float)):
-                if float(item).is_integer():
-                    formatted_item = str(int(item))
-                else:
-                    formatted_item = str(item)
-            pdf.cell(current_col_width, 10, formatted_item.encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        pdf.ln()
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", size=8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-    
-    return bytes(pdf.output())
-    
+    df_for_pdf = excel_frame(df)
+    return table_to_pdf(df_for_pdf, 'Data Jumlah Industri UMKM', number_column='No.')
+
+
+@traced("clean", dataset="umkm")
+def clean_umkm_data(df_umkm: pd.DataFrame):
+    """Pembersihan data UMKM sebelum ditampilkan dan diekspor (juga dipakai ekspor massal)."""
+    df_umkm = df_umkm.copy()
+    for col in df_umkm.columns:
+        df_umkm[col] = df_umkm[col].astype(str).str.strip().replace(r'^\s*$', np.nan, regex=True).replace('None', np.nan)
+    df_umkm['Jenis'] = df_umkm['Jenis'].astype(object).fillna('Tidak Diketahui').astype(str)
+    df_umkm['Jumlah'] = pd.to_numeric(df_umkm['Jumlah'], errors='coerce').fillna(0).astype(int)
+    df_umkm = df_umkm[(df_umkm['Jenis'] != 'Tidak Diketahui') | (df_umkm['Jumlah'] != 0)].copy()
+    if 'No.' in df_umkm.columns:
+        df_umkm['No.'] = pd.to_numeric(df_umkm['No.'], errors='coerce').apply(lambda x: int(x) if pd.notna(x) else None)
+    return df_umkm
+
 
 # <<< DIUBAH: Fungsi get_umkm_chart diperbarui sepenuhnya >>>
-def get_umkm_chart():
-    df_umkm = load_umkm_data_gsheet()
+@traced("chart", dataset="umkm")
+def get_umkm_chart(df_umkm: pd.DataFrame = None):
+    if df_umkm is None:
+        df_umkm = load_umkm_data_gsheet()
 
     if df_umkm.empty:
         return None
@@ -100,29 +79,23 @@ def get_umkm_chart():
         return chart
     return None
 
+@traced("page", dataset="umkm")
 def run():
     st.title("🏭 Jumlah UMKM Menurut Lapangan Usaha")
     df_umkm = load_umkm_data_gsheet()
     if not df_umkm.empty:
-        # Pembersihan data (tidak diubah)
-        for col in df_umkm.columns:
-            df_umkm[col] = df_umkm[col].astype(str).str.strip().replace(r'^\s*$', np.nan, regex=True).replace('None', np.nan)
-        df_umkm['Jenis'] = df_umkm['Jenis'].astype(object).fillna('Tidak Diketahui').astype(str)
-        df_umkm['Jumlah'] = pd.to_numeric(df_umkm['Jumlah'], errors='coerce').fillna(0).astype(int)
-        df_umkm = df_umkm[(df_umkm['Jenis'] != 'Tidak Diketahui') | (df_umkm['Jumlah'] != 0)].copy()
-        if 'No.' in df_umkm.columns:
-            df_umkm['No.'] = pd.to_numeric(df_umkm['No.'], errors='coerce').apply(lambda x: int(x) if pd.notna(x) else None)
-        
+        df_umkm = clean_umkm_data(df_umkm)
+
         st.subheader("Tabel Jumlah UMKM Menurut Lapangan Usaha")
-        df_display = df_umkm.copy()
-        if 'Jumlah' in df_display.columns:
-            total_jumlah = df_display['Jumlah'].sum()
-            total_row_dict = {col: '' for col in df_display.columns}
+        df_total = None
+        if 'Jumlah' in df_umkm.columns:
+            total_jumlah = df_umkm['Jumlah'].sum()
+            total_row_dict = {col: '' for col in df_umkm.columns}
             total_row_dict['No.'] = ''
             total_row_dict['Jenis'] = 'TOTAL' 
             total_row_dict['Jumlah'] = total_jumlah 
-            df_display = pd.concat([df_display, pd.DataFrame([total_row_dict])], ignore_index=True)
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+            df_total = pd.DataFrame([total_row_dict]) # Baris TOTAL ditampilkan terpisah di bawah tabel
+        paginated_table(df_umkm, key="tabel_umkm", summary=df_total, version=load_umkm_data_gsheet.version())
         st.markdown("---")
         
         st.subheader("Grafik Jumlah UMKM Menurut Lapangan Usaha")
@@ -132,12 +105,6 @@ def run():
         else:
             st.info("Tidak dapat menampilkan grafik.")
         
-        df_excel = to_excel(df_umkm)
-        pdf_data = df_to_pdf(df_umkm)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button("Download as XLSX", df_excel, "data_umkm.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
-        with col2:
-            st.download_button("Download as PDF", pdf_data, "data_umkm.pdf", "application/pdf", use_container_width=True)
+        render_download_buttons(df_umkm, to_excel, df_to_pdf, "data_umkm")
     else:
         st.info("Belum ada data UMKM yang valid untuk divisualisasikan.")
@@ -1,114 +1,53 @@
 import streamlit as st
 import pandas as pd
 import altair as alt # Menggunakan Altair untuk visualisasi
-import io
-from fpdf import FPDF # Pastikan 'fpdf2' terinstal.
 
 # Import fungsi pemuat data
 from data_loader import load_kk_rw_data_gsheet
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 # Nonaktifkan batas baris Altair agar bisa memproses data besar
 alt.data_transformers.disable_max_rows()
 
 # --- Fungsi Konversi untuk Download ---
 
+def excel_frame(df: pd.DataFrame):
+    """
+    Mengembalikan kolom yang ikut diekspor ke Excel.
+    Akan mengecualikan kolom 'LAKI- LAKI' dan 'PEREMPUAN' jika ada, sesuai dengan visualisasi Colab.
+    """
+    return df.drop(columns=['LAKI- LAKI', 'PEREMPUAN'], errors='ignore')
+
+@traced("serialize", dataset="kk_rw")
 def to_excel(df: pd.DataFrame):
     """
     Mengonversi DataFrame Pandas menjadi file Excel di dalam memori.
-    Akan mengecualikan kolom 'LAKI- LAKI' dan 'PEREMPUAN' jika ada, sesuai dengan visualisasi Colab.
     """
-    # Buat salinan DataFrame dan hapus kolom yang tidak diinginkan
-    df_filtered = df.drop(columns=['LAKI- LAKI', 'PEREMPUAN'], errors='ignore')
-    
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer: # Menggunakan xlsxwriter untuk Excel
-        df_filtered.to_excel(writer, index=False, sheet_name='DataKK_RW')
-    processed_data = output.getvalue()
-    return processed_data
+    return df_to_xlsx(excel_frame(df), 'DataKK_RW')
 
+@traced("serialize", dataset="kk_rw")
 def df_to_pdf(df: pd.DataFrame):
     """
     Mengonversi DataFrame Pandas menjadi file PDF untuk data Jumlah KK Menurut RW.
-    Akan mengecualikan kolom 'LAKI- LAKI' dan 'PEREMPUAN', dan mempertahankan format sebelumnya.
+    Akan mengecualikan kolom 'LAKI- LAKI' dan 'PEREMPUAN'.
     """
-    pdf = FPDF(orientation="P", unit="mm", format="A4") # 'P' untuk Portrait
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    
-    pdf.cell(0, 10, 'Data Jumlah Kepala Keluarga (KK) per RW', 0, 1, 'C')
-    pdf.ln(10)
+    # Kolom sama dengan file Excel
+    df_for_pdf = excel_frame(df)
+    return table_to_pdf(df_for_pdf, 'Data Jumlah Kepala Keluarga (KK) per RW', number_column='No.')
 
-    # Buat salinan DataFrame dan hapus kolom yang tidak diinginkan
-    df_for_pdf = df.drop(columns=['LAKI- LAKI', 'PEREMPUAN'], errors='ignore')
-    
-    # Perbaikan: Tambahkan kolom 'No.' ke DataFrame untuk PDF sebagai nomor urut
-    df_for_pdf.insert(0, 'No.', range(1, 1 + len(df_for_pdf))) 
-
-    # Header Kolom Tabel
-    pdf.set_font("Arial", "B", 10)
-    effective_page_width = pdf.w - 2 * pdf.l_margin
-    
-    # Menentukan lebar kolom secara manual untuk kontrol yang lebih baik
-    col_widths = {
-        'No.': 15,
-        'RW': 40, # Lebar untuk RW
-        'JUMLAH KK': 60 # Lebar untuk Jumlah KK
-    }
-    
-    headers = df_for_pdf.columns.tolist()
-    # Hitung lebar default untuk kolom yang tidak didefinisikan secara eksplisit
-    remaining_width = effective_page_width - sum(col_widths.get(h, 0) for h in headers)
-    remaining_cols = len(headers) - sum(1 for h in headers if h in col_widths)
-    default_col_width = remaining_width / remaining_cols if remaining_cols > 0 else 20
-    
-    if default_col_width < 10: default_col_width = 10
-
-    # Cetak header
-    y_start_headers = pdf.get_y()
-    x_current = pdf.get_x()
-    max_y_after_headers = y_start_headers
-
-    for i, header in enumerate(headers):
-        current_col_width = col_widths.get(header, default_col_width)
-        pdf.set_xy(x_current, y_start_headers)
-        pdf.multi_cell(current_col_width, 5, str(header).encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        x_current += current_col_width
-        max_y_after_headers = max(max_y_after_headers, pdf.get_y())
-    
-    pdf.set_y(max_y_after_headers) 
-
-    # Data Baris Tabel
-    pdf.set_font("Arial", "", 9)
-    for index, row in df_for_pdf.iterrows():
-        for i, item in enumerate(row):
-            header = headers[i]
-            current_col_width = col_widths.get(header, default_col_width)
-            
-            # Menghilangkan ".0" untuk nilai numerik
-            formatted_item = str(item)
-            if isinstance(item, (int, float)):
-                if float(item).is_integer():
-                    formatted_item = str(int(item))
-                else:
-                    formatted_item = str(item) # Biarkan float jika ada desimal
-            
-            pdf.cell(current_col_width, 10, formatted_item.encode('latin-1', 'replace').decode('latin-1'), border=1, ln=False)
-        pdf.ln()
-    
-    # Tambahkan teks sumber di bagian bawah tabel
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", size=8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-    
-    return bytes(pdf.output())
-   
 
 # --- FUNGSI BARU: Mendapatkan Objek Grafik untuk Halaman ini ---
-def get_kk_rw_chart():
+@traced("chart", dataset="kk_rw")
+def get_kk_rw_chart(df_kk_rw: pd.DataFrame = None):
     """
     Membuat dan mengembalikan objek grafik Altair untuk Jumlah KK Menurut RW.
     """
-    df_kk_rw = load_kk_rw_data_gsheet()
+    if df_kk_rw is None:
+        df_kk_rw = load_kk_rw_data_gsheet()
 
     if df_kk_rw.empty:
         st.info("Data tidak tersedia untuk grafik ini.")
@@ -152,6 +91,7 @@ def get_kk_rw_chart():
 
 # --- Fungsi utama untuk menjalankan halaman ---
 
+@traced("page", dataset="kk_rw")
 def run():
     """
     Merender halaman 'Jumlah KK Menurut RW'.
@@ -166,24 +106,24 @@ def run():
         st.subheader("Tabel Rincian Jumlah Kepala Keluarga per RW")
         
         # Buat df_display dengan kolom yang diinginkan (tanpa LAKI-LAKI, PEREMPUAN)
-        df_display = df_kk_rw.drop(columns=['LAKI- LAKI', 'PEREMPUAN'], errors='ignore').copy() 
+        df_display = df_kk_rw.drop(columns=['LAKI- LAKI', 'PEREMPUAN'], errors='ignore')
 
         # --- LOGIKA TAMBAHAN UNTUK BARIS TOTAL ---
+        df_total = None
         if 'JUMLAH KK' in df_display.columns:
-            # Pastikan 'JUMLAH KK' adalah numerik sebelum dijumlahkan
-            df_display['JUMLAH KK'] = pd.to_numeric(df_display['JUMLAH KK'], errors='coerce').fillna(0)
-            total_jumlah_kk = df_display['JUMLAH KK'].sum()
+            # Total dihitung langsung dari data KK (tanpa memuat worksheet lain)
+            total_jumlah_kk = pd.to_numeric(df_display['JUMLAH KK'], errors='coerce').sum()
             
             # Buat baris total
             total_row_dict = {col: '' for col in df_display.columns} # Inisialisasi semua kolom kosong
             total_row_dict['RW'] = 'TOTAL' # Label untuk baris total
-            total_row_dict['JUMLAH KK'] = total_jumlah_kk # Jumlah total
+            total_row_dict['JUMLAH KK'] = int(total_jumlah_kk) # Jumlah total
             
-            # Gabungkan baris total ke DataFrame tampilan
-            df_display = pd.concat([df_display, pd.DataFrame([total_row_dict])], ignore_index=True)
+            # Baris total ditampilkan terpisah di bawah tabel (tidak ikut diurutkan/dicari)
+            df_total = pd.DataFrame([total_row_dict])
         # --- AKHIR LOGIKA TAMBAHAN BARIS TOTAL ---
         
-        st.dataframe(df_display, use_container_width=True, hide_index=True) # Tambahkan hide_index=True untuk tampilan lebih rapi
+        paginated_table(df_display, key="tabel_kk_rw", summary=df_total, version=load_kk_rw_data_gsheet.version())
         st.markdown("---")
 
         # --- Tampilkan Visualisasi dengan Altair ---
@@ -195,28 +135,7 @@ def run():
         else:
             st.info("Tidak dapat menampilkan grafik karena data tidak tersedia atau tidak valid.")
 
-        # --- Siapkan Data dan Tombol Download ---
-        df_excel = to_excel(df_kk_rw) # df_kk_rw sudah dimuat dari GSheet
-        pdf_data = df_to_pdf(df_kk_rw) # df_kk_rw sudah dimuat dari GSheet
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.download_button(
-                label="Download as XLSX",
-                data=df_excel,
-                file_name="data_kk_rw.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-        
-        with col2:
-            st.download_button(
-                label="Download as PDF",
-                data=pdf_data,
-                file_name="data_kk_rw.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+        # --- Tombol Download (file baru dibuat saat tombol ditekan) ---
+        render_download_buttons(df_kk_rw, to_excel, df_to_pdf, "data_kk_rw") # df_kk_rw sudah dimuat dari GSheet
     else:
         st.info("Belum ada data jumlah KK per RW yang valid untuk divisualisasikan. Pastikan Google Sheet Anda dapat diakses dan memiliki data yang benar di worksheet 'Jumlah KK Menurut RW' dengan kolom 'RW', 'LAKI- LAKI', 'PEREMPUAN', dan 'JUMLAH KK'.")
\ No newline at end of file
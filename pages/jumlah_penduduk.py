@@ -2,58 +2,29 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from data_loader import load_penduduk_2020_from_gsheet
-import io
-from fpdf import FPDF
+from indicators import get_indicators
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 alt.data_transformers.disable_max_rows()
 
+@traced("serialize", dataset="jumlah_penduduk")
 def to_excel(df):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='DataPenduduk')
-    return output.getvalue()
+    return df_to_xlsx(df, 'DataPenduduk')
 
+@traced("serialize", dataset="jumlah_penduduk")
 def df_to_pdf(df):
-    pdf = FPDF(orientation='P', unit='mm', format='A4')
-    pdf.add_page()
-    pdf.set_font("Arial", size=7)
-    pdf.cell(0, 10, txt="Data Jumlah Penduduk", ln=True, align='C')
-    pdf.ln(5)
-    df_for_pdf = df.copy()
-    df_for_pdf.insert(0, 'No', range(1, 1 + len(df_for_pdf)))
-    headers = df_for_pdf.columns.tolist()
-    col_widths = {'No': 15, 'Tahun': 25, 'Jumlah Laki-Laki (orang)': 35, 'Jumlah Perempuan (orang)': 35, 'Jumlah Total (orang)': 35}
-    default_col_width = (pdf.w - 2 * pdf.l_margin - sum(col_widths.values())) / (len(headers) - len(col_widths)) if (len(headers) - len(col_widths)) > 0 else 30
-    if len(headers) > 0:
-        y_start_headers = pdf.get_y()
-        x_current = pdf.get_x()
-        max_y_after_headers = y_start_headers
-        for i, header in enumerate(headers):
-            current_col_width = col_widths.get(header, default_col_width)
-            pdf.set_xy(x_current, y_start_headers)
-            pdf.multi_cell(current_col_width, 5, str(header).encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-            x_current += current_col_width
-            max_y_after_headers = max(max_y_after_headers, pdf.get_y())
-        pdf.set_y(max_y_after_headers)
-        for row_data in df_for_pdf.itertuples(index=False):
-            for i, data in enumerate(row_data):
-                header = headers[i]
-                current_col_width = col_widths.get(header, default_col_width)
-                formatted_data = str(data)
-                if isinstance(data, (int, float)) and float(data).is_integer():
-                    formatted_data = str(int(data))
-                pdf.cell(current_col_width, 10, formatted_data.encode('latin-1', 'replace').decode('latin-1'), border=1, ln=False)
-            pdf.ln(10)
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", size=8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-    
-    return bytes(pdf.output())
-    
+    return table_to_pdf(df, "Data Jumlah Penduduk", number_column='No')
+
 
 # <<< DIUBAH: Fungsi get_penduduk_tahun_chart diperbarui sepenuhnya >>>
-def get_penduduk_tahun_chart():
-    df_penduduk = load_penduduk_2020_from_gsheet()
+@traced("chart", dataset="jumlah_penduduk")
+def get_penduduk_tahun_chart(df_penduduk: pd.DataFrame = None):
+    if df_penduduk is None:
+        df_penduduk = load_penduduk_2020_from_gsheet()
     if df_penduduk.empty:
         return None
 
@@ -90,12 +61,13 @@ def get_penduduk_tahun_chart():
         return chart
     return None
 
+@traced("page", dataset="jumlah_penduduk")
 def run():
     st.title("📈 Jumlah Penduduk")
     df_penduduk = load_penduduk_2020_from_gsheet()
     if not df_penduduk.empty:
         st.subheader("Data Jumlah Penduduk")
-        st.dataframe(df_penduduk, use_container_width=True, hide_index=True)
+        paginated_table(df_penduduk, key="tabel_penduduk", version=load_penduduk_2020_from_gsheet.version())
         st.markdown("---")
         st.subheader("Tren Jumlah Penduduk dari Tahun 2023 ke Tahun 2025")
         chart_obj = get_penduduk_tahun_chart()
@@ -104,29 +76,32 @@ def run():
         else:
             st.info("Tidak dapat menampilkan grafik.")
         
-        if 'Tahun' in df_penduduk.columns and 'Jumlah Total (orang)' in df_penduduk.columns:
-            tahun_terbaru = df_penduduk['Tahun'].max()
-            jumlah_terbaru = df_penduduk[df_penduduk['Tahun'] == tahun_terbaru]['Jumlah Total (orang)'].iloc[0]
+        df_indikator = get_indicators('jumlah_penduduk')
+        if 'Jumlah Total (orang)' in df_indikator.columns:
+            # Indikator (perubahan, pertumbuhan, rasio) sudah dihitung sekaligus untuk semua tahun
+            terakhir = df_indikator.iloc[-1]
+            tahun_terbaru = df_indikator['Tahun'].iloc[-1]
+            tahun_sebelumnya = df_indikator['Tahun Sebelumnya'].iloc[-1]
+            jumlah_terbaru = terakhir['Jumlah Total (orang)']
             st.markdown("---")
             st.subheader("Ringkasan Data")
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric(label=f"Tahun Data Terakhir ({tahun_terbaru})", value=f"{jumlah_terbaru:,.0f} orang")
             with col2:
-                if len(df_penduduk) > 1:
-                    tahun_sebelumnya_data = df_penduduk[df_penduduk['Tahun'] < tahun_terbaru]['Tahun'].max()
-                    if pd.notna(tahun_sebelumnya_data):
-                        jumlah_sebelumnya = df_penduduk[df_penduduk['Tahun'] == tahun_sebelumnya_data]['Jumlah Total (orang)'].iloc[0]
-                        perubahan = jumlah_terbaru - jumlah_sebelumnya
-                        st.metric(label=f"Perubahan dari Tahun {tahun_sebelumnya_data}", value=f"{perubahan:,.0f} orang", delta=f"{perubahan:,.0f}")
+                if pd.notna(tahun_sebelumnya):
+                    perubahan = terakhir['Perubahan Jumlah Total (orang)']
+                    pertumbuhan = terakhir['Pertumbuhan Jumlah Total (orang) (%)']
+                    st.metric(label=f"Perubahan dari Tahun {tahun_sebelumnya}", value=f"{perubahan:,.0f} orang",
+                              delta=f"{perubahan:,.0f}" + (f" ({pertumbuhan:+.2f}%)" if pd.notna(pertumbuhan) else ""))
+            with col3:
+                if pd.notna(terakhir.get('Rasio Jenis Kelamin')):
+                    st.metric(label="Rasio Jenis Kelamin (L per 100 P)", value=f"{terakhir['Rasio Jenis Kelamin']:.2f}")
+
+            with st.expander("Indikator Pertumbuhan per Tahun"):
+                st.dataframe(df_indikator, use_container_width=True, hide_index=True)
         
         st.markdown("---")
-        df_excel = to_excel(df_penduduk)
-        pdf_data = df_to_pdf(df_penduduk)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button("Download as XLSX", df_excel, "data_penduduk.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
-        with col2:
-            st.download_button("Download as PDF", pdf_data, "data_penduduk.pdf", "application/pdf", use_container_width=True)
+        render_download_buttons(df_penduduk, to_excel, df_to_pdf, "data_penduduk")
     else:
         st.info("Belum ada data jumlah penduduk yang valid untuk divisualisasikan.")
@@ -1,66 +1,30 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-import io
-from fpdf import FPDF
 from data_loader import load_pendidikan_data_from_gsheet
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 alt.data_transformers.disable_max_rows()
 
 # --- Fungsi Konversi (Tidak diubah) ---
+@traced("serialize", dataset="pendidikan")
 def to_excel(df: pd.DataFrame):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Data Pendidikan')
-    return output.getvalue()
+    return df_to_xlsx(df, 'Data Pendidikan')
 
+@traced("serialize", dataset="pendidikan")
 def df_to_pdf(df: pd.DataFrame):
-    pdf = FPDF(orientation="P", unit="mm", format="A4")
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, 'Data Penduduk Berdasarkan Tingkat Pendidikan', 0, 1, 'C')
-    pdf.ln(10)
-    df_for_pdf = df.copy()
-    if 'No' not in df_for_pdf.columns: 
-        df_for_pdf.insert(0, 'No', range(1, 1 + len(df_for_pdf))) 
-    pdf.set_font("Arial", "B", 10)
-    effective_page_width = pdf.w - 2 * pdf.l_margin
-    col_widths = {'No': 15, 'Pendidikan': 90, 'Jumlah': 30}
-    headers = df_for_pdf.columns.tolist()
-    remaining_width = effective_page_width - sum(col_widths.get(h, 0) for h in headers)
-    remaining_cols = len(headers) - sum(1 for h in headers if h in col_widths)
-    default_col_width = remaining_width / remaining_cols if remaining_cols > 0 else 30
-    if default_col_width < 10: default_col_width = 10
-    y_start_headers = pdf.get_y()
-    x_current = pdf.get_x()
-    max_y_after_headers = y_start_headers
-    for i, header in enumerate(headers):
-        current_col_width = col_widths.get(header, default_col_width)
-        pdf.set_xy(x_current, y_start_headers)
-        pdf.multi_cell(current_col_width, 5, str(header).encode('latin-1', 'replace').decode('latin-1'), border=1, align='C')
-        x_current += current_col_width
-        max_y_after_headers = max(max_y_after_headers, pdf.get_y())
-    pdf.set_y(max_y_after_headers) 
-    pdf.set_font("Arial", "", 9)
-    for index, row in df_for_pdf.iterrows():
-        for i, item in enumerate(row):
-            header = headers[i]
-            current_col_width = col_widths.get(header, default_col_width)
-            formatted_item = str(item)
-            if isinstance(item, (int, float)) and float(item).is_integer():
-                formatted_item = str(int(item))
-            pdf.cell(current_col_width, 10, formatted_item.encode('latin-1', 'replace').decode('latin-1'), border=1, ln=False)
-        pdf.ln(10)
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", size=8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-    
-    return bytes(pdf.output())
-   
+    return table_to_pdf(df, 'Data Penduduk Berdasarkan Tingkat Pendidikan', number_column='No')
+
 
 # <<< DIUBAH: Fungsi get_pendidikan_chart diperbarui sepenuhnya >>>
-def get_pendidikan_chart():
-    df_pendidikan = load_pendidikan_data_from_gsheet()
+@traced("chart", dataset="pendidikan")
+def get_pendidikan_chart(df_pendidikan: pd.DataFrame = None):
+    if df_pendidikan is None:
+        df_pendidikan = load_pendidikan_data_from_gsheet()
     if df_pendidikan.empty:
         return None
     
@@ -88,6 +52,7 @@ def get_pendidikan_chart():
         return chart
     return None
 
+@traced("page", dataset="pendidikan")
 def run():
     st.title("🎓 Jumlah Penduduk Berdasarkan Tingkat Pendidikan")
     df_pendidikan = load_pendidikan_data_from_gsheet()
@@ -98,6 +63,7 @@ def run():
 
         st.subheader("Tabel Rincian Data Pendidikan")
         df_display = df_pendidikan.copy()
+        df_total = None
         if 'Jumlah' in df_display.columns:
             df_display['Jumlah'] = pd.to_numeric(df_display['Jumlah'], errors='coerce').fillna(0)
             total_jumlah = df_display['Jumlah'].sum()
@@ -105,9 +71,9 @@ def run():
             total_row_dict['No'] = '' 
             total_row_dict['Pendidikan'] = 'TOTAL' 
             total_row_dict['Jumlah'] = total_jumlah 
-            df_display = pd.concat([df_display, pd.DataFrame([total_row_dict])], ignore_index=True)
+            df_total = pd.DataFrame([total_row_dict]) # Baris TOTAL ditampilkan terpisah di bawah tabel
         
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        paginated_table(df_display, key="tabel_pendidikan", summary=df_total, version=load_pendidikan_data_from_gsheet.version())
         st.markdown("---")
 
         st.subheader("Grafik Distribusi Pendidikan")
@@ -117,12 +83,6 @@ def run():
         else:
             st.info("Tidak dapat menampilkan grafik.")
 
-        df_excel = to_excel(df_pendidikan)
-        pdf_data = df_to_pdf(df_pendidikan)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button("Download as XLSX", df_excel, "data_pendidikan.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
-        with col2:
-            st.download_button("Download as PDF", pdf_data, "data_pendidikan.pdf", "application/pdf", use_container_width=True)
+        render_download_buttons(df_pendidikan, to_excel, df_to_pdf, "data_pendidikan")
     else:
         st.info("Belum ada data pendidikan yang valid untuk divisualisasikan.")
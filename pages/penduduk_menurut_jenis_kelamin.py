@@ -1,51 +1,31 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-import io
-from fpdf import FPDF
 from data_loader import load_penduduk_jenis_kelamin_gsheet
+from aggregates import get_rw_cube, rt_breakdown
+from exports import render_download_buttons
+from table_view import paginated_table
+from pdf_export import table_to_pdf
+from xlsx_export import df_to_xlsx
+from tracing import traced
 
 alt.data_transformers.disable_max_rows()
 
+@traced("serialize", dataset="jenis_kelamin")
 def to_excel(df: pd.DataFrame):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='DataPendudukJK')
-    return output.getvalue()
+    return df_to_xlsx(df, 'DataPendudukJK')
 
+@traced("serialize", dataset="jenis_kelamin")
 def df_to_pdf(df: pd.DataFrame):
-    pdf = FPDF(orientation='L', unit='mm', format='A4')
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, txt="Data Penduduk Menurut Jenis Kelamin", ln=True, align='C')
-    pdf.ln(5)
-    headers_df = ['No', 'RW', 'RT', 'Jumlah_KK', 'LAKI_LAKI', 'PEREMPUAN', 'Jumlah_Penduduk']
-    headers_display = ['No', 'RW', 'RT', 'Jumlah KK', 'Laki-Laki', 'Perempuan', 'Jumlah Penduduk']
-    col_widths = {'No': 15, 'RW': 20, 'RT': 20, 'Jumlah KK': 35, 'Laki-Laki': 35, 'Perempuan': 35, 'Jumlah Penduduk': 45}
-    pdf.set_font("Arial", "B", 10)
-    for i, header_text in enumerate(headers_display):
-        width = col_widths[header_text]
-        pdf.cell(width, 10, header_text, border=1, align='C')
-    pdf.ln()
-    pdf.set_font("Arial", "", 10)
-    for index, row in df.iterrows():
-        for i, header_display_text in enumerate(headers_display):
-            width = col_widths[header_display_text]
-            df_col_name = headers_df[i]
-            data = row[df_col_name]
-            formatted_data = str(data)
-            if isinstance(data, (int, float)) and float(data).is_integer():
-                formatted_data = str(int(data))
-            pdf.cell(width, 10, formatted_data.encode('latin-1', 'replace').decode('latin-1'), border=1)
-        pdf.ln()
-    pdf.set_y(pdf.get_y() + 5)
-    pdf.set_font("Arial", "I", 8)
-    pdf.cell(0, 10, "Sumber: Kelurahan Kubu Marapalam", align='C')
-    
-    return bytes(pdf.output())
-   
+    headers = {
+        'No': 'No', 'RW': 'RW', 'RT': 'RT', 'Jumlah_KK': 'Jumlah KK',
+        'LAKI_LAKI': 'Laki-Laki', 'PEREMPUAN': 'Perempuan', 'Jumlah_Penduduk': 'Jumlah Penduduk'
+    }
+    return table_to_pdf(df, "Data Penduduk Menurut Jenis Kelamin", columns=headers, orientation='L')
+
 
 # <<< DIUBAH: Fungsi get_penduduk_jenis_kelamin_chart1 diperbarui sepenuhnya >>>
+@traced("chart", dataset="jenis_kelamin")
 def get_penduduk_jenis_kelamin_chart1(df_penduduk_jk: pd.DataFrame):
     if df_penduduk_jk.empty:
         return None
@@ -81,12 +61,28 @@ def get_penduduk_jenis_kelamin_chart1(df_penduduk_jk: pd.DataFrame):
         return chart
     return None
 
+@traced("page", dataset="jenis_kelamin")
 def run():
     st.title("♀️ /♂️ Penduduk Menurut Jenis Kelamin")
     df_penduduk_jk = load_penduduk_jenis_kelamin_gsheet()
     if not df_penduduk_jk.empty:
         st.subheader("Tabel Data Penduduk Menurut Jenis Kelamin")
-        st.dataframe(df_penduduk_jk, use_container_width=True, hide_index=True)
+        paginated_table(df_penduduk_jk, key="tabel_penduduk_jk", version=load_penduduk_jenis_kelamin_gsheet.version())
+        st.markdown("---")
+
+        # --- Ringkasan & rincian per RW dari cube agregat (tanpa menghitung ulang data mentah) ---
+        cube = get_rw_cube()
+        total = cube['kelurahan']
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Jumlah Penduduk", f"{total['Jumlah_Penduduk'] or 0:,.0f}")
+        col2.metric("Laki-laki", f"{total['LAKI_LAKI'] or 0:,.0f}")
+        col3.metric("Perempuan", f"{total['PEREMPUAN'] or 0:,.0f}")
+        col4.metric("Rasio Jenis Kelamin", f"{total['Rasio_JK']:.2f}" if total['Rasio_JK'] is not None else "-")
+
+        daftar_rw = [rw for rw in cube['rw'].index if pd.notna(rw)]
+        if daftar_rw:
+            pilihan_rw = st.selectbox("Rincian per RT untuk RW", daftar_rw, key="jk_rincian_rw")
+            st.dataframe(rt_breakdown(cube, pilihan_rw), use_container_width=True, hide_index=True)
         st.markdown("---")
 
         st.subheader("Perbandingan Jumlah Penduduk Laki-laki dan Perempuan per RT-RW")
@@ -97,12 +93,6 @@ def run():
             st.info("Tidak dapat menampilkan grafik.")
 
         st.markdown("---")
-        df_excel_data = to_excel(df_penduduk_jk)
-        pdf_data = df_to_pdf(df_penduduk_jk)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button("Download as XLSX", df_excel_data, "data_penduduk_jenis_kelamin.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
-        with col2:
-            st.download_button("Download as PDF", pdf_data, "data_penduduk_jenis_kelamin.pdf", "application/pdf", use_container_width=True)
+        render_download_buttons(df_penduduk_jk, to_excel, df_to_pdf, "data_penduduk_jenis_kelamin")
     else:
         st.info("Belum ada data penduduk menurut jenis kelamin yang valid untuk divisualisasikan.")
@@ -0,0 +1,61 @@
+import streamlit as st
+import pandas as pd
+
+from bulk_export import MIME_ZIP, build_pdf_zip, build_workbook, load_all_datasets
+from exports import MIME_PDF, MIME_XLSX, render_cancel_button, session_owner
+from report import build_report
+from tracing import traced
+
+
+@traced("page")
+def run():
+    st.title("📦 Unduh Semua Data")
+    st.write("Unduh seluruh dataset kelurahan sekaligus: satu file Excel (satu sheet per dataset), "
+             "satu file ZIP berisi PDF setiap dataset, atau laporan PDF lengkap berisi grafik dan tabel.")
+
+    frames = load_all_datasets()
+    if not frames:
+        st.info("Belum ada data yang dapat diunduh.")
+        return
+
+    df_ringkasan = pd.DataFrame({
+        'Dataset': [dataset['worksheet'] for dataset, _, _ in frames],
+        'Jumlah Baris': [len(df) for _, df, _ in frames],
+        'Jumlah Kolom': [len(df.columns) for _, df, _ in frames],
+    })
+    st.dataframe(df_ringkasan, use_container_width=True, hide_index=True)
+
+    # File baru dibuat saat tombol ditekan, lalu disimpan di cache sesuai versi data
+    owner = session_owner()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            label="Download Semua Data (XLSX)",
+            data=lambda: build_workbook(frames, owner=owner),
+            file_name="data_kelurahan_marapalam.xlsx",
+            mime=MIME_XLSX,
+            key="download_semua_xlsx",
+            on_click="ignore",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            label="Download Semua PDF (ZIP)",
+            data=lambda: build_pdf_zip(frames, owner=owner),
+            file_name="data_kelurahan_marapalam_pdf.zip",
+            mime=MIME_ZIP,
+            key="download_semua_zip",
+            on_click="ignore",
+            use_container_width=True
+        )
+    with col3:
+        st.download_button(
+            label="Download Laporan Lengkap (PDF)",
+            data=lambda: build_report(owner=owner),
+            file_name="laporan_kelurahan_marapalam.pdf",
+            mime=MIME_PDF,
+            key="download_laporan_pdf",
+            on_click="ignore",
+            use_container_width=True
+        )
+    render_cancel_button(owner, key="batal_ekspor_semua_data")
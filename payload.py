@@ -0,0 +1,138 @@
+"""
+Ukuran data yang dikirim ke browser per elemen dan per render halaman.
+
+Setiap pesan (ForwardMsg) yang dikirim Streamlit selama render halaman diukur dalam bentuk
+protobuf terserialisasi, yaitu yang benar-benar lewat websocket: tabel (Arrow), grafik Altair beserta
+data inline-nya, markdown/HTML termasuk gambar base64, dan tombol unduh. Pesan yang sudah ada di
+cache browser dihitung sebagai referensi kecil, sesuai yang dikirim.
+
+Batas per halaman (KiB):
+    PAYLOAD_BUDGET_KB     batas default (default 1024)
+    PAYLOAD_BUDGETS_KB    batas khusus per halaman, mis. "Home=3000,Jenis Tanah=256"
+Render yang melewati batas dicatat ke log (paling sering sekali per menit per halaman) dan ke metrik
+Prometheus. Panel rincian tampil di bawah halaman jika URL memuat ?payload=1.
+"""
+import logging
+import os
+import threading
+from collections import defaultdict
+
+import pandas as pd
+import streamlit as st
+
+from log_throttle import warn_throttled
+from metrics import observe_payload
+
+QUERY_PARAM = "payload"
+DEFAULT_BUDGET_KB = float(os.environ.get("PAYLOAD_BUDGET_KB", 1024))
+TOP_N = 15
+
+_logger = logging.getLogger(__name__)
+
+
+def _parse_budgets(text: str) -> dict:
+    budgets = {}
+    for item in text.split(","):
+        page, _, value = item.rpartition("=")
+        try:
+            budgets[page.strip()] = float(value)
+        except ValueError:
+            continue
+    return budgets
+
+
+PAGE_BUDGETS_KB = _parse_budgets(os.environ.get("PAYLOAD_BUDGETS_KB", ""))
+
+
+def budget_bytes(page: str) -> int:
+    return int(PAGE_BUDGETS_KB.get(page, DEFAULT_BUDGET_KB) * 1024)
+
+
+def _element_type(msg) -> str:
+    if msg.WhichOneof("type") != "delta":
+        return msg.WhichOneof("type") or "lainnya"
+    delta = msg.delta
+    kind = delta.WhichOneof("type")
+    if kind == "new_element":
+        return delta.new_element.WhichOneof("type") or "elemen"
+    return kind or "delta"
+
+
+class PayloadMeter:
+    """Mengukur pesan yang dikirim sesi ini mulai dari start() sampai finish()."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.elements = []
+        self._ctx = None
+        self._original = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        self._ctx = get_script_run_ctx(suppress_warning=True)
+        if self._ctx is None:
+            return self
+        original = self._ctx._enqueue
+        # Pengaman: pembungkus yang tertinggal dari render sebelumnya dilepas dulu
+        while hasattr(original, "payload_original"):
+            original = original.payload_original
+        self._original = original
+
+        def enqueue(msg):
+            size = msg.ByteSize()
+            with self._lock:
+                self.elements.append({
+                    "Elemen": _element_type(msg), "Posisi": ".".join(map(str, msg.metadata.delta_path)),
+                    "Bytes": size, "Dari cache browser": bool(msg.WhichOneof("type") == "ref_hash"),
+                })
+            original(msg)
+
+        enqueue.payload_original = original
+        self._ctx._enqueue = enqueue
+        return self
+
+    def finish(self) -> dict:
+        """Berhenti mengukur; mengembalikan ringkasan dan mencatat jika melewati batas."""
+        if self._ctx is not None and self._original is not None:
+            self._ctx._enqueue = self._original
+        with self._lock:
+            elements = list(self.elements)
+        total = sum(element["Bytes"] for element in elements)
+        per_type = defaultdict(int)
+        for element in elements:
+            per_type[element["Elemen"]] += element["Bytes"]
+        budget = budget_bytes(self.page)
+        over = total > budget
+        observe_payload(self.page, total, over)
+        if over:
+            warn_throttled(_logger, self.page, "Payload halaman '%s' %.0f KiB melewati batas %.0f KiB",
+                           self.page, total / 1024, budget / 1024)
+        return {"page": self.page, "total_bytes": total, "budget_bytes": budget, "over_budget": over,
+                "per_type": dict(per_type), "elements": elements}
+
+
+def start_payload_meter(page: str) -> PayloadMeter:
+    return PayloadMeter(page).start()
+
+
+def show_payload(result: dict):
+    """Panel rincian payload (hanya jika ?payload=1)."""
+    if st.query_params.get(QUERY_PARAM, "") != "1":
+        return
+    total, budget = result["total_bytes"], result["budget_bytes"]
+    with st.expander(f"📦 Payload halaman: {total / 1024:,.1f} KiB dari batas {budget / 1024:,.0f} KiB",
+                     expanded=result["over_budget"]):
+        if result["over_budget"]:
+            st.warning(f"Halaman '{result['page']}' melewati batas payload ({total / 1024:,.1f} KiB > {budget / 1024:,.0f} KiB).")
+        col1, col2 = st.columns(2)
+        col1.metric("Total", f"{total / 1024:,.1f} KiB")
+        col2.metric("Jumlah pesan", f"{len(result['elements']):,}")
+        df_type = pd.DataFrame(sorted(result["per_type"].items(), key=lambda item: item[1], reverse=True),
+                               columns=["Elemen", "Bytes"])
+        st.dataframe(df_type, use_container_width=True, hide_index=True)
+        st.subheader(f"{TOP_N} elemen terbesar")
+        df_elements = pd.DataFrame(result["elements"], columns=["Elemen", "Posisi", "Bytes", "Dari cache browser"])
+        st.dataframe(df_elements.sort_values("Bytes", ascending=False).head(TOP_N),
+                     use_container_width=True, hide_index=True)
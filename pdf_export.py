@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+SUMBER_DATA = "Sumber: Kelurahan Kubu Marapalam"
+
+FONT_FAMILY = "helvetica"
+CELL_PADDING = 3 # Ruang kosong (mm) di kiri-kanan teks dalam sel
+MIN_COL_WIDTH = 10
+
+
+def _to_latin1(values: pd.Series) -> pd.Series:
+    """Mengganti karakter di luar latin-1 (font bawaan FPDF) untuk satu kolom sekaligus."""
+    return values.str.encode('latin-1', 'replace').str.decode('latin-1')
+
+
+def _format_numbers(values: pd.Series, float_format: str = None) -> pd.Series:
+    """
+    Memformat kolom numerik: angka bulat ditulis tanpa ".0", angka desimal memakai float_format
+    (atau str() bawaan jika tidak diberikan), NaN menjadi teks kosong, dan ±inf ditulis apa adanya
+    ("inf"/"-inf", mis. hasil pembagian dengan nol).
+    """
+    numbers = values.astype(float)
+    array = numbers.to_numpy()
+    is_missing = numbers.isna().to_numpy()
+    is_finite = np.isfinite(array)
+    # Hanya angka bulat yang muat di int64 yang diubah ke int (inf/angka sangat besar tidak bisa di-cast)
+    finite = np.where(is_finite, array, 0)
+    is_integer = is_finite & (array == np.floor(finite)) & (np.abs(finite) < 2 ** 63)
+    is_infinite = ~is_missing & ~is_finite
+
+    formatted = pd.Series('', index=values.index, dtype=object)
+    if is_integer.any():
+        formatted[is_integer] = numbers[is_integer].astype(np.int64).astype(str)
+    if is_infinite.any():
+        formatted[is_infinite] = numbers[is_infinite].astype(str)
+    is_decimal = is_finite & ~is_integer
+    if is_decimal.any():
+        decimals = numbers[is_decimal]
+        formatted[is_decimal] = decimals.map(float_format.format) if float_format else decimals.astype(str)
+    return formatted
+
+
+def format_column(values: pd.Series, float_format: str = None) -> pd.Series:
+    """Mengubah satu kolom DataFrame menjadi teks siap cetak (sekali per kolom, bukan per sel)."""
+    if pd.api.types.is_bool_dtype(values):
+        formatted = values.astype(str)
+    elif pd.api.types.is_numeric_dtype(values):
+        formatted = _format_numbers(values, float_format)
+    elif values.dtype == object:
+        # Kolom campuran (mis. angka dan teks dari Google Sheet): hanya nilai int/float yang diformat ulang
+        is_number = values.map(lambda x: isinstance(x, (int, float, np.number)) and not isinstance(x, bool)).to_numpy(dtype=bool)
+        formatted = values.where(values.notna(), '').astype(str)
+        if is_number.any():
+            formatted[is_number] = _format_numbers(values[is_number], float_format)
+    else:
+        formatted = values.astype(str).where(values.notna(), '')
+    return _to_latin1(formatted.astype(str))
+
+
+def _text_widths(pdf: FPDF, values: pd.Series) -> np.ndarray:
+    """
+    Menghitung lebar cetak (mm) setiap teks dalam satu kolom memakai tabel lebar karakter font aktif.
+    Teks yang sama hanya diukur sekali.
+    """
+    if not len(values):
+        return np.zeros(0)
+    char_widths = pdf.current_font.cw
+    unique_texts, positions = np.unique(values.to_numpy(dtype=str), return_inverse=True)
+    unique_widths = np.array([sum(char_widths.get(ch, 500) for ch in text) for text in unique_texts], dtype=float)
+    return unique_widths[positions.ravel()] * pdf.font_size / 1000
+
+
+def _header_width(pdf: FPDF, header: str, font_size: float) -> float:
+    """Lebar kata terpanjang di header (header boleh dipecah menjadi beberapa baris)."""
+    pdf.set_font(FONT_FAMILY, "B", font_size)
+    return max(pdf.get_string_width(word) for word in (header.split() or [header]))
+
+
+def _fit_widths(widths, available_width):
+    """Mengecilkan kolom terlebar (bukan semua kolom) sampai total lebar muat di halaman."""
+    widths = [max(w, MIN_COL_WIDTH) for w in widths]
+    while sum(widths) > available_width + 0.01:
+        excess = sum(widths) - available_width
+        widest = max(widths)
+        candidates = [i for i, w in enumerate(widths) if w >= widest - 0.01]
+        second = max([w for w in widths if w < widest - 0.01], default=MIN_COL_WIDTH)
+        shrink = min(excess / len(candidates), widest - max(second, MIN_COL_WIDTH))
+        if shrink <= 0.01:
+            # Semua kolom sudah sama lebar: bagi rata sisa ruang
+            return [available_width / len(widths)] * len(widths)
+        for i in candidates:
+            widths[i] -= shrink
+    return widths
+
+
+def _truncate_to_width(values: pd.Series, text_widths: np.ndarray, width: float) -> pd.Series:
+    """Memotong teks yang lebih lebar dari kolomnya agar tidak menimpa kolom sebelah."""
+    usable = width - 2 * CELL_PADDING
+    too_long = text_widths > usable
+    if too_long.any():
+        values = values.copy()
+        # Perkiraan jumlah karakter yang muat, berdasarkan lebar rata-rata karakter teks tersebut
+        keep = np.maximum((usable / text_widths[too_long] * values[too_long].str.len().to_numpy()).astype(int) - 2, 1)
+        values[too_long] = [text[:n] + '..' for text, n in zip(values[too_long], keep)]
+    return values
+
+
+def _draw_header(pdf: FPDF, headers, widths, font_size, line_height):
+    """Mencetak baris header; semua sel header dibuat setinggi header yang paling banyak barisnya."""
+    pdf.set_font(FONT_FAMILY, "B", font_size)
+    n_lines = [
+        len(pdf.multi_cell(w, line_height, header, dry_run=True, output="LINES"))
+        for header, w in zip(headers, widths)
+    ]
+    header_height = max(n_lines) * line_height
+    x_start, y_start = pdf.get_x(), pdf.get_y()
+    x = x_start
+    for header, w, lines in zip(headers, widths, n_lines):
+        pdf.rect(x, y_start, w, header_height)
+        # Teks header diletakkan di tengah secara vertikal
+        pdf.set_xy(x, y_start + (header_height - lines * line_height) / 2)
+        pdf.multi_cell(w, line_height, header, border=0, align='C', new_x=XPos.RIGHT, new_y=YPos.TOP)
+        x += w
+    pdf.set_xy(x_start, y_start + header_height)
+
+
+def _draw_grid(pdf: FPDF, col_edges, y_top: float, y_bottom: float, row_height: float):
+    """Menggambar garis tabel untuk satu halaman sekaligus, bukan border per sel."""
+    y = y_top
+    while y <= y_bottom + 0.01:
+        pdf.line(col_edges[0], y, col_edges[-1], y)
+        y += row_height
+    for x in col_edges:
+        pdf.line(x, y_top, x, y_bottom)
+
+
+def draw_table(pdf: FPDF, df: pd.DataFrame, float_format: str = None,
+               header_font_size: float = 10, body_font_size: float = 9, row_height: float = 8):
+    """
+    Mencetak DataFrame sebagai tabel pada objek FPDF yang sudah ada.
+
+    Nilai diformat per kolom, lebar kolom dihitung dari data, dan header diulang
+    di setiap halaman baru jika tabel melewati batas halaman.
+    """
+    headers = _to_latin1(pd.Series([str(c) for c in df.columns], dtype=object)).tolist()
+    columns = [format_column(df[col], float_format) for col in df.columns]
+    numeric = [pd.api.types.is_numeric_dtype(df[col]) for col in df.columns]
+
+    header_widths = [_header_width(pdf, header, header_font_size) for header in headers]
+    pdf.set_font(FONT_FAMILY, "", body_font_size)
+    text_widths = [_text_widths(pdf, values) for values in columns]
+    natural = [
+        max(tw.max() if len(tw) else 0, hw) + 2 * CELL_PADDING
+        for tw, hw in zip(text_widths, header_widths)
+    ]
+    widths = _fit_widths(natural, pdf.w - pdf.l_margin - pdf.r_margin)
+    for j, (w, nat) in enumerate(zip(widths, natural)):
+        if w < nat - 0.01:
+            columns[j] = _truncate_to_width(columns[j], text_widths[j], w)
+            text_widths[j] = _text_widths(pdf, columns[j])
+
+    col_edges = np.concatenate([[pdf.l_margin], pdf.l_margin + np.cumsum(widths)]).tolist()
+    # Posisi x setiap teks: angka di tengah sel, teks rata kiri
+    x_positions = [
+        (col_edges[j] + (widths[j] - text_widths[j]) / 2) if numeric[j] else np.full(len(columns[j]), col_edges[j] + CELL_PADDING)
+        for j in range(len(columns))
+    ]
+    x_positions = [xs.tolist() for xs in x_positions]
+    rows_text = [values.tolist() for values in columns]
+    header_line_height = header_font_size * 0.5
+
+    auto_page_break, bottom_margin = pdf.auto_page_break, pdf.b_margin
+    pdf.set_auto_page_break(False)
+    y_limit = pdf.h - bottom_margin
+
+    pdf.set_x(pdf.l_margin)
+    _draw_header(pdf, headers, widths, header_font_size, header_line_height)
+    pdf.set_font(FONT_FAMILY, "", body_font_size)
+    baseline = row_height / 2 + 0.3 * pdf.font_size
+    y_top = y = pdf.get_y()
+    for i in range(len(df)):
+        if y + row_height > y_limit:
+            _draw_grid(pdf, col_edges, y_top, y, row_height)
+            pdf.add_page()
+            _draw_header(pdf, headers, widths, header_font_size, header_line_height)
+            pdf.set_font(FONT_FAMILY, "", body_font_size)
+            y_top = y = pdf.get_y()
+        for texts, xs in zip(rows_text, x_positions):
+            if texts[i]:
+                pdf.text(xs[i], y + baseline, texts[i])
+        y += row_height
+    _draw_grid(pdf, col_edges, y_top, y, row_height)
+    pdf.set_xy(pdf.l_margin, y)
+
+    pdf.set_auto_page_break(auto_page_break, bottom_margin)
+
+
+def table_to_pdf(df: pd.DataFrame, title: str, columns: dict = None, number_column: str = None,
+                 orientation: str = "P", float_format: str = None,
+                 header_font_size: float = 10, body_font_size: float = 9, row_height: float = 8) -> bytes:
+    """
+    Membuat file PDF berisi judul, tabel data, dan keterangan sumber.
+
+    columns: dict {nama kolom di DataFrame: judul kolom di PDF}; urutannya menjadi urutan kolom.
+             Jika None, semua kolom dicetak apa adanya.
+    number_column: nama kolom nomor urut yang ditambahkan di depan jika belum ada.
+    """
+    if columns is not None:
+        selected = [col for col in columns if col in df.columns]
+        df = df[selected].rename(columns=columns)
+    if number_column and number_column not in df.columns:
+        df = df.copy()
+        df.insert(0, number_column, range(1, 1 + len(df)))
+
+    pdf = FPDF(orientation=orientation, unit="mm", format="A4")
+    pdf.add_page()
+    pdf.set_font(FONT_FAMILY, "B", 12)
+    pdf.cell(0, 10, title, align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(5)
+
+    draw_table(pdf, df, float_format=float_format, header_font_size=header_font_size,
+               body_font_size=body_font_size, row_height=row_height)
+
+    pdf.set_y(pdf.get_y() + 5)
+    pdf.set_font(FONT_FAMILY, "I", 8)
+    pdf.cell(0, 10, SUMBER_DATA, align='C')
+    return bytes(pdf.output())
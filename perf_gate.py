@@ -0,0 +1,329 @@
+"""
+Gerbang regresi performa: menjalankan jalur utama dengan data sintetis tetap, lalu membandingkannya
+dengan kode pembanding yang diukur ulang di host yang sama, atau dengan baseline yang di-commit
+(perf_baseline.json). Berjalan offline (tanpa Google Sheets).
+
+Jalur yang diukur:
+    load_cold    seluruh loader dengan cache kosong (baca + pembersihan)
+    load_warm    seluruh loader dari st.cache_data
+    chart_build  seluruh grafik laporan sampai spesifikasi Vega-Lite
+    export_xlsx  to_excel seluruh dataset
+    export_pdf   df_to_pdf seluruh dataset
+    home_render  render penuh halaman Home (AppTest main.py, cache sudah terisi)
+
+Dua cara membandingkan:
+
+    --against REF  Commit REF di-checkout ke worktree sementara lalu diukur bergantian dengan kode
+                   sekarang pada run yang sama (--rounds putaran, masing-masing di proses baru, urutan
+                   dibalik setiap putaran: A B B A ...), sehingga gangguan host mengenai kedua sisi
+                   sama rata. Dipakai median, dan sebuah jalur dianggap regresi jika median naik melebihi
+                   --tolerance (default 20%) DAN bermakna secara statistik (uji Mann-Whitney satu sisi,
+                   p < --alpha). Cara ini yang dipakai di CI.
+    (tanpa)        Dibandingkan dengan perf_baseline.json. Sampel baseline berasal dari rekaman lain,
+                   sehingga uji statistik tidak berlaku (variasi antar-run bukan perbedaan kode). Yang
+                   dibandingkan waktu minimum dari N sampel (paling sedikit terganggu) dengan toleransi
+                   lebih lebar (default 50%). Hanya sebagai pemeriksaan kasar di mesin yang sama.
+
+    python perf_gate.py --against origin/main   # bandingkan dengan main, diukur ulang di host ini
+    python perf_gate.py                         # bandingkan dengan perf_baseline.json
+    python perf_gate.py --update-baseline       # simpan hasil sebagai baseline baru (lalu commit)
+
+Baseline bergantung pada mesin: rekam ulang setelah perubahan di jalur yang diukur, di mesin tempat
+gerbang dijalankan.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(ROOT, "perf_baseline.json")
+PATHS = ("load_cold", "load_warm", "chart_build", "export_xlsx", "export_pdf", "home_render")
+ROWS = 1_000 # Ukuran worksheet sintetis; tetap agar hasil antar-commit sebanding
+SEED = 0
+REPEAT = 15
+SAME_RUN_TOLERANCE = 0.20
+BASELINE_TOLERANCE = 0.50
+
+
+def _path_functions(datasets):
+    from datasets import load_dataset
+    from report import REPORT_SECTIONS, chart_spec
+    from loadtest import render
+
+    def load_cold():
+        for dataset in datasets:
+            dataset["loader"].clear()
+        for dataset in datasets:
+            load_dataset(dataset)
+
+    def load_warm():
+        for dataset in datasets:
+            load_dataset(dataset)
+
+    def chart_build():
+        frames = {dataset["slug"]: load_dataset(dataset) for dataset in datasets}
+        for section in REPORT_SECTIONS:
+            chart_spec(section["chart"](frames[section["dataset"]]))
+
+    def export(fmt):
+        def run():
+            for dataset in datasets:
+                df = load_dataset(dataset)
+                (dataset["page"].to_excel if fmt == "xlsx" else dataset["page"].df_to_pdf)(df)
+        return run
+
+    def home_render():
+        _, _, error = render("Home", timeout=120)
+        if error:
+            raise RuntimeError(f"Render Home gagal: {error}")
+
+    return {"load_cold": load_cold, "load_warm": load_warm, "chart_build": chart_build,
+            "export_xlsx": export("xlsx"), "export_pdf": export("pdf"), "home_render": home_render}
+
+
+def measure(paths, repeat: int, rows: int = ROWS, seed: int = SEED) -> dict:
+    """Waktu (detik) setiap jalur sebanyak `repeat` sampel, setelah satu putaran pemanasan."""
+    from datasets import DATASETS
+    from loadtest import _install_page_selector
+    from synthetic_data import generate_all, install_fake_source
+
+    install_fake_source(generate_all(rows, seed))
+    _install_page_selector()
+    functions = _path_functions(DATASETS)
+    samples = {}
+    for path in paths:
+        functions[path]() # Pemanasan: impor, kompilasi, dan cache pertama tidak ikut diukur
+        samples[path] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            functions[path]()
+            samples[path].append(round(time.perf_counter() - started, 6))
+        print(f"[diukur] {path}: median {statistics.median(samples[path]) * 1000:.1f} ms", file=sys.stderr)
+    return samples
+
+
+def mann_whitney_greater(current, baseline) -> float:
+    """
+    p-value satu sisi uji Mann-Whitney U (pendekatan normal, dengan koreksi ties dan kontinuitas)
+    untuk hipotesis: sampel `current` cenderung lebih besar daripada `baseline`.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _measure_in_subprocess(source: str, paths, repeat: int) -> dict:
+    """Mengukur kode di folder source dalam proses Python baru; mengembalikan sampel per jalur."""
+    command = [sys.executable, os.path.abspath(__file__), "--measure-only", "--source", source,
+               "--paths", ",".join(paths), "--repeat", str(repeat)]
+    result = subprocess.run(command, cwd=source, stdout=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Pengukuran di {source} gagal (kode keluar {result.returncode}).")
+    return json.loads(result.stdout)
+
+
+def measure_against(ref: str, paths, repeat: int, rounds: int):
+    """
+    Mengukur kode sekarang dan commit ref bergantian di host yang sama.
+    Mengembalikan (sampel sekarang, sampel ref), masing-masing kurang lebih `repeat` sampel per jalur.
+    """
+    per_round = max(1, math.ceil(repeat / rounds))
+    tree = tempfile.mkdtemp(prefix="perf_gate_ref_")
+    subprocess.run(["git", "worktree", "add", "--detach", tree, ref], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL)
+    current = {path: [] for path in paths}
+    reference = {path: [] for path in paths}
+    try:
+        for i in range(rounds):
+            print(f"[putaran {i + 1}/{rounds}]", file=sys.stderr)
+            order = [(ROOT, current), (tree, reference)]
+            for source, target in (order if i % 2 == 0 else order[::-1]):
+                for path, values in _measure_in_subprocess(source, paths, per_round).items():
+                    target[path].extend(values)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", tree], cwd=ROOT, stdout=subprocess.DEVNULL)
+        shutil.rmtree(tree, ignore_errors=True)
+    return current, reference
+
+
+def compare(samples: dict, reference: dict, tolerance: float, alpha: float, same_run: bool) -> list:
+    """
+    Satu baris perbandingan per jalur: {path, baseline_ms, current_ms, change, p_value, status}.
+    same_run: sampel reference diukur bergantian pada run yang sama (median + uji Mann-Whitney);
+    jika tidak, dibandingkan waktu minimum tanpa uji statistik.
+    """
+    statistic = statistics.median if same_run else min
+    rows = []
+    for path, current in samples.items():
+        base = reference.get(path)
+        current_value = statistic(current)
+        if not base:
+            rows.append({"path": path, "baseline_ms": None, "current_ms": current_value * 1000, "change": None,
+                         "p_value": None, "status": "baru"})
+            continue
+        base_value = statistic(base)
+        change = current_value / base_value - 1 if base_value else 0.0
+        p_value = mann_whitney_greater(current, base) if same_run else None
+        if change > tolerance and (p_value is None or p_value < alpha):
+            status = "REGRESI"
+        elif change < -tolerance and (not same_run or mann_whitney_greater(base, current) < alpha):
+            status = "lebih cepat"
+        else:
+            status = "ok"
+        rows.append({"path": path, "baseline_ms": base_value * 1000, "current_ms": current_value * 1000,
+                     "change": change, "p_value": p_value, "status": status})
+    return rows
+
+
+def format_table(rows, same_run: bool) -> str:
+    label = "median" if same_run else "minimum"
+    header = f"{'jalur':<13} {'pembanding':>11} {'sekarang':>11} {'perubahan':>10} {'p':>7}  status ({label})"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        baseline = f"{row['baseline_ms']:.1f} ms" if row["baseline_ms"] is not None else "-"
+        change = f"{row['change'] * 100:+.1f}%" if row["change"] is not None else "-"
+        p_value = f"{row['p_value']:.3f}" if row["p_value"] is not None else "-"
+        lines.append(f"{row['path']:<13} {baseline:>11} {row['current_ms']:>8.1f} ms {change:>10} {p_value:>7}  {row['status']}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gerbang regresi performa.")
+    parser.add_argument("--against", metavar="REF",
+                        help="commit/branch pembanding yang diukur ulang bergantian di host ini (disarankan)")
+    parser.add_argument("--rounds", type=int, default=4, help="jumlah putaran bergantian untuk --against (default: 4)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="file baseline (default: perf_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="simpan hasil pengukuran sebagai baseline")
+    parser.add_argument("--paths", default=",".join(PATHS), help=f"jalur dipisah koma, pilihan: {', '.join(PATHS)}")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"jumlah sampel per jalur (default: {REPEAT})")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help=f"kenaikan yang masih diterima (default: {SAME_RUN_TOLERANCE} dengan --against, "
+                             f"{BASELINE_TOLERANCE} terhadap baseline)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="batas p-value uji statistik (default: 0.05)")
+    # Dipakai oleh --against: mengukur kode di folder lain lalu mencetak sampel sebagai JSON
+    parser.add_argument("--measure-only", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--source", default=ROOT, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    args.paths = [path.strip() for path in args.paths.split(",") if path.strip()]
+    unknown = [path for path in args.paths if path not in PATHS]
+    if unknown:
+        parser.error(f"jalur tidak dikenal: {', '.join(unknown)}")
+    if args.repeat < 3 and not args.measure_only:
+        parser.error("--repeat minimal 3 agar perbandingan bermakna")
+    if args.rounds < 1:
+        parser.error("--rounds minimal 1")
+    if args.tolerance is None:
+        args.tolerance = SAME_RUN_TOLERANCE if args.against else BASELINE_TOLERANCE
+    return args
+
+
+def _measure_here(paths, repeat: int) -> dict:
+    # Snapshot versi data sintetis tidak boleh bercampur dengan snapshot data asli
+    snapshot_dir = tempfile.mkdtemp(prefix="perf_gate_snapshots_")
+    os.environ["SNAPSHOT_DIR"] = snapshot_dir
+
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    try:
+        return measure(paths, repeat)
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.measure_only:
+        sys.path.insert(0, os.path.abspath(args.source)) # Modul aplikasi diimpor dari folder yang diukur
+        with contextlib.redirect_stdout(sys.stderr): # stdout hanya untuk hasil JSON
+            samples = _measure_here(args.paths, args.repeat)
+        json.dump(samples, sys.stdout)
+        return 0
+
+    if args.against:
+        try:
+            samples, reference = measure_against(args.against, args.paths, args.repeat, args.rounds)
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            print(f"Pembanding {args.against} tidak bisa diukur: {e}", file=sys.stderr)
+            return 2
+        rows = compare(samples, reference, args.tolerance, args.alpha, same_run=True)
+        return _report(rows, args, f"{args.against} (diukur ulang)", same_run=True)
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} belum ada; jalankan dengan --update-baseline atau pakai --against.",
+              file=sys.stderr)
+        return 2
+
+    samples = _measure_here(args.paths, args.repeat)
+
+    if args.update_baseline:
+        baseline = {
+            "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "rows": ROWS, "seed": SEED,
+            "paths": {path: {"samples": values} for path, values in samples.items()},
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline disimpan: {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline.get("platform"), baseline.get("python")) != (platform.platform(), platform.python_version()):
+        print(f"Peringatan: baseline direkam di {baseline.get('platform')} / Python {baseline.get('python')}; "
+              "hasil tidak sebanding. Pakai --against.", file=sys.stderr)
+    reference = {path: entry["samples"] for path, entry in baseline.get("paths", {}).items()}
+    rows = compare(samples, reference, args.tolerance, args.alpha, same_run=False)
+    return _report(rows, args, f"baseline {baseline.get('generated_at', '?')}", same_run=False)
+
+
+def _report(rows, args, reference_label: str, same_run: bool) -> int:
+    print(f"Pembanding: {reference_label}")
+    print(format_table(rows, same_run))
+    regressed = [row["path"] for row in rows if row["status"] == "REGRESI"]
+    if regressed:
+        condition = f"median naik > {args.tolerance:.0%}, p < {args.alpha}" if same_run \
+            else f"waktu minimum naik > {args.tolerance:.0%}"
+        print(f"\nRegresi performa: {', '.join(regressed)} ({condition})")
+        return 1
+    print("\nTidak ada regresi performa.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Mode profil untuk satu kali render halaman (khusus admin).
+
+Aktif jika URL memuat ?profil=<token> dengan token sama dengan PROFILE_TOKEN
+(variabel lingkungan) atau `profile_token` di .streamlit/secrets.toml. Tanpa token,
+mode profil tidak bisa dinyalakan.
+
+Selama render, thread pengambil sampel mencatat stack thread halaman setiap SAMPLE_INTERVAL
+detik, dan tracemalloc mencatat alokasi memori. Hasilnya ditampilkan di bawah halaman
+(flame graph + tabel fungsi teratas) dan disimpan ke PROFILE_DIR:
+    <waktu>_<halaman>.folded   stack terlipat (format flamegraph.pl / speedscope)
+    <waktu>_<halaman>.json     ringkasan waktu dan memori
+"""
+import datetime
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+QUERY_PARAM = "profil"
+SAMPLE_INTERVAL = 0.005 # detik
+MAX_PROFILE_SECONDS = 120 # Pengaman: pengambilan sampel berhenti sendiri jika render tidak selesai
+TOP_N = 25
+FLAME_MIN_FRACTION = 0.005 # Kotak flame graph yang lebih sempit dari 0,5% tidak digambar
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_active = None # Hanya satu profil berjalan pada satu waktu (tracemalloc berlaku untuk seluruh proses)
+_active_lock = threading.Lock()
+
+
+def _profile_token() -> str:
+    token = os.environ.get("PROFILE_TOKEN", "")
+    if not token:
+        try:
+            token = st.secrets.get("profile_token", "")
+        except Exception: # Tidak ada secrets.toml
+            token = ""
+    return str(token)
+
+
+def profiling_requested() -> bool:
+    token = _profile_token()
+    requested = st.query_params.get(QUERY_PARAM, "")
+    return bool(token) and hmac.compare_digest(requested.encode("utf-8"), token.encode("utf-8"))
+
+
+def _is_project_file(filename: str) -> bool:
+    return filename.startswith(PROJECT_ROOT) and "site-packages" not in filename
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class PageProfile:
+    """Profil satu render halaman: sampel stack (waktu) dan tracemalloc (memori)."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="page-profiler", daemon=True)
+
+    def start(self):
+        self.started_at = datetime.datetime.now()
+        self._started = time.perf_counter()
+        tracemalloc.start()
+        self._sampler.start()
+
+    def _sample(self):
+        deadline = time.monotonic() + MAX_PROFILE_SECONDS
+        while not self._stop.wait(SAMPLE_INTERVAL) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # Mulai dari frame pertama milik proyek ini (bagian dalam Streamlit di atasnya diabaikan)
+            stack.reverse()
+            start = next((i for i, code in enumerate(stack) if _is_project_file(code.co_filename)), None)
+            if start is None:
+                continue
+            self.stacks[tuple(stack[start:])] += 1
+            self.samples += 1
+        if not self._stop.is_set(): # Batas waktu tercapai: render tidak pernah memanggil finish()
+            self._release()
+
+    def _release(self):
+        global _active
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        with _active_lock:
+            if _active is self:
+                _active = None
+
+    def finish(self) -> dict:
+        """Menghentikan profil, menyimpan hasilnya ke disk, dan mengembalikan ringkasan."""
+        self._stop.set()
+        self._sampler.join()
+        duration = time.perf_counter() - self._started
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        self._release()
+
+        memory = []
+        if snapshot is not None:
+            # Alokasi milik tracemalloc dan pengambil sampel sendiri tidak ikut dihitung
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                               tracemalloc.Filter(False, __file__)])
+            for stat in snapshot.statistics("lineno")[:TOP_N]:
+                frame = stat.traceback[0]
+                memory.append({"Lokasi": f"{frame.filename}:{frame.lineno}", "Ukuran (KiB)": round(stat.size / 1024, 1),
+                               "Jumlah Blok": stat.count})
+
+        # Stack disimpan sebagai objek kode saat sampling (murah), diubah menjadi label sekali di sini
+        labels = {}
+        self.stacks = Counter({
+            tuple(labels.setdefault(code, _frame_label(code)) for code in stack): count
+            for stack, count in self.stacks.items()
+        })
+
+        result = {
+            "page": self.page, "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_s": round(duration, 3), "samples": self.samples, "sample_interval_s": SAMPLE_INTERVAL,
+            "memory_current_bytes": current, "memory_peak_bytes": peak,
+            "functions": function_table(self.stacks), "memory": memory,
+        }
+        result["files"] = self._save(result)
+        result["stacks"] = self.stacks
+        return result
+
+    def _save(self, result: dict) -> list:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f"{self.started_at:%Y%m%d-%H%M%S}_{re.sub(r'[^0-9A-Za-z]+', '_', self.page).strip('_')}")
+        with open(f"{stem}.folded", "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(label.replace(";", ",") for label in stack) + f" {count}\n")
+        with open(f"{stem}.json", "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        return [f"{stem}.folded", f"{stem}.json"]
+
+
+def start_page_profile(page: str):
+    """Memulai profil render halaman jika diminta lewat URL; None jika tidak diminta atau profil lain sedang berjalan."""
+    global _active
+    if not profiling_requested():
+        return None
+    profile = PageProfile(page)
+    with _active_lock:
+        if _active is not None:
+            st.warning("Profil lain sedang berjalan; coba muat ulang halaman sebentar lagi.")
+            return None
+        _active = profile
+    profile.start()
+    return profile
+
+
+def function_table(stacks: Counter) -> list:
+    """Jumlah sampel per fungsi: self (fungsi itu sendiri yang berjalan) dan total (termasuk yang dipanggilnya)."""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        own[stack[-1]] += count
+        for label in set(stack):
+            total[label] += count
+    n = sum(stacks.values()) or 1
+    return [
+        {"Fungsi": label, "Self (%)": round(own[label] / n * 100, 1), "Total (%)": round(count / n * 100, 1),
+         "Sampel": count}
+        for label, count in total.most_common(TOP_N)
+    ]
+
+
+def flame_frame(stacks: Counter) -> pd.DataFrame:
+    """Kotak-kotak flame graph: satu baris per (kedalaman, fungsi) dengan posisi awal/akhir dalam persen sampel."""
+    n = sum(stacks.values())
+    rows = []
+
+    def add(node_stacks, depth, start):
+        children = {}
+        for stack, count in node_stacks:
+            if len(stack) > depth:
+                children.setdefault(stack[depth], []).append((stack, count))
+        for label in sorted(children):
+            width = sum(count for _, count in children[label])
+            if width / n >= FLAME_MIN_FRACTION:
+                rows.append({"Fungsi": label, "Kedalaman": depth, "Awal": start / n * 100,
+                             "Akhir": (start + width) / n * 100, "Sampel": width})
+                add(children[label], depth + 1, start)
+            start += width
+
+    if n:
+        add(list(stacks.items()), 0, 0)
+    return pd.DataFrame(rows, columns=["Fungsi", "Kedalaman", "Awal", "Akhir", "Sampel"])
+
+
+def show_profile(result: dict):
+    """Menampilkan hasil profil di bawah halaman."""
+    with st.expander(f"⏱️ Profil render: {result['page']}", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Durasi render", f"{result['duration_s']:.2f} s")
+        col2.metric("Sampel", f"{result['samples']:,}")
+        col3.metric("Puncak memori (tracemalloc)", f"{result['memory_peak_bytes'] / 1024 / 1024:.1f} MiB")
+
+        df_flame = flame_frame(result["stacks"])
+        if not df_flame.empty:
+            chart = alt.Chart(df_flame).mark_rect(stroke="white").encode(
+                x=alt.X("Awal:Q", title="% sampel", scale=alt.Scale(domain=[0, 100])),
+                x2="Akhir:Q",
+                y=alt.Y("Kedalaman:O", title=None, axis=None, sort="descending"),
+                color=alt.Color("Kedalaman:O", legend=None, scale=alt.Scale(scheme="orangered")),
+                tooltip=["Fungsi:N", "Sampel:Q", alt.Tooltip("Awal:Q", format=".1f"), alt.Tooltip("Akhir:Q", format=".1f")]
+            ).properties(height=max(120, 18 * (int(df_flame["Kedalaman"].max()) + 1)), title="Flame graph")
+            st.altair_chart(chart, use_container_width=True)
+        else:
+            st.info("Render terlalu singkat untuk diambil sampelnya.")
+
+        st.subheader(f"{TOP_N} fungsi teratas")
+        st.dataframe(pd.DataFrame(result["functions"]), use_container_width=True, hide_index=True)
+        st.subheader("Alokasi memori teratas")
+        st.dataframe(pd.DataFrame(result["memory"]), use_container_width=True, hide_index=True)
+        st.caption("Profil disimpan di: " + ", ".join(result["files"]))
@@ -0,0 +1,189 @@
+import datetime
+import hashlib
+import json
+import os
+import struct
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from datasets import get_dataset, load_dataset
+from exports import dataset_version, get_export_bytes
+from pdf_export import FONT_FAMILY, SUMBER_DATA, draw_table
+from pages.jumlah_penduduk import get_penduduk_tahun_chart
+from pages.jumlah_penduduk_pendidikan import get_pendidikan_chart
+from pages.jenis_pekerjaan_dominan import get_jenis_pekerjaan_chart
+from pages.jenis_tanah import get_jenis_tanah_chart
+from pages.jumlah_industri_umkm import get_umkm_chart
+from pages.jumlah_kk_menurut_rw import get_kk_rw_chart
+from pages.jumlah_penduduk_status_pekerja import get_status_pekerja_chart
+from pages.penduduk_disabilitas import get_disabilitas_chart
+from pages.penduduk_menurut_jenis_kelamin import get_penduduk_jenis_kelamin_chart1
+from pages.sarana_dan_prasarana import get_sarana_prasarana_chart
+from pages.sarana_kebersihan import get_sarana_kebersihan_chart
+from pages.tenaga_kerja import get_tenaga_kerja_chart
+
+REPORT_TITLE = "Laporan Data Kelurahan Kubu Marapalam"
+
+# Folder cache gambar grafik (nama file = hash spesifikasi Vega-Lite)
+CHART_CACHE_DIR = os.path.join(".cache", "charts")
+CHART_WIDTH = 700 # Lebar grafik (px) jika spesifikasi tidak menentukan lebar
+CHART_SCALE = 2 # Resolusi gambar PNG (2x agar tetap tajam saat dicetak)
+
+# Urutan bagian laporan mengikuti urutan tile di halaman Home.
+# Tile "Jumlah KK dan Penduduk Menurut Jenis Kelamin per RW" di Home adalah grafik silang interaktif
+# (klik RW untuk menyaring) dari dua dataset. Di PDF seleksi tidak bisa dipakai, jadi tile itu dicetak
+# sebagai dua grafik sumbernya: bagian "Jumlah KK Menurut RW" dan "Jumlah Penduduk Menurut Jenis Kelamin"
+# (sama dengan tampilan Home jika salah satu worksheet kosong), sehingga setiap grafik di Home punya
+# bagiannya sendiri. Slideshow infografis (dinonaktifkan di Home) berisi gambar tanpa dataset dan tidak dicetak.
+#   chart   : fungsi get_*_chart(df) yang membuat grafik Altair (atau None) dari df yang diberikan,
+#             sehingga data tidak dimuat ulang oleh fungsi grafiknya
+#   dataset : slug di datasets.DATASETS untuk tabel datanya
+REPORT_SECTIONS = [
+    {"title": "Trend Jumlah Penduduk", "chart": get_penduduk_tahun_chart, "dataset": "jumlah_penduduk"},
+    {"title": "Distribusi Pendidikan", "chart": get_pendidikan_chart, "dataset": "pendidikan"},
+    {"title": "Jenis Pekerjaan Dominan", "chart": get_jenis_pekerjaan_chart, "dataset": "jenis_pekerjaan"},
+    {"title": "Perbandingan Jenis Tanah", "chart": get_jenis_tanah_chart, "dataset": "jenis_tanah"},
+    {"title": "Jumlah Industri UMKM", "chart": get_umkm_chart, "dataset": "umkm"},
+    {"title": "Proporsi Status Pekerja", "chart": get_status_pekerja_chart, "dataset": "status_pekerja"},
+    {"title": "Jumlah Disabilitas", "chart": get_disabilitas_chart, "dataset": "disabilitas"},
+    {"title": "Jumlah KK Menurut RW", "chart": get_kk_rw_chart, "dataset": "kk_rw"},
+    {"title": "Jumlah Penduduk Menurut Jenis Kelamin", "chart": get_penduduk_jenis_kelamin_chart1, "dataset": "jenis_kelamin"},
+    {"title": "Sarana dan Prasarana", "chart": get_sarana_prasarana_chart, "dataset": "sarana_prasarana"},
+    {"title": "Sarana Kebersihan", "chart": get_sarana_kebersihan_chart, "dataset": "sarana_kebersihan"},
+    {"title": "Tenaga Kerja", "chart": get_tenaga_kerja_chart, "dataset": "tenaga_kerja"},
+]
+
+
+def chart_spec(chart) -> dict:
+    """Spesifikasi Vega-Lite (dengan data) dari grafik Altair, diberi lebar tetap untuk dirender offline."""
+    spec = chart.to_dict()
+    # Lebar 'container' hanya berlaku di browser; grafik gabungan (concat/facet) mengatur lebarnya sendiri
+    if ("mark" in spec or "layer" in spec) and spec.get("width") in (None, "container"):
+        spec["width"] = CHART_WIDTH
+    return spec
+
+
+def spec_hash(spec: dict) -> str:
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def render_chart_png(spec: dict, cache_dir: str = CHART_CACHE_DIR):
+    """
+    Merender spesifikasi Vega-Lite menjadi file PNG tanpa browser (vl-convert-python).
+    Gambar disimpan per hash spesifikasi, jadi hanya grafik yang datanya berubah yang dirender ulang.
+    Mengembalikan path PNG, atau None jika vl-convert-python belum terpasang.
+    """
+    path = os.path.join(cache_dir, f"{spec_hash(spec)}.png")
+    if os.path.exists(path):
+        return path
+    try:
+        import vl_convert as vlc
+    except ImportError:
+        return None
+    png = vlc.vegalite_to_png(spec, scale=CHART_SCALE)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Tulis ke file sementara dulu agar proses lain tidak membaca PNG yang belum lengkap
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _png_size(path: str):
+    """Ukuran (lebar, tinggi) piksel dari header PNG."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+def build_sections(sections=REPORT_SECTIONS):
+    """
+    Menyiapkan isi laporan di thread Streamlit (memakai cache load_*()):
+    list berisi dict {title, spec, table}. Hasilnya bisa dikirim ke pool proses.
+    """
+    prepared = []
+    for section in sections:
+        dataset = get_dataset(section["dataset"])
+        df = load_dataset(dataset)
+        chart = section["chart"](df) if not df.empty else None
+        table = dataset["excel_frame"](df) if dataset["excel_frame"] is not None and not df.empty else df
+        prepared.append({
+            "title": section["title"],
+            "spec": chart_spec(chart) if chart is not None else None,
+            "table": table,
+        })
+    return prepared
+
+
+def report_version(sections) -> str:
+    """Kunci cache laporan: hanya isi (judul, grafik, data); tanggal pembuatan cukup tercetak di halaman judul."""
+    digest = hashlib.sha1()
+    for section in sections:
+        digest.update(section["title"].encode("utf-8"))
+        digest.update((spec_hash(section["spec"]) if section["spec"] else "-").encode("utf-8"))
+        digest.update(dataset_version(section["table"]).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _draw_chart(pdf: FPDF, spec: dict):
+    path = render_chart_png(spec)
+    if path is None:
+        pdf.set_font(FONT_FAMILY, "I", 9)
+        pdf.cell(0, 8, "Grafik tidak dapat dibuat: paket 'vl-convert-python' belum terpasang.",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        return
+    px_width, px_height = _png_size(path)
+    available = pdf.w - pdf.l_margin - pdf.r_margin
+    width = min(available, px_width / CHART_SCALE * 0.2646) # px -> mm (96 dpi)
+    height = width * px_height / px_width
+    if pdf.get_y() + height > pdf.h - pdf.b_margin:
+        pdf.add_page()
+    pdf.image(path, x=pdf.l_margin + (available - width) / 2, y=pdf.get_y(), w=width, h=height)
+    pdf.set_y(pdf.get_y() + height + 4)
+
+
+def render_report(sections) -> bytes:
+    """Menyusun PDF laporan: halaman judul, lalu grafik dan tabel data setiap bagian."""
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+
+    pdf.add_page()
+    pdf.set_font(FONT_FAMILY, "B", 18)
+    pdf.ln(60)
+    pdf.cell(0, 12, REPORT_TITLE, align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(FONT_FAMILY, "", 11)
+    pdf.cell(0, 8, f"Dibuat pada {datetime.date.today():%d-%m-%Y}", align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    pdf.set_font(FONT_FAMILY, "", 10)
+    for number, section in enumerate(sections, start=1):
+        pdf.cell(0, 7, f"{number}. {section['title']}", align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    for number, section in enumerate(sections, start=1):
+        pdf.add_page()
+        pdf.set_font(FONT_FAMILY, "B", 13)
+        pdf.cell(0, 10, f"{number}. {section['title']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(2)
+
+        if section["table"].empty:
+            pdf.set_font(FONT_FAMILY, "I", 9)
+            pdf.cell(0, 8, "Data tidak tersedia.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            continue
+        if section["spec"] is not None:
+            _draw_chart(pdf, section["spec"])
+        # Tabel dimulai di halaman baru jika sisa ruang tidak cukup untuk header dan beberapa baris
+        if pdf.get_y() + 30 > pdf.h - pdf.b_margin:
+            pdf.add_page()
+        draw_table(pdf, section["table"], header_font_size=8, body_font_size=7, row_height=6)
+
+    pdf.ln(5)
+    pdf.set_font(FONT_FAMILY, "I", 8)
+    pdf.cell(0, 10, SUMBER_DATA, align='C')
+    return bytes(pdf.output())
+
+
+def build_report(owner=None) -> bytes:
+    """Laporan lengkap untuk tombol unduh; hasilnya di-cache per versi data."""
+    sections = build_sections()
+    return get_export_bytes("laporan_lengkap", "pdf", render_report, sections, report_version(sections), owner=owner)
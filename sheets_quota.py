@@ -0,0 +1,267 @@
+"""
+Pembatas laju permintaan ke Google Sheets agar kuota per menit tidak terlewati.
+
+Google Sheets API membatasi permintaan baca dan tulis per menit (default 60 per menit per pengguna,
+300 per menit per project). Jika terlewati, conn.read gagal (HTTP 429) dan halaman menjadi kosong.
+get_gsheets_connection() membungkus koneksinya dengan ThrottledConnection sehingga setiap read/write:
+
+    dihitung   dalam jendela geser 60 detik, terpisah untuk baca dan tulis
+    ditunda    jika jatah menit ini sudah habis, sampai permintaan tertua keluar dari jendela
+    digabung   pembacaan yang sama (worksheet + kolom) yang sedang berjalan tidak dikirim ulang;
+               pemanggil berikutnya menunggu dan memakai hasil yang sama
+    dicoba ulang  jika Google tetap menolak karena kuota: jatah diturunkan separuhnya, semua permintaan
+               ditahan sebentar, lalu jatah dinaikkan lagi bertahap setiap menit tanpa penolakan
+
+Prioritas:
+    interaktif  pemanggilan dari render halaman (ada ScriptRunContext Streamlit); boleh memakai seluruh jatah
+                dan didahulukan saat ada antrean. Jika menunggu lebih dari SHEETS_INTERACTIVE_MAX_WAIT_S,
+                permintaan tetap dikirim (lebih baik mencoba daripada halaman kosong).
+    latar       tanpa ScriptRunContext (API data, CLI, ekspor massal) atau di dalam background_priority();
+                hanya boleh memakai SHEETS_BACKGROUND_SHARE dari jatah dan gagal dengan QuotaExceeded
+                jika menunggu lebih dari SHEETS_BACKGROUND_MAX_WAIT_S.
+
+Variabel lingkungan:
+    SHEETS_READ_QUOTA_PER_MINUTE    kuota baca per menit (default 60)
+    SHEETS_WRITE_QUOTA_PER_MINUTE   kuota tulis per menit (default 60)
+    SHEETS_QUOTA_MARGIN             bagian kuota yang dipakai (default 0.9, sisanya cadangan)
+    SHEETS_BACKGROUND_SHARE         bagian jatah untuk permintaan latar (default 0.5)
+    SHEETS_INTERACTIVE_MAX_WAIT_S   default 15
+    SHEETS_BACKGROUND_MAX_WAIT_S    default 120
+"""
+import contextlib
+import contextvars
+import math
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from log_throttle import warn_throttled
+from metrics import observe_sheets_request, observe_sheets_coalesced
+
+WINDOW_SECONDS = 60.0
+READ_QUOTA_PER_MINUTE = int(os.environ.get("SHEETS_READ_QUOTA_PER_MINUTE", 60))
+WRITE_QUOTA_PER_MINUTE = int(os.environ.get("SHEETS_WRITE_QUOTA_PER_MINUTE", 60))
+QUOTA_MARGIN = float(os.environ.get("SHEETS_QUOTA_MARGIN", 0.9))
+BACKGROUND_SHARE = float(os.environ.get("SHEETS_BACKGROUND_SHARE", 0.5))
+INTERACTIVE_MAX_WAIT = float(os.environ.get("SHEETS_INTERACTIVE_MAX_WAIT_S", 15))
+BACKGROUND_MAX_WAIT = float(os.environ.get("SHEETS_BACKGROUND_MAX_WAIT_S", 120))
+BACKOFF_SECONDS = 5.0 # Jeda setelah penolakan kuota pertama; berlipat dua untuk penolakan berikutnya
+MAX_BACKOFF_SECONDS = 60.0
+MAX_RETRIES = 2
+RECOVERY_STEP = 0.1 # Bagian kapasitas yang dikembalikan setiap menit tanpa penolakan
+
+INTERACTIVE = "interaktif"
+BACKGROUND = "latar"
+WRITE_METHODS = ("write", "update", "create", "clear")
+
+_priority = contextvars.ContextVar("sheets_priority", default=None)
+_logger = logging.getLogger(__name__)
+
+
+class QuotaExceeded(Exception):
+    """Permintaan latar tidak mendapat jatah kuota dalam batas waktu tunggunya."""
+
+
+def current_priority() -> str:
+    explicit = _priority.get()
+    if explicit is not None:
+        return explicit
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    return INTERACTIVE if get_script_run_ctx(suppress_warning=True) is not None else BACKGROUND
+
+
+@contextlib.contextmanager
+def background_priority():
+    """Permintaan di dalam blok ini dihitung sebagai latar walaupun berjalan di dalam render halaman."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_quota_error(error: Exception) -> bool:
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    text = str(error)
+    return any(marker in text for marker in ("429", "Quota exceeded", "RESOURCE_EXHAUSTED", "RATE_LIMIT_EXCEEDED"))
+
+
+class QuotaLimiter:
+    """Jendela geser 60 detik dengan jatah yang menyesuaikan diri setelah penolakan kuota (AIMD)."""
+
+    def __init__(self, kind: str, per_minute: int):
+        self.kind = kind
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * QUOTA_MARGIN)
+        self._limit = self.capacity
+        self._times = deque() # Waktu (monotonic) permintaan dalam jendela
+        self._cond = threading.Condition()
+        self._waiting_interactive = 0
+        self._blocked_until = 0.0
+        self._penalties = 0
+        self._last_adjust = 0.0
+        self.requests = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.waited_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.quota_errors = 0
+
+    def _allowance(self, priority: str) -> int:
+        share = 1.0 if priority == INTERACTIVE else BACKGROUND_SHARE
+        return max(1, math.floor(self._limit * share))
+
+    def _expire(self, now: float):
+        while self._times and self._times[0] <= now - WINDOW_SECONDS:
+            self._times.popleft()
+        # Pulih bertahap: setiap menit penuh tanpa penolakan menambah RECOVERY_STEP dari kapasitas
+        if self._limit < self.capacity and now - self._last_adjust >= WINDOW_SECONDS:
+            steps = int((now - self._last_adjust) // WINDOW_SECONDS)
+            self._limit = min(self.capacity, self._limit + steps * RECOVERY_STEP * self.capacity)
+            self._last_adjust += steps * WINDOW_SECONDS
+            if self._limit >= self.capacity:
+                self._penalties = 0
+
+    def acquire(self, priority: str) -> float:
+        """Menunggu jatah untuk satu permintaan; mengembalikan lama menunggu (detik)."""
+        started = time.monotonic()
+        deadline = started + (INTERACTIVE_MAX_WAIT if priority == INTERACTIVE else BACKGROUND_MAX_WAIT)
+        with self._cond:
+            if priority == INTERACTIVE:
+                self._waiting_interactive += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._expire(now)
+                    allowed = (now >= self._blocked_until and len(self._times) < self._allowance(priority)
+                               and (priority == INTERACTIVE or not self._waiting_interactive))
+                    if allowed or (priority == INTERACTIVE and now >= deadline):
+                        self._times.append(now)
+                        waited = now - started
+                        self.requests[priority] += 1
+                        self.waited_seconds[priority] += waited
+                        return waited
+                    if now >= deadline:
+                        raise QuotaExceeded(f"Kuota {self.kind} Google Sheets habis; permintaan latar menunggu "
+                                            f"lebih dari {BACKGROUND_MAX_WAIT:.0f} detik.")
+                    wake = max(self._blocked_until - now,
+                               self._times[0] + WINDOW_SECONDS - now if self._times else 0.0, 0.05)
+                    self._cond.wait(min(wake, deadline - now))
+            finally:
+                if priority == INTERACTIVE:
+                    self._waiting_interactive -= 1
+                self._cond.notify_all()
+
+    def penalize(self) -> float:
+        """Google menolak karena kuota: jatah dipotong separuh dan semua permintaan ditahan sebentar."""
+        with self._cond:
+            now = time.monotonic()
+            self._penalties += 1
+            self.quota_errors += 1
+            self._limit = max(1.0, self._limit / 2)
+            self._last_adjust = now
+            backoff = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (self._penalties - 1))
+            self._blocked_until = max(self._blocked_until, now + backoff)
+            return backoff
+
+    def status(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._expire(now)
+            return {
+                "jenis": self.kind, "permintaan_menit_ini": len(self._times),
+                "jatah": self._allowance(INTERACTIVE), "jatah_latar": self._allowance(BACKGROUND),
+                "kuota": self.per_minute,
+                "ditahan_detik": round(max(0.0, self._blocked_until - now), 1),
+                "ditolak_kuota": self.quota_errors,
+                "interaktif": self.requests[INTERACTIVE], "latar": self.requests[BACKGROUND],
+                "tunggu_interaktif_detik": round(self.waited_seconds[INTERACTIVE], 3),
+                "tunggu_latar_detik": round(self.waited_seconds[BACKGROUND], 3),
+            }
+
+
+LIMITERS = {"read": QuotaLimiter("read", READ_QUOTA_PER_MINUTE),
+            "write": QuotaLimiter("write", WRITE_QUOTA_PER_MINUTE)}
+
+
+def quota_status() -> pd.DataFrame:
+    """Pemakaian kuota saat ini per jenis permintaan (untuk halaman admin)."""
+    return pd.DataFrame([limiter.status() for limiter in LIMITERS.values()])
+
+
+def _throttled_call(kind: str, fn, kwargs: dict):
+    limiter = LIMITERS[kind]
+    worksheet = kwargs.get("worksheet")
+    for attempt in range(MAX_RETRIES + 1):
+        priority = current_priority()
+        waited = limiter.acquire(priority)
+        try:
+            result = fn(**kwargs)
+        except Exception as e:
+            if not is_quota_error(e):
+                raise
+            observe_sheets_request(kind, priority, waited, quota_error=True)
+            if attempt == MAX_RETRIES:
+                raise
+            backoff = limiter.penalize()
+            warn_throttled(_logger, kind, "Kuota %s Google Sheets ditolak (%s); jatah diturunkan, "
+                           "dicoba ulang setelah %.0f detik", kind, worksheet, backoff)
+            continue
+        observe_sheets_request(kind, priority, waited)
+        return result
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight = {} # kunci pembacaan -> _InFlight yang sedang berjalan
+_inflight_lock = threading.Lock()
+
+
+def _read_key(kwargs: dict):
+    # ttl hanya mengatur cache internal koneksi, bukan data yang dibaca
+    return tuple(sorted((name, repr(value)) for name, value in kwargs.items() if name != "ttl"))
+
+
+class ThrottledConnection:
+    """Pembungkus GSheetsConnection: read/write melewati QuotaLimiter, atribut lain diteruskan apa adanya."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        attr = getattr(self._conn, name)
+        if name in WRITE_METHODS and callable(attr):
+            return lambda **kwargs: _throttled_call("write", attr, kwargs)
+        return attr
+
+    def read(self, **kwargs):
+        key = _read_key(kwargs)
+        with _inflight_lock:
+            flight = _inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _inflight[key] = _InFlight()
+        if not leader:
+            observe_sheets_coalesced("read")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result.copy() if isinstance(flight.result, pd.DataFrame) else flight.result
+        try:
+            flight.result = _throttled_call("read", self._conn.read, kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            flight.done.set()
@@ -0,0 +1,110 @@
+"""
+Log permintaan lambat (JSON Lines) dengan konteks untuk mencari penyebab latensi ekor di produksi.
+
+Satu baris ditulis ke SLOW_LOG_FILE jika:
+    render halaman (span "page")        lebih lama dari SLOW_PAGE_MS   (default 2000 ms)
+    satu pemanggilan load_*_gsheet()    lebih lama dari SLOW_LOADER_MS (default 500 ms)
+
+Isi setiap baris:
+    kind          "page" atau "loader"
+    page          modul halaman (mis. pages.home); untuk loader, halaman yang memanggilnya
+    worksheet     worksheet loader (khusus kind "loader")
+    session       id sesi Streamlit
+    duration_ms   lama render / pemanggilan
+    cache         hit / miss / stale (loader); jumlah per status (halaman)
+    rows          jumlah baris hasil loader / total baris seluruh loader halaman
+    payload_bytes total bytes yang dicatat span di bawahnya (hasil serialize/ekspor)
+    breakdown_ms  total waktu per tahap di bawahnya (load, fetch, clean, chart, serialize, export)
+    loaders       daftar pemanggilan loader selama render (khusus kind "page")
+
+Data diambil dari span tracing.py (lihat tracing.add_listener), jadi TRACE_FILE tidak perlu diisi.
+Log loader ditulis saat render halamannya selesai agar nama halamannya diketahui.
+main.py memanggil install() jika SLOW_LOG_FILE diisi.
+"""
+import datetime
+import json
+import os
+import threading
+from collections import defaultdict
+
+import tracing
+
+SLOW_LOG_FILE = os.environ.get("SLOW_LOG_FILE", "")
+SLOW_PAGE_MS = float(os.environ.get("SLOW_PAGE_MS", 2000))
+SLOW_LOADER_MS = float(os.environ.get("SLOW_LOADER_MS", 500))
+MAX_PENDING_SPANS = 10_000 # Pengaman jika span akar tidak pernah selesai
+
+_lock = threading.Lock()
+_file_lock = threading.Lock()
+_children = {} # span_id induk -> {tahap: total ms} seluruh keturunannya yang sudah selesai
+_child_bytes = defaultdict(int) # span_id induk -> total bytes keturunannya
+_loads = defaultdict(list) # trace_id -> pemanggilan loader dalam trace tersebut
+_slow_loads = defaultdict(list) # trace_id -> entri log loader lambat yang menunggu span akarnya selesai
+_installed = False
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def _write(entry: dict):
+    line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+    with _file_lock:
+        with open(SLOW_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def on_span(record: dict):
+    """Listener tracing: mengumpulkan rincian per span dan menulis log jika melewati ambang batas."""
+    name, attributes, duration = record["name"], record["attributes"], record["duration_ms"]
+    trace_id, is_root = record["trace_id"], record["parent_id"] is None
+    base = {"ts": datetime.datetime.now().isoformat(timespec="milliseconds"), "session": _session_id(),
+            "duration_ms": duration, "error": record.get("error")}
+
+    with _lock:
+        breakdown = _children.pop(record["span_id"], {})
+        payload = _child_bytes.pop(record["span_id"], 0) + int(attributes.get("bytes") or 0)
+        timing = {stage: round(ms, 3) for stage, ms in sorted(breakdown.items())}
+        if not is_root:
+            if len(_children) > MAX_PENDING_SPANS:
+                for pending in (_children, _child_bytes, _loads, _slow_loads):
+                    pending.clear()
+            parent = _children.setdefault(record["parent_id"], defaultdict(float))
+            parent[name] += duration
+            for stage, ms in breakdown.items():
+                parent[stage] += ms
+            _child_bytes[record["parent_id"]] += payload
+
+        if name == "load":
+            _loads[trace_id].append({"worksheet": attributes.get("dataset"), "cache": attributes.get("cache"),
+                                     "rows": attributes.get("rows"), "duration_ms": duration})
+            if duration >= SLOW_LOADER_MS:
+                _slow_loads[trace_id].append({
+                    "kind": "loader", **base, "threshold_ms": SLOW_LOADER_MS, "page": None,
+                    "worksheet": attributes.get("dataset"), "cache": attributes.get("cache"),
+                    "rows": attributes.get("rows"), "payload_bytes": payload, "breakdown_ms": timing,
+                })
+        if not is_root:
+            return
+        loads, slow_loads = _loads.pop(trace_id, []), _slow_loads.pop(trace_id, [])
+
+    page = attributes.get("module") if name == "page" else None
+    for entry in slow_loads:
+        _write({**entry, "page": page})
+    if name == "page" and duration >= SLOW_PAGE_MS:
+        cache_states = defaultdict(int)
+        for load in loads:
+            cache_states[load["cache"]] += 1
+        _write({"kind": "page", **base, "threshold_ms": SLOW_PAGE_MS, "page": page, "cache": dict(cache_states),
+                "rows": sum(load["rows"] or 0 for load in loads), "payload_bytes": payload,
+                "breakdown_ms": timing, "loaders": loads})
+
+
+def install():
+    """Mengaktifkan log permintaan lambat (sekali per proses; aman dipanggil di setiap rerun main.py)."""
+    global _installed
+    if SLOW_LOG_FILE and not _installed:
+        _installed = True
+        tracing.add_listener(on_span)
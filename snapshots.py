@@ -0,0 +1,208 @@
+"""
+Riwayat (snapshot) berversi untuk setiap worksheet yang sudah diproses.
+
+Setiap kali isi worksheet berubah, satu versi baru dicatat. Data disimpan dalam potongan
+(chunk) baris yang dialamatkan dengan hash isinya, sehingga potongan yang tidak berubah
+tidak disimpan ulang. Batas potongan ditentukan oleh isi baris (bukan nomor baris), jadi
+menyisipkan satu baris hanya mengubah potongan di sekitarnya.
+
+    snapshots/<worksheet>/versions.jsonl   daftar versi (waktu, jumlah baris, daftar chunk)
+    snapshots/chunks/<hash>.pkl.gz          isi potongan (dipakai bersama oleh semua worksheet)
+"""
+import datetime
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "snapshots")
+CHUNK_TARGET_ROWS = 64 # Rata-rata jumlah baris per potongan
+CHUNK_MAX_ROWS = 512
+
+_last_versions = {} # Versi terakhir per worksheet (agar tidak membaca versions.jsonl di setiap pemanggilan)
+_lock = threading.Lock()
+# Snapshot hanya ditulis saat cache loader kedaluwarsa, jadi peringatan gagal simpan paling sering sekali per TTL per worksheet
+_logger = logging.getLogger(__name__)
+
+
+def _worksheet_dir(worksheet: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, re.sub(r'[^0-9A-Za-z]+', '_', worksheet).strip('_'))
+
+
+def _chunk_path(chunk_hash: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, "chunks", f"{chunk_hash}.pkl.gz")
+
+
+def _row_hashes(df: pd.DataFrame):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _chunk_bounds(row_hashes):
+    """Batas potongan berdasarkan isi: baris yang hash-nya habis dibagi CHUNK_TARGET_ROWS menutup potongan."""
+    bounds, start = [], 0
+    for i, row_hash in enumerate(row_hashes):
+        if row_hash % CHUNK_TARGET_ROWS == 0 or i + 1 - start >= CHUNK_MAX_ROWS:
+            bounds.append((start, i + 1))
+            start = i + 1
+    if start < len(row_hashes):
+        bounds.append((start, len(row_hashes)))
+    return bounds
+
+
+def _chunk_hash(row_hashes, columns) -> str:
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update("|".join(map(str, columns)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_chunk(chunk_hash: str, chunk: pd.DataFrame):
+    path = _chunk_path(chunk_hash)
+    if os.path.exists(path):
+        return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wb") as f:
+        pickle.dump(chunk.reset_index(drop=True), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _read_chunk(chunk_hash: str) -> pd.DataFrame:
+    with gzip.open(_chunk_path(chunk_hash), "rb") as f:
+        return pickle.load(f)
+
+
+def _read_versions(worksheet: str) -> list:
+    path = os.path.join(_worksheet_dir(worksheet), "versions.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_snapshot(worksheet: str, df: pd.DataFrame, saved_at: datetime.datetime = None):
+    """
+    Mencatat versi baru jika isi df berbeda dari versi terakhir worksheet ini.
+    Mengembalikan id versi (hash isi) atau None jika data kosong.
+    """
+    if df is None or df.empty:
+        return None
+    row_hashes = _row_hashes(df)
+    version = _chunk_hash(row_hashes, df.columns)[:16]
+
+    with _lock:
+        if worksheet not in _last_versions:
+            versions = _read_versions(worksheet)
+            _last_versions[worksheet] = versions[-1]["version"] if versions else None
+        if _last_versions[worksheet] == version:
+            return version
+
+        os.makedirs(os.path.join(SNAPSHOT_DIR, "chunks"), exist_ok=True)
+        os.makedirs(_worksheet_dir(worksheet), exist_ok=True)
+        chunks = []
+        for start, end in _chunk_bounds(row_hashes):
+            chunk_hash = _chunk_hash(row_hashes[start:end], df.columns)
+            _write_chunk(chunk_hash, df.iloc[start:end])
+            chunks.append({"hash": chunk_hash, "rows": end - start})
+
+        entry = {
+            "version": version,
+            "saved_at": (saved_at or datetime.datetime.now()).isoformat(timespec="seconds"),
+            "rows": int(len(df)),
+            "columns": [str(col) for col in df.columns],
+            "chunks": chunks,
+        }
+        with open(os.path.join(_worksheet_dir(worksheet), "versions.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        _last_versions[worksheet] = version
+    return version
+
+
+def keep_snapshot(worksheet: str):
+    """
+    Dekorator untuk fungsi load_*(): hasilnya dicatat sebagai snapshot.
+    Dipasang di bawah @st.cache_data sehingga hanya berjalan saat data benar-benar dibaca ulang.
+    Kegagalan menyimpan snapshot tidak menggagalkan pemuatan data.
+    """
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            df = loader(*args, **kwargs)
+            try:
+                save_snapshot(worksheet, df)
+            except Exception as e:
+                _logger.warning("Snapshot '%s' gagal disimpan: %s", worksheet, e)
+            return df
+        return wrapper
+    return decorator
+
+
+def list_versions(worksheet: str) -> pd.DataFrame:
+    """Daftar versi tersimpan (paling lama di atas)."""
+    versions = _read_versions(worksheet)
+    return pd.DataFrame(
+        [{"version": v["version"], "saved_at": pd.Timestamp(v["saved_at"]), "rows": v["rows"]} for v in versions],
+        columns=["version", "saved_at", "rows"]
+    )
+
+
+def _find_version(worksheet: str, version: str) -> dict:
+    for entry in _read_versions(worksheet):
+        if entry["version"] == version:
+            return entry
+    raise KeyError(f"Versi '{version}' tidak ditemukan untuk worksheet '{worksheet}'.")
+
+
+def _assemble(entry: dict) -> pd.DataFrame:
+    frames = [_read_chunk(chunk["hash"]) for chunk in entry["chunks"]]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=entry["columns"])
+
+
+def load_version(worksheet: str, version: str) -> pd.DataFrame:
+    return _assemble(_find_version(worksheet, version))
+
+
+def load_as_of(worksheet: str, when) -> pd.DataFrame:
+    """Isi worksheet sebagaimana tercatat pada waktu `when` (versi terakhir yang tersimpan sebelum/tepat saat itu)."""
+    when = pd.Timestamp(when)
+    selected = None
+    for entry in _read_versions(worksheet):
+        if pd.Timestamp(entry["saved_at"]) <= when:
+            selected = entry
+    if selected is None:
+        return pd.DataFrame()
+    return _assemble(selected)
+
+
+def diff_versions(worksheet: str, old_version: str, new_version: str) -> dict:
+    """
+    Baris yang ditambahkan dan dihapus antara dua versi.
+    Potongan yang sama di kedua versi dilewati, jadi hanya potongan yang berubah yang dibaca.
+    """
+    old_entry = _find_version(worksheet, old_version)
+    new_entry = _find_version(worksheet, new_version)
+    old_hashes = [chunk["hash"] for chunk in old_entry["chunks"]]
+    new_hashes = [chunk["hash"] for chunk in new_entry["chunks"]]
+    shared = set(old_hashes) & set(new_hashes)
+
+    def changed_rows(hashes, columns):
+        frames = [_read_chunk(h) for h in hashes if h not in shared]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    old_rows = changed_rows(old_hashes, old_entry["columns"])
+    new_rows = changed_rows(new_hashes, new_entry["columns"])
+    if old_entry["columns"] != new_entry["columns"]:
+        return {"added": new_rows, "removed": old_rows, "columns_changed": True}
+
+    old_keys = pd.Series(_row_hashes(old_rows)) if len(old_rows) else pd.Series(dtype="uint64")
+    new_keys = pd.Series(_row_hashes(new_rows)) if len(new_rows) else pd.Series(dtype="uint64")
+    return {
+        "added": new_rows[~new_keys.isin(old_keys).to_numpy()].reset_index(drop=True),
+        "removed": old_rows[~old_keys.isin(new_keys).to_numpy()].reset_index(drop=True),
+        "columns_changed": False,
+    }
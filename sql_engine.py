@@ -0,0 +1,180 @@
+"""
+Mesin SQL di dalam proses (DuckDB) di atas seluruh dataset dashboard.
+
+Setiap DataFrame hasil load_*_gsheet() (sudah dibersihkan) didaftarkan sebagai tabel dengan nama
+slug-nya (lihat datasets.DATASETS), tanpa disalin: DuckDB membaca langsung kolom pandas. Hanya jika
+DuckDB menolak sebuah kolom, tabel itu didaftarkan ulang dari salinan arrow_safe_frame(). Tabel
+didaftarkan ulang hanya jika versi loader-nya (load_*_gsheet.version()) berubah, dan hanya tabel
+yang disebut di query yang diperiksa.
+Contoh:
+
+    query("SELECT RW, SUM(Jumlah_Penduduk) AS penduduk FROM jenis_kelamin GROUP BY RW ORDER BY RW")
+
+Akses file/jaringan dari SQL dimatikan, dan konsol admin hanya menerima satu perintah baca (SELECT dsb.).
+Setiap query dihentikan (con.interrupt()) jika melewati SQL_QUERY_TIMEOUT_S detik (default 10).
+"""
+import contextlib
+import os
+import re
+import threading
+
+import pandas as pd
+
+from datasets import DATASETS, load_dataset, arrow_safe_frame
+
+try:
+    import duckdb
+except ImportError: # duckdb bersifat opsional; halaman yang memakainya menampilkan pesan
+    duckdb = None
+
+MAX_RESULT_ROWS = 10_000 # Batas baris hasil untuk konsol admin
+QUERY_TIMEOUT = float(os.environ.get("SQL_QUERY_TIMEOUT_S", 10))
+READ_ONLY_STATEMENTS = ("select", "with", "from", "describe", "show", "summarize", "explain", "pivot", "unpivot")
+
+_connection = None
+_registered = {} # slug -> versi loader yang sedang terdaftar
+_arrow_safe = set() # slug yang kolomnya ditolak DuckDB; didaftarkan dari salinan arrow_safe_frame()
+_engine_lock = threading.Lock() # Satu koneksi dipakai bersama; query dijalankan bergantian
+
+
+class QueryError(ValueError):
+    """Query ditolak atau gagal dijalankan."""
+
+
+def sql_available() -> bool:
+    return duckdb is not None
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        if duckdb is None:
+            raise QueryError("Paket 'duckdb' belum terpasang (pip install duckdb).")
+        con = duckdb.connect(database=":memory:")
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+        _connection = con
+    return _connection
+
+
+def _referenced_datasets(sql: str) -> list:
+    """Dataset yang namanya disebut di query; semua dataset jika tidak ada (mis. SHOW TABLES)."""
+    words = {word.lower() for word in re.findall(r"\w+", sql)}
+    referenced = [dataset for dataset in DATASETS if dataset["slug"] in words]
+    return referenced or DATASETS
+
+
+def _register(con, slug: str, df: pd.DataFrame):
+    if slug not in _arrow_safe:
+        try:
+            con.register(slug, df) # Tanpa salinan: DuckDB memindai kolom pandas langsung
+            return
+        except duckdb.Error:
+            _arrow_safe.add(slug)
+    con.register(slug, arrow_safe_frame(df))
+
+
+def _refresh_tables(con, datasets):
+    """Mendaftarkan ulang tabel yang versi loader-nya berubah sejak query sebelumnya."""
+    for dataset in datasets:
+        df = load_dataset(dataset)
+        version = dataset["loader"].version()
+        if version is not None and _registered.get(dataset["slug"]) == version:
+            continue
+        _register(con, dataset["slug"], df)
+        _registered[dataset["slug"]] = version
+
+
+@contextlib.contextmanager
+def _engine(sql: str):
+    """Koneksi bersama (satu query pada satu waktu) dengan tabel yang dipakai sql sudah terbaru."""
+    if not _engine_lock.acquire(timeout=QUERY_TIMEOUT):
+        raise QueryError("Mesin SQL sedang menjalankan query lain; coba lagi sebentar lagi.")
+    try:
+        con = _get_connection()
+        _refresh_tables(con, _referenced_datasets(sql))
+        yield con
+    finally:
+        _engine_lock.release()
+
+
+def _run_with_deadline(con, sql: str, run):
+    """
+    Menjalankan run() dengan batas waktu QUERY_TIMEOUT; query yang melewatinya dihentikan lewat
+    con.interrupt() dari thread timer. Jika DuckDB gagal mengonversi kolom pandas, tabel yang
+    dipakai didaftarkan ulang dari salinan arrow_safe_frame() lalu query dicoba sekali lagi.
+    """
+    for attempt in range(2):
+        expired = threading.Event()
+
+        def interrupt():
+            expired.set()
+            con.interrupt()
+
+        timer = threading.Timer(QUERY_TIMEOUT, interrupt)
+        timer.daemon = True
+        timer.start()
+        try:
+            return run()
+        except duckdb.ConversionException as e:
+            datasets = [d for d in _referenced_datasets(sql) if d["slug"] not in _arrow_safe]
+            if attempt or not datasets:
+                raise QueryError(str(e)) from e
+            for dataset in datasets:
+                _arrow_safe.add(dataset["slug"])
+                _registered.pop(dataset["slug"], None)
+            _refresh_tables(con, datasets)
+        except duckdb.Error as e:
+            if expired.is_set():
+                raise QueryError(f"Query dihentikan karena melewati batas waktu {QUERY_TIMEOUT:g} detik.") from e
+            raise QueryError(str(e)) from e
+        finally:
+            timer.cancel()
+
+
+def query(sql: str, params=None) -> pd.DataFrame:
+    """Menjalankan query SQL atas data terbaru dan mengembalikan hasilnya sebagai DataFrame."""
+    with _engine(sql) as con:
+        return _run_with_deadline(con, sql, lambda: con.execute(sql, params or []).df())
+
+
+def check_read_only(sql: str) -> str:
+    """Memastikan sql hanya berisi satu perintah baca; mengembalikan sql tanpa titik koma di akhir."""
+    statement = sql.strip().rstrip(";").strip()
+    if not statement:
+        raise QueryError("Query kosong.")
+    if ";" in statement:
+        raise QueryError("Hanya satu perintah SQL yang diizinkan.")
+    first_word = re.match(r"\w+", statement)
+    if first_word is None or first_word.group(0).lower() not in READ_ONLY_STATEMENTS:
+        raise QueryError("Hanya perintah baca (SELECT, WITH, DESCRIBE, SHOW, SUMMARIZE, EXPLAIN) yang diizinkan.")
+    return statement
+
+
+def run_console_query(sql: str, max_rows: int = MAX_RESULT_ROWS):
+    """
+    Query dari konsol admin: hanya baca, hasil dibatasi max_rows.
+    Mengembalikan (DataFrame, terpotong) dengan terpotong=True jika hasil melebihi batas.
+    """
+    statement = check_read_only(sql)
+
+    def run():
+        result = con.execute(statement)
+        return result.fetchmany(max_rows + 1), [column[0] for column in result.description]
+
+    with _engine(statement) as con:
+        rows, columns = _run_with_deadline(con, statement, run)
+    df = pd.DataFrame(rows[:max_rows], columns=columns)
+    return df, len(rows) > max_rows
+
+
+def table_overview() -> pd.DataFrame:
+    """Daftar tabel yang bisa di-query beserta jumlah baris dan kolomnya."""
+    rows = []
+    for dataset in DATASETS:
+        df = load_dataset(dataset)
+        rows.append({
+            "Tabel": dataset["slug"], "Worksheet": dataset["worksheet"], "Baris": len(df),
+            "Kolom": ", ".join(str(col) for col in df.columns),
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,229 @@
+"""
+Membuat versi statis (HTML) dari dashboard agar bisa disajikan dari file server/CDN biasa
+tanpa proses Python untuk setiap pengunjung.
+
+Contoh (jalankan dari folder proyek):
+    python static_site.py --output site
+
+Hasil:
+    site/index.html           halaman Home dengan semua grafik
+    site/<slug>.html          satu halaman per dataset (grafik + tabel)
+    site/specs/<slug>.vl.json spesifikasi Vega-Lite setiap grafik
+    site/data/<slug>.json     data setiap dataset (juga .csv)
+
+Pembuatan bersifat inkremental: halaman hanya ditulis ulang jika dataset/grafiknya berubah.
+Dataset yang kosong (gagal dimuat) tidak menimpa halaman, data, maupun grafiknya di Home dari
+pembuatan sebelumnya; build tetap selesai tetapi keluar dengan kode 1.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+
+MANIFEST_FILE = "manifest.json"
+# Naikkan jika template HTML diubah agar semua halaman dibuat ulang
+TEMPLATE_VERSION = "1"
+
+VEGA_SCRIPTS = """
+    <script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+    <script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+    <script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="id">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{title} - SIGEMA</title>{scripts}
+    <style>
+        body {{ margin: 0; font-family: sans-serif; background: #EFF2F6; color: #111111; display: flex; }}
+        nav {{ width: 260px; min-height: 100vh; background: #111111; padding: 1rem 0; flex-shrink: 0; }}
+        nav h1 {{ color: #FFFFFF; font-size: 1.4rem; padding: 0 1rem; }}
+        nav a {{ display: block; color: #FFFFFF; text-decoration: none; padding: .5rem 1rem; }}
+        nav a:hover {{ background: #444444; }}
+        nav a.aktif {{ background: #004488; }}
+        main {{ flex: 1; padding: 2rem; min-width: 0; }}
+        .kartu {{ background: #FFFFFF; border: 1px solid rgba(0,0,0,0.1); border-radius: 10px;
+                  padding: 1.5rem; margin-bottom: 1rem; overflow-x: auto; }}
+        .grafik {{ width: 100%; }}
+        table {{ border-collapse: collapse; width: 100%; font-size: .9rem; }}
+        th, td {{ border: 1px solid #DDDDDD; padding: .4rem .6rem; text-align: left; }}
+        th {{ background: #F5F5F5; }}
+        footer {{ color: grey; font-size: .8rem; margin-top: 2rem; }}
+    </style>
+</head>
+<body>
+    <nav>
+        <h1>SIGEMA</h1>
+{nav}
+    </nav>
+    <main>
+        <h2>{title}</h2>
+{body}
+        <footer>Sumber: Kelurahan Kubu Marapalam</footer>
+    </main>
+</body>
+</html>
+"""
+
+
+def _chart_block(element_id: str, spec_file: str, heading: str = None) -> str:
+    heading_html = f"<h3>{html.escape(heading)}</h3>\n" if heading else ""
+    return (
+        f'        <div class="kartu">{heading_html}'
+        f'<div id="{element_id}" class="grafik"></div>'
+        f'<script>vegaEmbed("#{element_id}", "specs/{spec_file}", {{"actions": false}});</script></div>'
+    )
+
+
+def _nav_html(datasets, active_slug: str) -> str:
+    links = [("index", "Home")] + [(dataset["slug"], dataset["title"]) for dataset in datasets]
+    return "\n".join(
+        f'        <a href="{slug}.html"{" class=aktif" if slug == active_slug else ""}>{html.escape(title)}</a>'
+        for slug, title in links
+    )
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    """Menulis file hanya jika isinya berbeda; mengembalikan True jika file ditulis."""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _page_hash(*parts) -> str:
+    digest = hashlib.sha1(TEMPLATE_VERSION.encode("utf-8"))
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def build_site(output_dir: str, force: bool = False) -> dict:
+    """
+    Membuat/memperbarui situs statis di output_dir.
+    Mengembalikan ringkasan {'ditulis': [...], 'tetap': [...], 'gagal': [...]} berisi nama halaman;
+    'gagal' = dataset kosong/gagal dimuat yang halamannya dari pembuatan sebelumnya dipertahankan.
+    """
+    from datasets import DATASETS, arrow_safe_frame, load_dataset
+    from exports import dataset_version
+    from report import CHART_WIDTH, REPORT_SECTIONS, chart_spec, spec_hash
+
+    os.makedirs(os.path.join(output_dir, "specs"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "data"), exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    charts = {section["dataset"]: section for section in REPORT_SECTIONS}
+    summary = {"ditulis": [], "tetap": [], "gagal": []}
+    nav_hash = _page_hash(*(dataset["slug"] + dataset["title"] for dataset in DATASETS))
+    home_blocks, home_parts = [], [nav_hash]
+
+    for dataset in DATASETS:
+        slug = dataset["slug"]
+        df = load_dataset(dataset)
+        section = charts.get(slug)
+        page_file = os.path.join(output_dir, f"{slug}.html")
+        spec_file = os.path.join(output_dir, "specs", f"{slug}.vl.json")
+        if df.empty:
+            # Kemungkinan besar galat sementara (Sheets/API): halaman, data, dan grafik lama tetap dipakai
+            summary["gagal"].append(slug)
+            if section is not None and os.path.exists(spec_file):
+                with open(spec_file, encoding="utf-8") as f:
+                    home_parts.append(spec_hash(json.load(f)))
+                home_blocks.append(_chart_block(f"grafik_{slug}", f"{slug}.vl.json", section["title"]))
+            if os.path.exists(page_file):
+                continue
+        chart = section["chart"](df) if section is not None and not df.empty else None
+        spec = chart_spec(chart) if chart is not None else None
+        if spec is not None and spec.get("width") == CHART_WIDTH:
+            # Di browser grafik mengikuti lebar kartunya
+            spec["width"] = "container"
+        spec_id = spec_hash(spec) if spec is not None else "-"
+        version = dataset_version(df)
+
+        if spec is not None:
+            home_blocks.append(_chart_block(f"grafik_{slug}", f"{slug}.vl.json", section["title"]))
+            home_parts.append(spec_id)
+
+        page_hash = _page_hash(version, spec_id, nav_hash)
+        if manifest.get(slug) == page_hash and os.path.exists(page_file):
+            summary["tetap"].append(slug)
+            continue
+
+        if spec is not None:
+            _write_if_changed(spec_file, json.dumps(spec, default=str))
+        table = dataset["excel_frame"](df) if dataset["excel_frame"] is not None and not df.empty else df
+        if not df.empty:
+            data = arrow_safe_frame(df)
+            _write_if_changed(os.path.join(output_dir, "data", f"{slug}.json"),
+                              data.to_json(orient="records", date_format="iso", force_ascii=False))
+            _write_if_changed(os.path.join(output_dir, "data", f"{slug}.csv"), data.to_csv(index=False))
+
+        blocks = []
+        if spec is not None:
+            blocks.append(_chart_block("grafik", f"{slug}.vl.json"))
+        if df.empty:
+            blocks.append('        <div class="kartu"><p>Data tidak tersedia.</p></div>')
+        else:
+            blocks.append(
+                '        <div class="kartu"><h3>Tabel Data</h3>\n'
+                + table.to_html(index=False, border=0, na_rep="", escape=True)
+                + f'\n<p>Unduh data: <a href="data/{slug}.csv">CSV</a> · <a href="data/{slug}.json">JSON</a></p></div>'
+            )
+        page = PAGE_TEMPLATE.format(title=html.escape(dataset["title"]), scripts=VEGA_SCRIPTS if spec else "",
+                                    nav=_nav_html(DATASETS, slug), body="\n".join(blocks))
+        _write_if_changed(page_file, page)
+        summary["ditulis"].append(slug)
+        if not df.empty: # Halaman "Data tidak tersedia" (belum pernah ada halaman) dibuat ulang di build berikutnya
+            manifest[slug] = page_hash
+
+    # Home bergantung pada semua grafik: ditulis ulang jika salah satunya berubah
+    home_hash = _page_hash(*home_parts)
+    home_file = os.path.join(output_dir, "index.html")
+    if manifest.get("index") == home_hash and os.path.exists(home_file):
+        summary["tetap"].append("index")
+    else:
+        page = PAGE_TEMPLATE.format(title="Selamat Datang di Dashboard Kelurahan Marapalam", scripts=VEGA_SCRIPTS,
+                                    nav=_nav_html(DATASETS, "index"), body="\n".join(home_blocks))
+        _write_if_changed(home_file, page)
+        manifest["index"] = home_hash
+        summary["ditulis"].append("index")
+
+    _write_if_changed(manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Membuat versi HTML statis dari dashboard kelurahan.")
+    parser.add_argument("--output", default="site", help="folder tujuan (default: site)")
+    parser.add_argument("--force", action="store_true", help="buat ulang semua halaman")
+    args = parser.parse_args(argv)
+
+    # Streamlit dipakai dalam mode 'bare' (tanpa server): sembunyikan peringatan ScriptRunContext
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    summary = build_site(args.output, force=args.force)
+    print(f"Halaman ditulis: {', '.join(summary['ditulis']) or '-'}")
+    print(f"Halaman tidak berubah: {len(summary['tetap'])}")
+    if summary["gagal"]:
+        print(f"Data kosong atau gagal dimuat, halaman sebelumnya dipertahankan: {', '.join(summary['gagal'])}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Data sintetis untuk setiap worksheet, dengan kolom dan tipe yang sama seperti hasil conn.read.
+
+Dipakai untuk benchmark dan uji beban tanpa mengakses Google Sheets:
+
+    from synthetic_data import generate_all, install_fake_source
+    install_fake_source(generate_all(rows=10_000))
+
+Nilai dibuat konsisten (mis. jumlah penduduk = laki-laki + perempuan, RT bernomor di dalam RW)
+dan deterministik untuk seed yang sama.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (
+    WORKSHEET_NAME_PENDUDUK, WORKSHEET_NAME_PENDIDIKAN, WORKSHEET_NAME_PEKERJAAN_DOMINAN,
+    WORKSHEET_NAME_JENIS_TANAH, WORKSHEET_NAME_INDUSTRI_UMKM, WORKSHEET_NAME_KK_RW,
+    WORKSHEET_NAME_STATUS_PEKERJA, WORKSHEET_NAME_DISABILITAS, WORKSHEET_NAME_JENIS_KELAMIN,
+    WORKSHEET_NAME_SARANA_PRASARANA, WORKSHEET_NAME_SARANA_KEBERSIHAN, WORKSHEET_NAME_TENAGA_KERJA
+)
+
+RT_PER_RW = 10
+LAST_YEAR = 2025
+
+PENDIDIKAN = ['Tidak Tamat SD', 'Tamat SD/Sederajat', 'Tamat SMP/Sederajat', 'Tamat SMA/Sederajat',
+              'Tamat Akademi/Perguruan Tinggi']
+PEKERJAAN = ['Petani', 'Pedagang', 'PNS', 'Karyawan Swasta', 'Wiraswasta', 'Buruh Harian Lepas', 'Nelayan',
+             'Guru', 'Sopir', 'Ibu Rumah Tangga']
+JENIS_UMKM = ['Makanan dan Minuman', 'Kerajinan', 'Pakaian', 'Perdagangan', 'Jasa', 'Pertanian']
+STATUS_PEKERJA = ['Bekerja', 'Tidak Bekerja', 'Mencari Kerja', 'Sekolah', 'Mengurus Rumah Tangga']
+JENIS_CACAT = ['Tuna Netra', 'Tuna Rungu', 'Tuna Wicara', 'Tuna Daksa', 'Tuna Grahita', 'Disabilitas Mental']
+SARANA_PRASARANA = ['Masjid', 'Mushalla', 'Sekolah Dasar', 'SMP', 'Posyandu', 'Puskesmas Pembantu', 'Pasar',
+                    'Lapangan Olahraga', 'Kantor Lurah', 'Pos Ronda']
+SARANA_KEBERSIHAN = ['TPS', 'Gerobak Sampah', 'Bak Sampah', 'Truk Sampah', 'Bank Sampah']
+TENAGA_KERJA = ['Usia 15-24', 'Usia 25-34', 'Usia 35-44', 'Usia 45-54', 'Usia 55-64', 'Usia 65+']
+
+
+def _cycle(values, rows: int) -> np.ndarray:
+    return np.resize(np.array(values, dtype=object), rows)
+
+
+def _periods(rows: int, per_period: int, step_days: int = 30) -> list:
+    """Tanggal (teks 'YYYY-MM-DD', seperti di Google Sheet): setiap periode berisi per_period baris."""
+    n_periods = -(-rows // per_period)
+    start = datetime.date(LAST_YEAR, 12, 31) - datetime.timedelta(days=step_days * (n_periods - 1))
+    dates = [(start + datetime.timedelta(days=step_days * i)).isoformat() for i in range(n_periods)]
+    return np.repeat(dates, per_period)[:rows].tolist()
+
+
+def _penduduk(rows, rng):
+    laki = rng.integers(2_000, 5_000, rows)
+    perempuan = rng.integers(2_000, 5_000, rows)
+    return pd.DataFrame({
+        'Tahun': np.arange(LAST_YEAR - rows + 1, LAST_YEAR + 1),
+        'Jumlah Laki-Laki (orang)': laki, 'Jumlah Perempuan (orang)': perempuan,
+        'Jumlah Total (orang)': laki + perempuan,
+    })
+
+
+def _pendidikan(rows, rng):
+    return pd.DataFrame({'No': np.arange(1, rows + 1), 'Pendidikan': _cycle(PENDIDIKAN, rows),
+                         'Jumlah': rng.integers(50, 2_000, rows)})
+
+
+def _pekerjaan(rows, rng):
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Tanggal': _periods(rows, len(PEKERJAAN)),
+                         'Jenis Pekerjaan': _cycle(PEKERJAAN, rows), 'Jumlah': rng.integers(5, 800, rows)})
+
+
+def _jenis_tanah(rows, rng):
+    df = pd.DataFrame({'Tanggal': _periods(rows, 1)})
+    columns = ['Tanah Sawah (Ha)', 'Tanah Kering (Ha)', 'Tanah Basah (Ha)', 'Tanah Perkebunan (Ha)',
+               'Tanah Fasilitas Umum (Ha)', 'Tanah Hutan (Ha)']
+    for col in columns:
+        df[col] = rng.uniform(0, 50, rows).round(2)
+    df['Total Luas Tanah (Ha)'] = df[columns].sum(axis=1).round(2)
+    df['Luas Desa/Kelurahan (Ha)'] = (df['Total Luas Tanah (Ha)'] * 1.1).round(2)
+    df['Status'] = 'Final'
+    return df
+
+
+def _umkm(rows, rng):
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Jenis': _cycle(JENIS_UMKM, rows),
+                         'Jumlah': rng.integers(0, 60, rows)})
+
+
+def _kk_rw(rows, rng):
+    laki = rng.integers(100, 900, rows)
+    perempuan = rng.integers(100, 900, rows)
+    return pd.DataFrame({'RW': [str(rw) for rw in range(1, rows + 1)], 'LAKI- LAKI': laki, 'PEREMPUAN': perempuan,
+                         'JUMLAH KK': ((laki + perempuan) / rng.uniform(3, 5, rows)).astype(int)})
+
+
+def _status_pekerja(rows, rng):
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Kriteria': _cycle(STATUS_PEKERJA, rows),
+                         'Jumlah': rng.integers(10, 3_000, rows)})
+
+
+def _disabilitas(rows, rng):
+    laki = rng.integers(0, 30, rows)
+    perempuan = rng.integers(0, 30, rows)
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Tanggal': _periods(rows, len(JENIS_CACAT)),
+                         'Jenis Cacat': _cycle(JENIS_CACAT, rows), 'Laki-Laki (orang)': laki,
+                         'Perempuan (orang)': perempuan, 'Jumlah (Orang)': laki + perempuan})
+
+
+def _jenis_kelamin(rows, rng):
+    index = np.arange(rows)
+    laki = rng.integers(20, 200, rows)
+    perempuan = rng.integers(20, 200, rows)
+    return pd.DataFrame({
+        'NO': index + 1, 'RW': index // RT_PER_RW + 1, 'RT': index % RT_PER_RW + 1,
+        'JUMLAH KK': ((laki + perempuan) / rng.uniform(3, 5, rows)).astype(int),
+        'LAKI- LAKI': laki, 'PEREMPUAN': perempuan, 'JUMLAH PENDUDUK': laki + perempuan,
+    })
+
+
+def _sarana_prasarana(rows, rng):
+    per_year = len(SARANA_PRASARANA)
+    years = LAST_YEAR - (np.arange(rows)[::-1] // per_year)
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Tahun': years,
+                         'Jenis Sarana dan Prasarana': _cycle(SARANA_PRASARANA, rows),
+                         'Jumlah (Unit)': rng.integers(1, 20, rows)})
+
+
+def _sarana_kebersihan(rows, rng):
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Jenis': _cycle(SARANA_KEBERSIHAN, rows),
+                         'Jumlah': rng.integers(1, 40, rows)})
+
+
+def _tenaga_kerja(rows, rng):
+    laki = rng.integers(50, 1_500, rows)
+    perempuan = rng.integers(50, 1_500, rows)
+    return pd.DataFrame({'No.': np.arange(1, rows + 1), 'Kriteria': _cycle(TENAGA_KERJA, rows),
+                         'Laki-Laki (Orang)': laki, 'Perempuan (Orang)': perempuan, 'Jumlah': laki + perempuan})
+
+
+GENERATORS = {
+    WORKSHEET_NAME_PENDUDUK: _penduduk,
+    WORKSHEET_NAME_PENDIDIKAN: _pendidikan,
+    WORKSHEET_NAME_PEKERJAAN_DOMINAN: _pekerjaan,
+    WORKSHEET_NAME_JENIS_TANAH: _jenis_tanah,
+    WORKSHEET_NAME_INDUSTRI_UMKM: _umkm,
+    WORKSHEET_NAME_KK_RW: _kk_rw,
+    WORKSHEET_NAME_STATUS_PEKERJA: _status_pekerja,
+    WORKSHEET_NAME_DISABILITAS: _disabilitas,
+    WORKSHEET_NAME_JENIS_KELAMIN: _jenis_kelamin,
+    WORKSHEET_NAME_SARANA_PRASARANA: _sarana_prasarana,
+    WORKSHEET_NAME_SARANA_KEBERSIHAN: _sarana_kebersihan,
+    WORKSHEET_NAME_TENAGA_KERJA: _tenaga_kerja,
+}
+
+
+def generate_worksheet(worksheet: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Satu worksheet sintetis dengan `rows` baris."""
+    return GENERATORS[worksheet](rows, np.random.default_rng(seed))
+
+
+def generate_all(rows: int, seed: int = 0) -> dict:
+    """Seluruh worksheet sintetis, masing-masing `rows` baris: {nama worksheet: DataFrame}."""
+    return {worksheet: generate_worksheet(worksheet, rows, seed) for worksheet in GENERATORS}
+
+
+def install_fake_source(frames: dict):
+    """
+    Mengganti pembacaan Google Sheets dengan `frames` (hanya untuk benchmark/uji beban di proses ini)
+    dan mengosongkan cache data agar loader membaca data baru.
+    """
+    import streamlit as st
+    import data_loader
+
+    def load_fake(worksheet_name, usecols=None):
+        df = frames.get(worksheet_name, pd.DataFrame())
+        return df[usecols].copy() if usecols else df.copy()
+
+    data_loader.load_data_from_gsheets = load_fake
+    st.cache_data.clear()
@@ -0,0 +1,126 @@
+"""
+Komponen tabel bersama: pencarian, pengurutan, dan halaman (pagination) dikerjakan di server
+atas DataFrame yang sudah di-cache; yang dikirim ke browser hanya baris pada halaman aktif.
+Baris ringkasan (mis. TOTAL) ditampilkan terpisah sehingga tidak ikut diurutkan/dicari.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from memory_accounting import register_cache
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+INDEX_CACHE_MAX_ENTRIES = 64
+NO_SORT = "(urutan asli)"
+
+# (key tabel, versi data, jenis, parameter) -> (DataFrame asal atau None, indeks pencarian / urutan baris),
+# dipakai ulang di setiap rerun
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+register_cache("indeks tabel", _index_cache, _index_lock)
+
+
+def _cached(key, build, frame: pd.DataFrame = None):
+    """
+    Nilai build() untuk key. Jika frame diberikan, entri hanya berlaku untuk objek DataFrame itu
+    (id() bisa dipakai ulang oleh objek lain setelah frame dibuang).
+    """
+    with _index_lock:
+        entry = _index_cache.get(key)
+        if entry is not None and (entry[0] is None or entry[0]() is frame):
+            _index_cache.move_to_end(key)
+            return entry[1]
+    value = build()
+    with _index_lock:
+        _index_cache[key] = (weakref.ref(frame) if frame is not None else None, value)
+        while len(_index_cache) > INDEX_CACHE_MAX_ENTRIES:
+            _index_cache.popitem(last=False)
+    return value
+
+
+def _search_text(df: pd.DataFrame) -> pd.Series:
+    """Isi setiap baris digabung menjadi satu teks huruf kecil untuk pencarian."""
+    text = df.astype(str).agg(" ".join, axis=1) if len(df.columns) else pd.Series("", index=df.index)
+    return text.str.lower().reset_index(drop=True)
+
+
+def _sort_order(df: pd.DataFrame, column: str, descending: bool) -> np.ndarray:
+    values = df[column].reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=not descending, kind="stable", na_position="last")
+    except TypeError: # Kolom campuran angka dan teks: urutkan sebagai teks
+        ordered = values.astype(str).sort_values(ascending=not descending, kind="stable")
+    return ordered.index.to_numpy()
+
+
+def visible_positions(df: pd.DataFrame, search: str = "", sort_column: str = None, descending: bool = False,
+                      version: str = None, key: str = "") -> np.ndarray:
+    """
+    Posisi baris (urut) yang cocok dengan pencarian; indeks pencarian dan urutan di-cache per tabel dan versi data.
+
+    version : versi data asal tabel (mis. load_x_gsheet.version()). Tanpa versi, cache hanya berlaku
+              untuk objek DataFrame yang sama (mis. hasil query yang disimpan di session_state);
+              isi DataFrame tidak pernah di-hash di sini.
+    """
+    if version is not None:
+        base, frame = (key, version, df.shape), None
+    else:
+        base, frame = (key, "objek", id(df), df.shape), df
+    if sort_column in df.columns:
+        positions = _cached(base + ("sort", sort_column, descending),
+                            lambda: _sort_order(df, sort_column, descending), frame)
+    else:
+        positions = np.arange(len(df))
+    term = search.strip().lower()
+    if term:
+        text = _cached(base + ("search",), lambda: _search_text(df), frame)
+        matches = text.str.contains(term, regex=False).to_numpy()
+        positions = positions[matches[positions]]
+    return positions
+
+
+def paginated_table(df: pd.DataFrame, key: str, summary: pd.DataFrame = None, page_size: int = PAGE_SIZE_OPTIONS[0],
+                    version: str = None):
+    """
+    Menampilkan df sebagai tabel berhalaman dengan pencarian dan pengurutan.
+    Tabel yang muat dalam satu halaman ditampilkan langsung tanpa kontrol.
+
+    key     : awalan key widget (harus unik per tabel)
+    summary : baris ringkasan yang ditampilkan di bawah tabel (opsional)
+    version : versi data dari loader (load_x_gsheet.version()); df harus selalu diturunkan dengan cara
+              yang sama dari data versi itu
+    """
+    if len(df) <= page_size:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        col_search, col_sort, col_order, col_size = st.columns([4, 3, 2, 2])
+        search = col_search.text_input("Cari", key=f"{key}_cari", placeholder="Ketik untuk mencari...")
+        sort_column = col_sort.selectbox("Urutkan", [NO_SORT] + [str(col) for col in df.columns], key=f"{key}_urut")
+        descending = col_order.selectbox("Arah", ["Naik", "Turun"], key=f"{key}_arah") == "Turun"
+        page_size = col_size.selectbox("Baris per halaman", PAGE_SIZE_OPTIONS, key=f"{key}_ukuran")
+
+        columns = {str(col): col for col in df.columns}
+        positions = visible_positions(df, search, columns.get(sort_column), descending, version, key)
+        n_pages = max(1, -(-len(positions) // page_size))
+        page_key = f"{key}_halaman"
+        if st.session_state.get(page_key, 1) > n_pages: # Hasil pencarian lebih sedikit dari halaman yang sedang dibuka
+            st.session_state[page_key] = 1
+
+        start = (st.session_state.get(page_key, 1) - 1) * page_size
+        window = df.iloc[positions[start:start + page_size]]
+        st.dataframe(window, use_container_width=True, hide_index=True)
+
+        col_info, col_page = st.columns([8, 2])
+        col_page.number_input("Halaman", min_value=1, max_value=n_pages, step=1, key=page_key)
+        if len(positions):
+            col_info.caption(f"Menampilkan baris {start + 1:,}–{start + len(window):,} dari {len(positions):,}"
+                             + (f" (disaring dari {len(df):,})" if len(positions) != len(df) else ""))
+        else:
+            col_info.caption("Tidak ada baris yang cocok dengan pencarian.")
+
+    if summary is not None and not summary.empty:
+        st.dataframe(summary, use_container_width=True, hide_index=True)
@@ -0,0 +1,222 @@
+"""
+Pencatatan waktu per tahap (span) untuk pemuatan data, pembuatan grafik, dan ekspor.
+
+Tahap yang dicatat:
+    page      : render satu halaman (run() di setiap modul pages/)
+    load      : pemanggilan load_*_gsheet() termasuk cache (atribut cache = hit/miss/stale)
+    fetch     : membaca worksheet dari Google Sheets (conn.read, sudah termasuk parsing CSV)
+    clean     : load_*_gsheet() (fetch tercatat sebagai span anaknya)
+    chart     : membangun grafik Altair di get_*_chart()
+    serialize : mengubah DataFrame menjadi bytes (to_excel / df_to_pdf)
+    export    : permintaan file unduhan (termasuk cache hasil ekspor)
+
+Pencatatan aktif jika salah satu variabel lingkungan berikut diisi:
+    TRACE_FILE                   : file JSON Lines lokal, satu span per baris
+    OTEL_EXPORTER_OTLP_ENDPOINT  : collector OpenTelemetry (OTLP/HTTP JSON), mis. http://localhost:4318
+Modul lain di proses yang sama dapat menerima setiap span yang selesai lewat add_listener()
+(mis. slow_log.py). Jika tidak ada tujuan maupun listener, span tidak melakukan apa-apa selain
+memanggil fungsi aslinya.
+"""
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+
+import pandas as pd
+
+from log_throttle import warn_throttled
+
+TRACE_FILE = os.environ.get("TRACE_FILE", "")
+OTLP_ENDPOINT = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "").rstrip("/")
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "sigema-dashboard")
+OTLP_BATCH_SIZE = 256
+OTLP_FLUSH_INTERVAL = 5 # detik
+
+TRACING_ENABLED = bool(TRACE_FILE or OTLP_ENDPOINT)
+
+# (trace_id, span_id) span yang sedang berjalan di konteks ini; span baru menjadi anaknya
+_current_span = contextvars.ContextVar("current_span", default=None)
+_file_lock = threading.Lock()
+_otlp_queue = queue.Queue(maxsize=10_000)
+_otlp_thread = None
+_otlp_thread_lock = threading.Lock()
+_listeners = [] # fungsi(record) yang dipanggil setiap span selesai
+_logger = logging.getLogger(__name__)
+
+
+def add_listener(listener):
+    """Mendaftarkan fungsi yang menerima record setiap span yang selesai (di thread yang menjalankan span)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _active() -> bool:
+    return TRACING_ENABLED or bool(_listeners)
+
+
+class Span:
+    """Satu tahap yang sedang diukur. Atribut bisa ditambah selama span berjalan lewat set()."""
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+
+    def set(self, **attributes):
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+
+def _write_file(record: dict):
+    line = json.dumps(record, default=str) + "\n"
+    with _file_lock:
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(record: dict) -> dict:
+    span = {
+        "traceId": record["trace_id"], "spanId": record["span_id"], "name": record["name"], "kind": 1,
+        "startTimeUnixNano": str(record["start_ns"]), "endTimeUnixNano": str(record["end_ns"]),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in record["attributes"].items()],
+        "status": {"code": 2, "message": record["error"]} if record.get("error") else {"code": 1},
+    }
+    if record.get("parent_id"):
+        span["parentSpanId"] = record["parent_id"]
+    return span
+
+
+def _send_otlp(records: list):
+    body = {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "tracing"}, "spans": [_otlp_span(record) for record in records]}],
+    }]}
+    request = urllib.request.Request(
+        f"{OTLP_ENDPOINT}/v1/traces", data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+    try:
+        urllib.request.urlopen(request, timeout=5).close()
+    except Exception as e: # Collector tidak tersedia tidak boleh mengganggu aplikasi
+        warn_throttled(_logger, "otlp", "Gagal mengirim %d span ke %s: %s", len(records), OTLP_ENDPOINT, e)
+
+
+def _otlp_worker():
+    while True:
+        records = [_otlp_queue.get()]
+        deadline = time.monotonic() + OTLP_FLUSH_INTERVAL
+        while len(records) < OTLP_BATCH_SIZE:
+            try:
+                records.append(_otlp_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        _send_otlp(records)
+
+
+def _flush_otlp():
+    records = []
+    while not _otlp_queue.empty():
+        records.append(_otlp_queue.get_nowait())
+    if records:
+        _send_otlp(records)
+
+
+def _enqueue_otlp(record: dict):
+    global _otlp_thread
+    with _otlp_thread_lock:
+        if _otlp_thread is None:
+            _otlp_thread = threading.Thread(target=_otlp_worker, name="otlp-exporter", daemon=True)
+            _otlp_thread.start()
+            atexit.register(_flush_otlp)
+    try:
+        _otlp_queue.put_nowait(record)
+    except queue.Full:
+        pass # Antrean penuh (collector lambat): span dibuang daripada menahan render halaman
+
+
+def _record(record: dict):
+    if TRACE_FILE:
+        _write_file(record)
+    if OTLP_ENDPOINT:
+        _enqueue_otlp(record)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """
+    Mengukur satu tahap:
+
+        with span("fetch", dataset=worksheet_name) as s:
+            df = conn.read(...)
+            s.set(rows=len(df))
+    """
+    current = Span(name, attributes)
+    if not _active():
+        yield current
+        return
+
+    parent = _current_span.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    span_id = secrets.token_hex(8)
+    token = _current_span.set((trace_id, span_id))
+    start_ns, start = time.time_ns(), time.perf_counter()
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        record = {
+            "name": name, "trace_id": trace_id, "span_id": span_id, "parent_id": parent[1] if parent else None,
+            "start_ns": start_ns, "end_ns": start_ns + int(duration * 1e9), "duration_ms": round(duration * 1000, 3),
+            "pid": os.getpid(), "attributes": current.attributes, "error": error,
+        }
+        try:
+            if TRACING_ENABLED:
+                _record(record)
+            for listener in _listeners:
+                listener(record)
+        except Exception as e:
+            warn_throttled(_logger, "record", "Span '%s' gagal dicatat: %s", name, e)
+
+
+def traced(stage: str, dataset: str = None):
+    """
+    Dekorator: setiap pemanggilan fungsi dicatat sebagai span `stage`.
+    Jumlah baris DataFrame masukan/keluaran dan ukuran bytes keluaran dicatat otomatis.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active():
+                return fn(*args, **kwargs)
+            frame = next((arg for arg in args if isinstance(arg, pd.DataFrame)), None)
+            with span(stage, function=fn.__qualname__, module=fn.__module__, dataset=dataset,
+                      input_rows=len(frame) if frame is not None else None) as current:
+                result = fn(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    current.set(rows=len(result))
+                elif isinstance(result, (bytes, bytearray)):
+                    current.set(bytes=len(result))
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,117 @@
+import io
+import re
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+BLOCK_ROWS = 5000 # Jumlah baris yang dikonversi ke objek Python sekaligus
+MAX_COL_WIDTH = 60
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+
+def safe_sheet_name(name: str, used: set = None) -> str:
+    """Membuat nama sheet yang valid untuk Excel (maks. 31 karakter, tanpa []:*?/\\) dan unik."""
+    base = _INVALID_SHEET_CHARS.sub('-', str(name)).strip("'")[:31] or "Sheet"
+    if used is None:
+        return base
+    candidate, counter = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({counter})"
+        candidate = base[:31 - len(suffix)] + suffix
+        counter += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _column_kind(values: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(values):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return "date"
+    if pd.api.types.is_numeric_dtype(values):
+        return "number"
+    if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+        return "string"
+    # Kolom object/kategori bisa berisi campuran teks dan angka dari Google Sheet
+    return "mixed"
+
+
+def _prepare_column(values: pd.Series, kind: str):
+    """Mengubah kolom menjadi array yang siap ditulis; nilai kosong menjadi None (sel kosong)."""
+    if kind == "date":
+        values = values.dt.tz_localize(None) if getattr(values.dt, "tz", None) is not None else values
+        serial = (values - EXCEL_EPOCH) / pd.Timedelta(days=1)
+        return serial.astype(object).where(serial.notna(), None).to_numpy()
+    if kind == "number":
+        numbers = values.astype(float)
+        return numbers.astype(object).where(numbers.notna(), None).to_numpy()
+    return values.astype(object).where(values.notna(), None).to_numpy()
+
+
+def _column_width(header: str, values: pd.Series) -> int:
+    """Perkiraan lebar kolom dari header dan sampel data (bukan seluruh kolom)."""
+    sample = values.iloc[:BLOCK_ROWS].dropna()
+    longest = int(sample.astype(str).str.len().max()) if len(sample) else 0
+    return min(max(len(str(header)), longest) + 2, MAX_COL_WIDTH)
+
+
+def _write_sheet(worksheet, df: pd.DataFrame, formats: dict):
+    """Menulis satu DataFrame ke worksheet baris demi baris (wajib berurutan pada mode constant_memory)."""
+    kinds = [_column_kind(df[col]) for col in df.columns]
+
+    # Format angka/tanggal diterapkan sekali per kolom, bukan per sel
+    for j, (col, kind) in enumerate(zip(df.columns, kinds)):
+        worksheet.set_column(j, j, _column_width(col, df[col]), formats.get(kind))
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], formats["header"])
+
+    writers = {
+        "number": worksheet.write_number,
+        "date": worksheet.write_number,
+        "bool": worksheet.write_boolean,
+        "string": worksheet.write_string,
+        "mixed": worksheet.write,
+    }
+    column_writers = [writers[kind] for kind in kinds]
+    is_mixed = [kind == "mixed" for kind in kinds]
+    columns = [_prepare_column(df[col], kind) for col, kind in zip(df.columns, kinds)]
+
+    for block_start in range(0, len(df), BLOCK_ROWS):
+        block = [values[block_start:block_start + BLOCK_ROWS].tolist() for values in columns]
+        for offset, row in enumerate(zip(*block)):
+            row_number = block_start + offset + 1
+            for col_number, (value, write, mixed) in enumerate(zip(row, column_writers, is_mixed)):
+                if value is None:
+                    continue
+                if mixed and not isinstance(value, (str, int, float, bool, np.number)):
+                    value = str(value)
+                write(row_number, col_number, value)
+
+
+def write_xlsx(sheets, output):
+    """
+    Menulis satu atau beberapa DataFrame ke file XLSX memakai mode constant_memory xlsxwriter.
+
+    sheets: list berisi pasangan (nama_sheet, DataFrame).
+    output: path file atau objek file (mis. io.BytesIO) tujuan.
+    """
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_numbers': False})
+    formats = {
+        "header": workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}),
+        "date": workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+    }
+    used_names = set()
+    for sheet_name, df in sheets:
+        worksheet = workbook.add_worksheet(safe_sheet_name(sheet_name, used_names))
+        _write_sheet(worksheet, df, formats)
+    workbook.close()
+
+
+def df_to_xlsx(df: pd.DataFrame, sheet_name: str) -> bytes:
+    """Mengonversi satu DataFrame menjadi isi file XLSX (bytes) untuk tombol unduh."""
+    output = io.BytesIO()
+    write_xlsx([(sheet_name, df)], output)
+    return output.getvalue()
+